@@ -1,8 +1,42 @@
 import streamlit as st
 import pandas as pd
 from datetime import date, datetime, timedelta
+import hmac
 import json
+import os
+import re
 import time
+import uuid
+
+from hub import DATA_DIR
+from hub.alerts import OUTBOX, QUEUED, STATUS_ICONS, activate_plan
+from hub.archive import Archive
+from hub.catalog import EXTERNAL_LINKS, RESOURCES, TEMPLATE_CATEGORIES
+from hub.dedupe import NearDuplicateIndex, SubmissionKeys, normalize, submission_key
+from hub.chat import ROOMS, ChatBroker, ChatView
+from hub.events import (CHECKIN_RECORDED, CONTACT_ADDED, CONTACT_DELETED, MILESTONE_CELEBRATED,
+                        MILESTONE_MODERATED, MILESTONE_SHARED, PLAN_ACTIVATED, PLAN_DELETED, PLAN_SAVED, PROFILE_UPDATED,
+                        RESOURCE_SAVED, EventStore, describe)
+from hub.feed import FeedHub, FeedView
+from hub.i18n import LANGUAGES, get_translator, load_catalog
+from hub.linkhealth import HEALTH_BADGES, REDIRECTED, LinkHealth, catalog_urls
+from hub.matching import PeerIndex, describe_feature, first_name, public_card
+from hub.metrics import HubMetrics, serve
+from hub.moderation import HELD, REJECTED, RELEASED, ModerationQueue
+from hub.plansearch import PlanIndex, lines, matching_lines
+from hub.places import (CRISIS, HOSPITAL, PARENT_CENTER, SERVICE_ICONS, ambiguous_places, nearby,
+                         resolve_location)
+from hub.photos import ACCEPTED_TYPES, MAX_UPLOAD_BYTES, PROCESSING, PhotoRejected, PhotoStore
+from hub.reports import BUILDING, FAILED, READY, ReportBuilder, in_range
+from hub.ratelimit import ADD_CONTACT, CELEBRATE, CHAT, SAVE, SHARE, SUBMIT_CHECKIN, RateLimiter
+from hub.recommend import CATEGORY, SIMILAR, TOP_RATED, SimilarityIndex, family_interests
+
+from hub.reminders import (CHECKIN, DEFAULT_TIMEZONE, MEETING, PLAN_REVIEW, REMINDER_ICONS, ReminderScheduler,
+                           at_local, checkin_first, local_time, plan_review_due)
+from hub.risk import RiskModel
+from hub.rollup import ALL, CENSUS_REGIONS, CommunityRollup, region_of
+from hub.screening import screen
+from hub.search import KIND_ICONS, LINK, RESOURCE, TEMPLATE, TOPIC, SearchIndex, catalog_version
 
 # Page configuration
 st.set_page_config(
@@ -11,6 +45,7 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+rerun_started = time.perf_counter()
 
 # Custom CSS for better styling
 st.markdown("""
@@ -77,203 +112,869 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_metrics():
+    """Process-wide metrics, served with health checks on the side port."""
+    metrics = HubMetrics()
+    metrics.queues["moderation"] = lambda: len(get_moderation_queue())
+    metrics.queues["alerts_outbox"] = lambda: len(OUTBOX)
+    metrics.queues["events_since_snapshot"] = lambda: get_event_store().unsnapshotted()
+    metrics.queues["photo_processing"] = lambda: get_photo_store().pending()
+    metrics.queues["reminders_scheduled"] = lambda: len(get_reminders())
+    metrics.queues["reports_building"] = lambda: get_report_builder().pending()
+    metrics.registry.add_check("data_dir_writable", lambda: os.access(DATA_DIR, os.W_OK))
+    metrics.registry.add_check("event_store", lambda: os.path.isdir(get_event_store().directory))
+    metrics.registry.add_check("locale_catalogs", lambda: bool(load_catalog("en")))
+    serve(metrics.registry)
+    return metrics
+
+
+# Forms whose submissions are counted, by the event they record
+FORM_EVENTS = {
+    MILESTONE_SHARED: "milestone",
+    CONTACT_ADDED: "contact",
+    PLAN_SAVED: "crisis_plan",
+    CHECKIN_RECORDED: "checkin",
+    PROFILE_UPDATED: "profile",
+}
+
+
+@st.cache_resource
+def get_event_store():
+    """Process-wide event store that every family's saved state is rebuilt from."""
+    return EventStore()
+
+
+def record(kind, data):
+    """Log a change to this family's data; the event store applies it to their state."""
+    if kind in FORM_EVENTS:
+        get_metrics().form_submissions.inc(FORM_EVENTS[kind])
+    event = get_event_store().record(st.session_state.user_id, kind, data)
+    if kind == PROFILE_UPDATED:
+        index_profile()
+    elif kind == PLAN_SAVED:
+        get_plan_index().upsert(st.session_state.user_id, data["item"])
+    elif kind == PLAN_DELETED:
+        get_plan_index().remove(st.session_state.user_id, data["id"])
+    if kind in REMINDER_EVENTS:
+        sync_reminders(checked_in=kind == CHECKIN_RECORDED)
+    return event
+
+
+@st.cache_resource
+def get_rate_limiter():
+    """Process-wide token buckets for write actions; refusals are counted in metrics."""
+    limited = get_metrics().rate_limited
+    return RateLimiter(on_limit=lambda action: limited.inc(action))
+
+
+def over_limit(action):
+    """True, after asking the family to slow down, when this session is out of tokens for an action."""
+    wait = get_rate_limiter().take(st.session_state.session_key, action)
+    if wait:
+        st.warning(t("ratelimit.wait", seconds=max(1, round(wait))))
+    return bool(wait)
+
+
+@st.cache_resource
+def get_peer_index():
+    """Process-wide "parents like me" index, seeded from every family's saved profile."""
+    index = PeerIndex()
+    store = get_event_store()
+    for user_id in store.users():
+        profile = store.peek(user_id)["user_profile"]
+        index.upsert(user_id, profile, card=public_card(profile))
+    return index
+
+
+def index_profile():
+    """Re-index this family after their profile or sharing preference changes."""
+    profile = st.session_state.user_profile
+    get_peer_index().upsert(st.session_state.user_id, profile, card=public_card(profile))
+
+
+@st.cache_resource
+def get_plan_index():
+    """Process-wide warning-sign index over each family's crisis plans.
+
+    Crisis types are indexed under every language's label, so a search
+    matches the type whichever language the plan was written in.
+    """
+    return PlanIndex(labels=lambda crisis_type: [load_catalog(code).get(f"plans.types.{crisis_type}", "")
+                                                 for code in LANGUAGES.values()])
+
+
+# Changes that move a family's check-in or plan-review reminders
+REMINDER_EVENTS = {PROFILE_UPDATED, CHECKIN_RECORDED, PLAN_SAVED, PLAN_ACTIVATED, PLAN_DELETED}
+
+
+@st.cache_resource
+def get_reminders():
+    """Process-wide reminder heap with its timer thread.
+
+    Fired reminders wait in the family's sidebar inbox; delivery itself only
+    counts them, bound here because the timer thread runs outside any script run.
+    """
+    fired = get_metrics().reminders_fired
+    return ReminderScheduler(deliver=lambda reminder: fired.inc(reminder["kind"])).start()
+
+
+def sync_reminders(checked_in=False):
+    """Bring this family's automatic reminders in line with their profile and plans."""
+    scheduler = get_reminders()
+    user_id = st.session_state.user_id
+    profile = st.session_state.user_profile
+    timezone = profile.get("timezone", DEFAULT_TIMEZONE)
+    enabled = profile.get("notifications", True)
+    scheduler.retime(user_id, timezone)
+
+    checkin_id = f"{user_id}-checkin"
+    if not enabled:
+        scheduler.cancel(checkin_id)
+    elif checked_in or scheduler.get(checkin_id) is None:
+        # A check-in restarts the weekly countdown and clears the nudge
+        scheduler.schedule(checkin_id, user_id, CHECKIN, "", checkin_first(timezone), timezone,
+                           every_days=7, clock="19:00")
+        if checked_in:
+            scheduler.dismiss(checkin_id)
+
+    plans = {f"{user_id}-plan-{plan['id']}": plan for plan in st.session_state.crisis_plans if enabled}
+    for reminder in scheduler.reminders(user_id):
+        if reminder["kind"] == PLAN_REVIEW and reminder["id"] not in plans:
+            scheduler.cancel(reminder["id"])
+    for reminder_id, plan in plans.items():
+        due = plan_review_due(plan, timezone)
+        existing = scheduler.get(reminder_id)
+        # A review that already fired is only rescheduled once the plan is used again
+        if existing is None or (existing["next"] != due and (existing["next"] is not None
+                                                             or due > existing["fired_at"])):
+            scheduler.schedule(reminder_id, user_id, PLAN_REVIEW, plan["name"], due, timezone)
+        else:
+            # Follows a renamed plan, and older logs that stored the English sentence
+            scheduler.retitle(reminder_id, plan["name"])
+
+
+def reminder_title(reminder):
+    """A reminder's title in the family's language; a meeting's title is the family's own text."""
+    if reminder["kind"] == CHECKIN:
+        return t("reminders.titles.checkin")
+    if reminder["kind"] == PLAN_REVIEW:
+        return t("reminders.titles.plan_review", name=reminder["title"])
+    return reminder["title"]
+
+
 # Initialize session state
-if "user_profile" not in st.session_state:
-    st.session_state.user_profile = {}
+if "user_id" not in st.session_state:
+    # The family id travels in the URL so a bookmark brings their data back
+    family_id = st.query_params.get("family", "")
+    if not re.fullmatch(r"[0-9a-f]{32}", family_id):
+        family_id = uuid.uuid4().hex
+        st.query_params["family"] = family_id
+    st.session_state.user_id = family_id
+
+family_state = get_event_store().load(st.session_state.user_id)
+for key in ("user_profile", "emergency_contacts", "milestone_shares", "crisis_plans",
+            "saved_resources", "mental_health_checks"):
+    if key not in st.session_state:
+        st.session_state[key] = family_state[key]
+
+
+@st.cache_resource
+def get_archive():
+    """Compressed month segments holding each family's older milestones and check-ins."""
+    return Archive()
+
+
+if "plans_indexed" not in st.session_state:
+    get_plan_index().reset(st.session_state.user_id, st.session_state.crisis_plans)
+    st.session_state.plans_indexed = True
+
+if "reminders_synced" not in st.session_state:
+    sync_reminders()
+    st.session_state.reminders_synced = True
+
+
+HISTORY_RANGES = ["Recent", "Past 12 months", "All time"]
+
+
+def family_history(collection, history_range="Recent"):
+    """A family's records newest first, reaching into the archive only for longer ranges."""
+    records = sorted(st.session_state[collection], key=lambda x: x["date"], reverse=True)
+    if history_range == "Recent":
+        return records
+    since = date.today() - timedelta(days=365) if history_range == "Past 12 months" else None
+    if since:
+        records = [record for record in records if record["date"] >= since]
+    archived = get_archive().history(st.session_state.user_id, collection, since)
+    return sorted(records + archived, key=lambda x: x["date"], reverse=True)
+
+
+def archived_count(collection):
+    return get_archive().count(st.session_state.user_id, collection)
+
+if "session_key" not in st.session_state:
+    st.session_state.session_key = uuid.uuid4().hex
+
+if "plan_activations" not in st.session_state:
+    st.session_state.plan_activations = {}
+
+COMMUNITY_FEED = "community"
+
+
+def community_history():
+    """Every family's milestones that are in the community feed as (milestone, owner), oldest first."""
+    store = get_event_store()
+    shared = []
+    for user_id in store.users():
+        try:
+            state = store.peek(user_id)
+        except (OSError, ValueError):
+            continue
+        shared.extend((milestone, user_id) for milestone in state["milestone_shares"]
+                      if milestone.get("public") and milestone.get("moderation") not in (HELD, REJECTED))
+    return sorted(shared, key=lambda entry: entry[0]["date"])
+
+
+@st.cache_resource
+def get_feed_hub():
+    """Process-wide feed hub shared by every session, reseeded from the event logs on startup."""
+    hub = FeedHub()
+    for milestone, owner in community_history()[-hub.window:]:
+        hub.share(COMMUNITY_FEED, milestone, owner=owner)
+    return hub
+
+
+if "community_feed" not in st.session_state:
+    st.session_state.community_feed = FeedView(get_feed_hub(), COMMUNITY_FEED)
+
+if "archive_compacted" not in st.session_state:
+    # Once per session, move records that have gone cold out of the live state,
+    # except milestones the community can still celebrate
+    get_archive().compact(get_event_store(), st.session_state.user_id,
+                          keep=get_feed_hub().shared_by(COMMUNITY_FEED, st.session_state.user_id))
+    st.session_state.archive_compacted = True
+
+
+@st.cache_resource
+def get_submission_keys():
+    """Process-wide claim-once keys that drop double-submitted forms."""
+    return SubmissionKeys()
+
+
+@st.cache_resource
+def get_repost_index():
+    """MinHash/LSH index over recent public milestones, seeded from the event logs on startup."""
+    index = NearDuplicateIndex()
+    for milestone, owner in community_history()[-index.capacity:]:
+        # Only the day is recorded, so a post counts from the start of it
+        index.add(milestone["id"], milestone["text"], owner=owner,
+                  at=datetime.combine(milestone["date"], datetime.min.time()).timestamp())
+    return index
+
+
+# Copies of another family's long post are held for a moderator, not blocked
+COPY_SIMILARITY = 0.95
+COPY_MIN_CHARS = 80
+
+
+@st.cache_resource
+def get_chat_broker():
+    """Process-wide broker for the peer-support chat rooms."""
+    return ChatBroker()
+
+
+if "chat_views" not in st.session_state:
+    st.session_state.chat_views = {}
+
+
+@st.cache_resource
+def get_risk_model():
+    """Process-wide wellbeing risk model, reloaded from the event logs and rescored every hour."""
+    store = get_event_store()
+
+    def checkins():
+        for user_id in store.users():
+            try:
+                yield user_id, store.peek(user_id)["mental_health_checks"]
+            except (OSError, ValueError):
+                continue
+    return RiskModel(source=checkins).start_periodic(interval=3600)
+
+
+if get_risk_model().score(st.session_state.user_id) is None:
+    # Replay recovered check-ins so the risk indicator survives restarts
+    for check in st.session_state.mental_health_checks:
+        get_risk_model().update(st.session_state.user_id, check)
+
+
+@st.cache_resource
+def get_resource_index():
+    """Item-item similarity index over the resource catalog, built once per process."""
+    return SimilarityIndex(RESOURCES)
+
+
+@st.cache_resource
+def get_search_index(version, language):
+    """Search index over the catalog, built once per catalog version and language."""
+    translator = get_translator(language)
+    return SearchIndex(
+        RESOURCES, TEMPLATE_CATEGORIES, EXTERNAL_LINKS,
+        label=lambda kind, key: (translator.get(f"resource.{key}.title", key) if kind == RESOURCE
+                                 else translator.label("templates", key)),
+        describe=lambda resource: translator.get(f"resource.{resource['title']}.description",
+                                                 resource["description"]))
+
+
+@st.cache_resource
+def get_photo_store():
+    """Process-wide photo store; thumbnails are built in its worker pool."""
+    return PhotoStore()
+
+
+@st.cache_resource
+def get_community_rollup():
+    """Anonymized community summaries, recomputed from the whole store every hour."""
+    return CommunityRollup(get_event_store(), get_archive()).start_periodic(interval=3600)
+
+
+@st.cache_resource
+def get_report_builder():
+    """Process-wide report builder; PDFs are laid out in its worker pool."""
+    return ReportBuilder()
+
+
+def report_snapshot(start, end):
+    """Everything a progress report shows for [start, end], including archived months."""
+    user_id = st.session_state.user_id
+    profile = st.session_state.user_profile
+    milestones = st.session_state.milestone_shares + get_archive().history(user_id, "milestone_shares", start)
+    checks = st.session_state.mental_health_checks + get_archive().history(user_id, "mental_health_checks", start)
+    return {
+        "start": start,
+        "end": end,
+        "generated": date.today(),
+        "profile": {key: profile.get(key) for key in ("parent_name", "children_info", "support_network")},
+        # Only the fields that are printed, so a new celebration doesn't rebuild the report
+        "milestones": [{key: milestone[key] for key in ("date", "type", "text")}
+                       for milestone in in_range(milestones, start, end)],
+        "checks": [{key: check.get(key) for key in ("date", "stress_level", "energy_level", "mood", "sleep_quality",
+                                                    "support_feeling", "coping_ability")}
+                   for check in in_range(checks, start, end)],
+        "plans": [{key: plan.get(key) for key in ("name", "type", "warning_signs", "immediate_steps",
+                                                  "contacts_to_call", "resources_needed", "notes",
+                                                  "created_date", "last_used")}
+                  for plan in st.session_state.crisis_plans],
+        "contacts": [{key: contact.get(key) for key in ("name", "relationship", "phone", "notes", "primary")}
+                     for contact in st.session_state.emergency_contacts],
+    }
+
+
+@st.cache_resource
+def get_link_health():
+    """Process-wide link checker; refreshes expired results every five minutes."""
+    return LinkHealth().start_periodic(catalog_urls(RESOURCES, EXTERNAL_LINKS), interval=300)
+
+
+def link_status(health):
+    """Badge line for a link's last cached health check."""
+    status = f"{HEALTH_BADGES[health['health']]} {t.label('resources.health', health['health'])}"
+    if health["health"] == REDIRECTED:
+        status += f" → {health['final_url']}"
+    if health["checked_at"]:
+        checked = datetime.fromtimestamp(health["checked_at"]).strftime("%b %d, %H:%M")
+        status += f" • {t('resources.health_checked', time=checked)}"
+    return status
+
+
+def pick_suggestion(label):
+    st.session_state.catalog_query = label
+
+
+def resource_text(resource, field):
+    """A resource's title or description in the family's language."""
+    return t.get(f"resource.{resource['title']}.{field}", resource[field])
+
+
+def reason_text(reason):
+    """Word one (kind, value) recommendation reason in the family's language."""
+    kind, value = reason
+    if kind == SIMILAR:
+        return t("resources.reasons.similar", title=t.get(f"resource.{value}.title", value))
+    if kind == TOP_RATED:
+        return t("resources.reasons.top_rated")
+    if kind == CATEGORY:
+        return t.label("resources.categories", value)
+    return value
+
+
+def shared_label(feature):
+    """A "Parents Like Me" match's shared feature in the family's language, or None to leave it out."""
+    kind, value = feature.split(":", 1)
+    if kind == "condition":
+        return t.label("profile.conditions", value)
+    if kind == "language":
+        return t("profile.shared.language", value=t.label("profile.languages", value))
+    if kind == "network":
+        return t("profile.shared.network", value=t.label("profile.networks", value))
+    if kind == "age":
+        return t("profile.shared.age", value=value)
+    return describe_feature(feature)
+
+
+def recommended_resources(limit=3):
+    """Recommendations for this family, recomputed only when their inputs change."""
+    index = get_resource_index()
+    profile = st.session_state.user_profile
+    checks = st.session_state.mental_health_checks
+    saved = [r["title"] for r in st.session_state.saved_resources]
+    signature = (
+        index.version,
+        profile.get("children_info"), profile.get("primary_language"), tuple(profile.get("support_network", [])),
+        len(st.session_state.milestone_shares), len(checks), tuple(saved),
+    )
+    cached = st.session_state.get("recommendations")
+    if not cached or cached[0] != signature:
+        interests = family_interests(profile, st.session_state.milestone_shares, checks)
+        cached = (signature, index.recommend(interests, seeds=saved, exclude=saved, limit=limit))
+        st.session_state.recommendations = cached
+    return cached[1]
+
+
+@st.cache_resource
+def get_moderation_queue():
+    """Public posts held back by safety screening, re-indexed from the event logs on startup."""
+    return ModerationQueue().seed(get_event_store())
+
+
+def is_moderator():
+    key = os.environ.get("HUB_MODERATOR_KEY", "")
+    return bool(key) and hmac.compare_digest(st.query_params.get("moderator", ""), key)
+
+
+def moderate(milestone_id, decision):
+    """Release a held milestone to the community feed or reject it; False if already decided."""
+    held = get_moderation_queue().resolve(milestone_id)
+    if held is None:
+        return False
+    owner, milestone = held
+    get_event_store().record(owner, MILESTONE_MODERATED, {"id": milestone_id, "moderation": decision})
+    if decision == RELEASED:
+        get_feed_hub().share(COMMUNITY_FEED, dict(milestone, moderation=RELEASED), owner=owner)
+        get_repost_index().add(milestone_id, milestone["text"], owner=owner)
+    return True
+
+
+def show_crisis_resources(screening, intro):
+    """Surface the crisis resources that match a screened submission."""
+    if screening.urgent:
+        st.error(f"🚨 {intro}")
+    else:
+        st.warning(f"💛 {intro}")
+    for line in screening.resources(t.section("screening")):
+        st.markdown(f"- {line}")
+
+
+def render_activation_progress(activation, live=False):
+    """Show live per-contact delivery status for a crisis plan activation."""
+    recipients = activation.snapshot()
+    finished = sum(1 for r in recipients if r["status"] not in ("pending", "sending"))
+    st.progress(finished / len(recipients) if recipients else 1.0,
+                text=t("activation.progress", finished=finished, total=len(recipients), seconds=activation.elapsed()))
+
+    for recipient in recipients:
+        line = f"{STATUS_ICONS[recipient['status']]} **{recipient['name']}**"
+        if recipient.get("relationship"):
+            line += f" - {t.label('contacts.relationships', recipient['relationship'])}"
+        line += f" · {t.label('activation.statuses', recipient['status'])}"
+        if recipient["phone"]:
+            line += f" · ☎️ {recipient['phone']}"
+        if recipient["detail"]:
+            line += f" ({recipient['detail']})"
+        if recipient["escalated_from"]:
+            line += f" · {t('activation.escalated_from', name=recipient['escalated_from'])}"
+        st.write(line)
+
+    if not recipients:
+        st.warning(t("activation.no_contacts"))
+    elif activation.done:
+        counts = activation.counts()
+        if counts["delivered"] == len(recipients):
+            st.success(t("activation.all_alerted", total=len(recipients), seconds=activation.elapsed()))
+        elif counts[QUEUED]:
+            st.warning(t("activation.queued", queued=counts[QUEUED], total=len(recipients)))
+        else:
+            st.warning(t("activation.partial", delivered=counts["delivered"], total=len(recipients)))
+        # Rerun the page once so the finished card stops auto-refreshing
+        if live:
+            st.rerun()
+
+
+@st.fragment(run_every=2)
+def feed_watcher():
+    """Poll the feed version and rerun the page only once it has moved.
+
+    Draws nothing, so an idle tick costs one integer comparison instead of
+    re-sending every card in the feed.
+    """
+    if get_feed_hub().version(COMMUNITY_FEED) != st.session_state.community_feed.version:
+        st.rerun()
+
+
+@st.fragment
+def community_feed():
+    """Community celebrations, brought up to date from feed deltas on each draw."""
+    feed = st.session_state.community_feed
+    feed.sync()
+
+    milestones = feed.latest(limit=50)
+    if not milestones:
+        st.info(t("feed.empty"))
+        return
+
+    st.markdown(t("feed.title"))
+
+    for milestone in milestones:
+        with st.container():
+            col1, col2 = st.columns([4, 1])
+
+            with col1:
+                milestone_icon = {"Communication": "🗣️", "Educational": "📚", "Social": "👫",
+                                "Medical": "🏥", "Behavioral": "🎯", "Daily Living": "🏠"}.get(milestone["type"], "🎉")
+
+                st.write(f"{milestone_icon} **{milestone['text']}**")
+
+                details = []
+                if milestone.get("child_age"):
+                    details.append(t("feed.age", age=milestone["child_age"]))
+                details.append(t("feed.type", type=t.label("milestones.types", milestone["type"])))
+                details.append(t("feed.shared_by", name=first_name(milestone["shared_by"]) or t("profile.a_parent")))
+                details.append(f"{milestone['date']}")
+
+                st.caption(" • ".join(details))
 
-if "emergency_contacts" not in st.session_state:
-    st.session_state.emergency_contacts = []
+                if milestone.get("photo"):
+                    photo_tag = get_photo_store().img_tag(milestone["photo"], alt=milestone["text"])
+                    if photo_tag:
+                        st.markdown(photo_tag, unsafe_allow_html=True)
+                    elif get_photo_store().status(milestone["photo"]) == PROCESSING:
+                        st.caption(t("feed.photo_processing"))
 
-if "milestone_shares" not in st.session_state:
-    st.session_state.milestone_shares = []
+            with col2:
+                if st.button(t("feed.celebrate"), key=f"celebrate_{milestone['id']}") and not over_limit(CELEBRATE):
+                    get_feed_hub().celebrate(COMMUNITY_FEED, milestone["id"])
+                    owner = get_feed_hub().owner(COMMUNITY_FEED, milestone["id"])
+                    if owner is not None:
+                        # The owner's log carries the count, so it survives a restart
+                        get_event_store().record(owner, MILESTONE_CELEBRATED, {"id": milestone["id"]})
+                    st.success("🎉")
+                    st.rerun(scope="fragment")
+
+                celebrations = milestone.get("celebrations", 0)
+                if celebrations > 0:
+                    st.write(t("feed.celebrations", count=celebrations) if celebrations > 1 else t("feed.celebration"))
+
+            st.markdown("---")
+
+
+@st.fragment(run_every=2)
+def chat_room(room):
+    """One chat room, refreshed in place from the session's cursor."""
+    broker = get_chat_broker()
+    view = st.session_state.chat_views.get(room)
+    if view is None:
+        view = st.session_state.chat_views[room] = ChatView(broker, room)
+    broker.touch(room, st.session_state.session_key)
+    st.caption(t("chat.present", count=broker.present(room)))
+    # Filled after the form so a message just sent shows without a rerun
+    history = st.container(height=420)
+
+    with st.form(f"chat_form_{room}", clear_on_submit=True):
+        text = st.text_input(t("chat.message"), placeholder=t("chat.placeholder"))
+        if st.form_submit_button(t("chat.send")) and text.strip():
+            screening = screen(text)
+            if screening.resources():
+                show_crisis_resources(screening, t("chat.held_crisis"))
+            elif screening.flagged:
+                st.warning(t("chat.held_pii"))
+            elif not over_limit(CHAT):
+                broker.post(room, st.session_state.session_key, text,
+                            name=first_name(st.session_state.user_profile.get("parent_name")))
+                get_metrics().form_submissions.inc("chat_message")
+
+    view.sync()
+    with history:
+        if view.missed:
+            st.caption(t("chat.missed"))
+        if not view.messages:
+            st.info(t("chat.empty"))
+        for message in view.messages:
+            with st.chat_message("user" if message["author"] == st.session_state.session_key else "assistant",
+                                 avatar=ROOMS[room]):
+                st.caption(f"**{message['name'] or t('profile.a_parent')}** · {datetime.fromtimestamp(message['t']).strftime('%H:%M')}")
+                st.write(message["text"])
+
+
+# Which nearby service each crisis situation points to
+SITUATION_SERVICES = {
+    "Behavioral Crisis/Meltdown": CRISIS,
+    "Medical Emergency": HOSPITAL,
+    "School Crisis": PARENT_CENTER,
+    "Mental Health Crisis": CRISIS,
+}
+
+
+def family_location():
+    """(lat, lon, label) saved with the profile, resolving older profiles on the fly."""
+    profile = st.session_state.user_profile
+    if "location_point" in profile:
+        return profile["location_point"]
+    return resolve_location(profile.get("location", ""))
+
+
+def unresolved_location(location):
+    """Why a profile location couldn't be placed, e.g. a city name shared by several states."""
+    places = ambiguous_places(location)
+    if places:
+        return t("nearby.ambiguous", location=location, places=", ".join(places))
+    return t("nearby.unresolved", location=location)
+
+
+def show_activation(activation):
+    if activation.done:
+        render_activation_progress(activation)
+    else:
+        st.fragment(render_activation_progress, run_every=0.5)(activation, live=True)
 
-if "crisis_plans" not in st.session_state:
-    st.session_state.crisis_plans = []
 
-if "saved_resources" not in st.session_state:
-    st.session_state.saved_resources = []
+# Translations for the family's primary language
+t = get_translator(st.session_state.user_profile.get("primary_language", "English"))
+
+NAV_KEYS = {
+    "🏠 Home Dashboard": "nav.home",
+    "👤 User Profile": "nav.profile",
+    "🎉 Milestone Tracking": "nav.milestones",
+    "📱 Crisis Support": "nav.crisis",
+    "📚 Resources & Forms": "nav.resources",
+    "📊 Progress Analytics": "nav.analytics",
+    "💬 Peer Chat": "nav.chat",
+}
 
 # Sidebar navigation
-st.sidebar.markdown("# 🌟 Navigation")
+st.sidebar.markdown(f"# {t('app.navigation')}")
 selected_page = st.sidebar.selectbox(
-    "Choose a section:",
+    t("app.choose_section"),
     [
         "🏠 Home Dashboard",
         "👤 User Profile", 
         "🎉 Milestone Tracking",
         "📱 Crisis Support",
         "📚 Resources & Forms",
-        "📊 Progress Analytics"
-    ]
+        "📊 Progress Analytics",
+        "💬 Peer Chat"
+    ],
+    format_func=lambda page: t(NAV_KEYS[page])
 )
+page_label = NAV_KEYS[selected_page].split(".", 1)[1]
+get_metrics().reruns.inc(page_label)
+get_metrics().sessions.touch(st.session_state.session_key, family_state, st.session_state.community_feed.items)
+
+
+@st.fragment(run_every=30)
+def reminder_inbox():
+    """Fired reminders waiting in the sidebar until the family dismisses them."""
+    pending = get_reminders().pending(st.session_state.user_id)
+    if not pending:
+        return
+    st.markdown(t("reminders.inbox", count=len(pending)))
+    for reminder in pending[:5]:
+        st.write(f"{REMINDER_ICONS[reminder['kind']]} {reminder_title(reminder)}")
+        st.button(t("reminders.dismiss"), key=f"dismiss_{reminder['id']}", on_click=get_reminders().dismiss,
+                  args=(reminder["id"],), kwargs={"forget": reminder["kind"] == MEETING})
+
+
+@st.fragment(run_every=1)
+def report_progress(key):
+    """Progress bar for a report being built; reruns the page once the PDF is ready."""
+    builder = get_report_builder()
+    if builder.status(key) != BUILDING:
+        st.rerun()
+    st.progress(builder.progress(key), text=t("analytics.report_building"))
+
+
+if st.session_state.user_profile.get("notifications", True):
+    with st.sidebar:
+        reminder_inbox()
 
 # Main header
-st.markdown('<h1 class="main-header">🌟 Special Needs Parenting Support Hub</h1>', unsafe_allow_html=True)
+st.markdown(f'<h1 class="main-header">🌟 {t("app.title")}</h1>', unsafe_allow_html=True)
 
 # --- Home Dashboard ---
 if selected_page == "🏠 Home Dashboard":
-    st.markdown('<h2 class="section-header">🏠 Welcome to Your Support Hub</h2>', unsafe_allow_html=True)
+    st.markdown(f'<h2 class="section-header">{t("page.home")}</h2>', unsafe_allow_html=True)
     
     # Quick stats
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         milestone_count = len(st.session_state.milestone_shares)
-        st.metric("🎉 Milestones Shared", milestone_count)
+        st.metric(t("home.milestones_shared"), milestone_count)
     
     with col2:
         emergency_contacts_count = len(st.session_state.emergency_contacts)
-        st.metric("📞 Emergency Contacts", emergency_contacts_count)
+        st.metric(t("home.emergency_contacts"), emergency_contacts_count)
     
     with col3:
         crisis_plans_count = len(st.session_state.crisis_plans)
-        st.metric("📋 Crisis Plans", crisis_plans_count)
+        st.metric(t("home.crisis_plans"), crisis_plans_count)
     
     with col4:
         saved_resources_count = len(st.session_state.saved_resources)
-        st.metric("📚 Saved Resources", saved_resources_count)
+        st.metric(t("home.saved_resources"), saved_resources_count)
     
     # Quick access buttons
-    st.markdown("### 🚀 Quick Access")
+    st.markdown(t("home.quick_access"))
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if st.button("🚨 Emergency Resources", use_container_width=True, type="primary"):
+        if st.button(t("home.emergency_resources"), use_container_width=True, type="primary"):
             st.session_state.selected_page = "📱 Crisis Support"
             st.rerun()
     
     with col2:
-        if st.button("🎉 Share a Milestone", use_container_width=True):
+        if st.button(t("home.share_milestone"), use_container_width=True):
             st.session_state.selected_page = "🎉 Milestone Tracking"
             st.rerun()
     
     with col3:
-        if st.button("📚 Browse Resources", use_container_width=True):
+        if st.button(t("home.browse_resources"), use_container_width=True):
             st.session_state.selected_page = "📚 Resources & Forms"
             st.rerun()
     
     # Recent activity
-    st.markdown("### 📈 Recent Activity")
+    st.markdown(t("home.recent_activity"))
     
     if st.session_state.milestone_shares:
         recent_milestones = sorted(st.session_state.milestone_shares, key=lambda x: x["date"], reverse=True)[:3]
-        st.markdown("**🎉 Recent Milestones:**")
+        st.markdown(t("home.recent_milestones"))
         for milestone in recent_milestones:
-            st.write(f"• {milestone['text']} ({milestone['date']})")
+            review = {HELD: t("milestones.awaiting_review"),
+                      REJECTED: t("milestones.kept_private")}.get(milestone.get("moderation"), "")
+            st.write(f"• {milestone['text']} ({milestone['date']}){review}")
+
     else:
-        st.info("No recent milestones. Share your first milestone to get started!")
+        st.info(t("home.no_milestones"))
     
     # Daily tip
-    tips = [
-        "Remember to celebrate small victories - every step forward matters! 🌟",
-        "Take time for self-care today. You can't pour from an empty cup. ☕",
-        "Connect with other parents in your community for support and friendship. 👥",
-        "Document your child's progress - it helps you see how far you've come! 📝",
-        "Trust your instincts as a parent. You know your child best. 💝"
-    ]
+    tips = t("home.tips")
     
     import random
     daily_tip = random.choice(tips)
-    st.markdown(f"### 💡 Daily Tip")
+    st.markdown(t("home.daily_tip"))
     st.info(daily_tip)
 
 # --- User Profile Page ---
 elif selected_page == "👤 User Profile":
-    st.markdown('<h2 class="section-header">👤 User Profile</h2>', unsafe_allow_html=True)
+    st.markdown(f'<h2 class="section-header">{t("page.profile")}</h2>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["👨‍👩‍👧‍👦 Family Info", "⚙️ Preferences", "📊 Account Stats"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(t("profile.tabs"))
     
     with tab1:
-        st.markdown("### 👨‍👩‍👧‍👦 Family Information")
+        st.markdown(t("profile.family_title"))
         
         with st.form("family_profile"):
             col1, col2 = st.columns(2)
             
             with col1:
-                parent_name = st.text_input("Parent/Guardian Name", 
+                parent_name = st.text_input(t("profile.parent_name"), 
                     value=st.session_state.user_profile.get("parent_name", ""))
-                family_size = st.number_input("Family Size", min_value=1, max_value=20, 
+                family_size = st.number_input(t("profile.family_size"), min_value=1, max_value=20, 
                     value=st.session_state.user_profile.get("family_size", 1))
-                location = st.text_input("Location (City, State)", 
+                location = st.text_input(t("profile.location"), 
                     value=st.session_state.user_profile.get("location", ""))
             
             with col2:
-                primary_language = st.selectbox("Primary Language", 
+                primary_language = st.selectbox(t("profile.primary_language"), 
                     ["English", "Spanish", "French", "German", "Other"],
                     index=0 if not st.session_state.user_profile.get("primary_language") else 
-                    ["English", "Spanish", "French", "German", "Other"].index(st.session_state.user_profile.get("primary_language", "English")))
-                support_network = st.multiselect("Support Network", 
+                    ["English", "Spanish", "French", "German", "Other"].index(st.session_state.user_profile.get("primary_language", "English")),
+                    format_func=lambda value: t.label("profile.languages", value))
+                support_network = st.multiselect(t("profile.support_network"), 
                     ["Extended Family", "Friends", "Neighbors", "Support Groups", "Therapists", "Teachers", "Medical Team"],
-                    default=st.session_state.user_profile.get("support_network", []))
+                    default=st.session_state.user_profile.get("support_network", []),
+                    format_func=lambda value: t.label("profile.networks", value))
             
             # Children information
-            st.markdown("#### 👶 Children Information")
-            children_info = st.text_area("Tell us about your children (ages, diagnoses, interests)", 
+            st.markdown(t("profile.children_title"))
+            children_info = st.text_area(t("profile.children_info"), 
                 value=st.session_state.user_profile.get("children_info", ""),
-                placeholder="e.g., Sarah (8) - Autism, loves art and music; Michael (5) - ADHD, enjoys sports")
+                placeholder=t("profile.children_placeholder"))
             
-            if st.form_submit_button("💾 Save Profile"):
-                st.session_state.user_profile.update({
+            if st.form_submit_button(t("profile.save")) and not over_limit(SAVE):
+                record(PROFILE_UPDATED, {"changes": {
                     "parent_name": parent_name,
                     "family_size": family_size,
                     "location": location,
+                    # Resolved offline once here so the crisis page never parses it again
+                    "location_point": resolve_location(location),
                     "primary_language": primary_language,
                     "support_network": support_network,
                     "children_info": children_info,
                     "last_updated": date.today()
-                })
-                st.success("✅ Profile saved successfully!")
+                }})
+                st.success(t("profile.saved"))
                 st.rerun()
     
     with tab2:
-        st.markdown("### ⚙️ App Preferences")
+        st.markdown(t("profile.preferences_title"))
         
         with st.form("preferences"):
             col1, col2 = st.columns(2)
             
             with col1:
-                notifications = st.checkbox("Enable notifications", 
+                notifications = st.checkbox(t("profile.notifications"), 
                     value=st.session_state.user_profile.get("notifications", True))
-                public_milestones = st.checkbox("Share milestones publicly by default", 
+                public_milestones = st.checkbox(t("profile.public_milestones"), 
                     value=st.session_state.user_profile.get("public_milestones", True))
-                crisis_alerts = st.checkbox("Enable crisis support alerts", 
+                crisis_alerts = st.checkbox(t("profile.crisis_alerts"), 
                     value=st.session_state.user_profile.get("crisis_alerts", True))
             
             with col2:
-                theme = st.selectbox("App Theme", ["Light", "Dark", "Auto"],
+                theme = st.selectbox(t("profile.theme"), ["Light", "Dark", "Auto"],
                     index=0 if not st.session_state.user_profile.get("theme") else 
-                    ["Light", "Dark", "Auto"].index(st.session_state.user_profile.get("theme", "Light")))
-                timezone = st.selectbox("Timezone", 
+                    ["Light", "Dark", "Auto"].index(st.session_state.user_profile.get("theme", "Light")),
+                    format_func=lambda value: t.label("profile.themes", value))
+                timezone = st.selectbox(t("profile.timezone"), 
                     ["Eastern", "Central", "Mountain", "Pacific", "Alaska", "Hawaii"],
                     index=0 if not st.session_state.user_profile.get("timezone") else 
-                    ["Eastern", "Central", "Mountain", "Pacific", "Alaska", "Hawaii"].index(st.session_state.user_profile.get("timezone", "Eastern")))
+                    ["Eastern", "Central", "Mountain", "Pacific", "Alaska", "Hawaii"].index(st.session_state.user_profile.get("timezone", "Eastern")),
+                    format_func=lambda value: t.label("profile.timezones", value))
             
-            if st.form_submit_button("💾 Save Preferences"):
-                st.session_state.user_profile.update({
+            if st.form_submit_button(t("profile.save_preferences")) and not over_limit(SAVE):
+                record(PROFILE_UPDATED, {"changes": {
                     "notifications": notifications,
                     "public_milestones": public_milestones,
                     "crisis_alerts": crisis_alerts,
                     "theme": theme,
                     "timezone": timezone
-                })
-                st.success("✅ Preferences saved!")
+                }})
+                st.success(t("profile.preferences_saved"))
                 st.rerun()
     
     with tab3:
-        st.markdown("### 📊 Account Statistics")
+        st.markdown(t("profile.stats_title"))
         
         if st.session_state.user_profile:
             col1, col2 = st.columns(2)
             
             with col1:
-                st.metric("📅 Member Since", 
-                    st.session_state.user_profile.get("last_updated", "Today"))
-                st.metric("🎉 Milestones Shared", len(st.session_state.milestone_shares))
-                st.metric("📞 Emergency Contacts", len(st.session_state.emergency_contacts))
+                st.metric(t("profile.member_since"), 
+                    st.session_state.user_profile.get("last_updated", t("profile.today")))
+                st.metric(t("profile.milestones_shared"), len(st.session_state.milestone_shares))
+                st.metric(t("profile.emergency_contacts"), len(st.session_state.emergency_contacts))
             
             with col2:
-                st.metric("📋 Crisis Plans", len(st.session_state.crisis_plans))
-                st.metric("📚 Saved Resources", len(st.session_state.saved_resources))
+                st.metric(t("profile.crisis_plans"), len(st.session_state.crisis_plans))
+                st.metric(t("profile.saved_resources"), len(st.session_state.saved_resources))
                 
                 # Calculate engagement score
                 engagement_score = (
@@ -282,247 +983,348 @@ elif selected_page == "👤 User Profile":
                     len(st.session_state.crisis_plans) * 15 +
                     len(st.session_state.saved_resources) * 2
                 )
-                st.metric("🌟 Engagement Score", engagement_score)
+                st.metric(t("profile.engagement"), engagement_score)
+        else:
+            st.info(t("profile.complete_profile"))
+        
+        st.markdown(t("profile.activity_title"))
+        st.caption(t("profile.bookmark"))
+        
+        activity = get_event_store().history(st.session_state.user_id, limit=10)
+        if activity:
+            for event in activity:
+                st.write(f"• {describe(event, t.section('profile.events'), t('profile.undid'))} — "
+                         f"{datetime.fromtimestamp(event['t']).strftime('%b %d, %H:%M')}")
+            
+            if family_state["undo"] and st.button(t("profile.undo")):
+                undone = get_event_store().undo(st.session_state.user_id)
+                if undone["d"]["of"] == MILESTONE_SHARED:
+                    get_feed_hub().retract(COMMUNITY_FEED, undone["d"]["d"]["id"])
+                    get_repost_index().remove(undone["d"]["d"]["id"])
+                    get_moderation_queue().resolve(undone["d"]["d"]["id"])
+                elif undone["d"]["of"] == PROFILE_UPDATED:
+                    index_profile()
+                elif undone["d"]["of"] in (PLAN_SAVED, PLAN_DELETED):
+                    get_plan_index().reset(st.session_state.user_id, st.session_state.crisis_plans)
+                if undone["d"]["of"] in REMINDER_EVENTS:
+                    sync_reminders()
+                st.session_state.plan_activations.clear()
+                st.success(t("profile.undone"))
+                st.rerun()
         else:
-            st.info("Complete your profile to see statistics!")
+            st.info(t("profile.no_activity"))
+    
+    with tab4:
+        st.markdown(t("profile.matches_title"))
+        
+        profile = st.session_state.user_profile
+        matches = get_peer_index().similar(profile, k=5, exclude=st.session_state.user_id, describe=shared_label)
+        if not profile.get("children_info") and not profile.get("location"):
+            st.info(t("profile.matches_need_profile"))
+        elif not matches:
+            st.info(t("profile.matches_none"))
+        for user_id, score, shared, card in matches:
+            with st.container():
+                st.write(f"👤 **{card['name'] or t('profile.a_parent')}**"
+                         + (f" · 📍 {card['location']}" if card["location"] else ""))
+                if card["conditions"]:
+                    st.caption(t("profile.parenting", conditions=", ".join(
+                        t.label("profile.conditions", condition) for condition in card["conditions"])))
+                if shared:
+                    st.caption(t("profile.match", score=round(score * 100), shared=", ".join(shared[:4])))
+                st.markdown("---")
+        
+        if not profile.get("public_milestones", True):
+            st.caption(t("profile.hidden"))
+    
+    with tab5:
+        st.markdown(t("reminders.title"))
+        
+        timezone = st.session_state.user_profile.get("timezone", DEFAULT_TIMEZONE)
+        upcoming = get_reminders().upcoming(st.session_state.user_id)
+        if upcoming:
+            for reminder in upcoming:
+                col1, col2 = st.columns([4, 1])
+                with col1:
+                    when = local_time(reminder["next"], timezone).strftime("%a %b %d, %I:%M %p")
+                    repeat = t("reminders.every", days=reminder["every_days"]) if reminder["every_days"] else ""
+                    st.write(f"{REMINDER_ICONS[reminder['kind']]} **{reminder_title(reminder)}**")
+
+                    st.caption(f"{when} ({timezone}){repeat}")
+                with col2:
+                    if reminder["kind"] == MEETING and st.button(t("reminders.cancel"), key=f"cancel_{reminder['id']}"):
+                        get_reminders().cancel(reminder["id"])
+                        st.rerun()
+        else:
+            st.info(t("reminders.none"))
+        if not st.session_state.user_profile.get("notifications", True):
+            st.caption(t("reminders.off"))
+        
+        st.markdown(t("reminders.add_title"))
+        with st.form("meeting_reminder", clear_on_submit=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                meeting_title = st.text_input(t("reminders.what"), placeholder=t("reminders.what_placeholder"))
+                meeting_date = st.date_input(t("reminders.date"), min_value=date.today())
+            with col2:
+                meeting_time = st.time_input(t("reminders.time"), value=datetime.strptime("09:00", "%H:%M").time())
+                remind_when = st.selectbox(t("reminders.remind_me"), ["1 hour before", "Day before", "Week before"],
+                                           format_func=lambda value: t.label("reminders.leads", value))
+            
+            if st.form_submit_button(t("reminders.set")) and meeting_title and not over_limit(SAVE):
+                starts = at_local(meeting_date, meeting_time.strftime("%H:%M"), timezone)
+                lead = {"1 hour before": 3600, "Day before": 86400, "Week before": 7 * 86400}[remind_when]
+                get_reminders().schedule(f"{st.session_state.user_id}-meeting-{uuid.uuid4().hex}",
+                                         st.session_state.user_id, MEETING,
+                                         f"{meeting_title} — {local_time(starts, timezone).strftime('%b %d, %I:%M %p')}",
+                                         max(starts - lead, time.time()), timezone)
+                st.success(t("reminders.set_done"))
+
+                st.rerun()
 
 # --- Milestone Tracking Page ---
 elif selected_page == "🎉 Milestone Tracking":
-    st.markdown('<h2 class="section-header">🎉 Milestone Tracking & Community</h2>', unsafe_allow_html=True)
+    st.markdown(f'<h2 class="section-header">{t("page.milestones")}</h2>', unsafe_allow_html=True)
     
-    tab1, tab2 = st.tabs(["🎯 Track Milestones", "🌟 Community Celebrations"])
+    milestone_tabs = list(t("milestones.tabs"))
+    if is_moderator():
+        milestone_tabs.append(t("milestones.moderation_tab", count=len(get_moderation_queue())))
+    tab1, tab2, *moderation_tab = st.tabs(milestone_tabs)
     
     with tab1:
-        st.markdown("### 🎯 Share a New Milestone")
+        st.markdown(t("milestones.share_title"))
         
         with st.form("milestone_form"):
             col1, col2 = st.columns(2)
             
             with col1:
-                milestone_text = st.text_area("Describe the milestone", 
-                    placeholder="e.g., 'My daughter said her first full sentence today!'")
-                milestone_type = st.selectbox("Milestone Type", 
-                    ["Communication", "Educational", "Social", "Medical", "Behavioral", "Daily Living"])
+                milestone_text = st.text_area(t("milestones.describe"), 
+                    placeholder=t("milestones.describe_placeholder"))
+                milestone_type = st.selectbox(t("milestones.type"), 
+                    ["Communication", "Educational", "Social", "Medical", "Behavioral", "Daily Living"],
+                    format_func=lambda value: t.label("milestones.types", value))
             
             with col2:
-                child_age_milestone = st.text_input("Child's age (optional)")
-                share_publicly = st.checkbox("Share with community", value=True)
+                child_age_milestone = st.text_input(t("milestones.child_age"))
+                share_publicly = st.checkbox(t("milestones.share_publicly"), value=True)
             
-            if st.form_submit_button("🎉 Share Milestone"):
+            milestone_photo = st.file_uploader(t("milestones.photo"), type=ACCEPTED_TYPES)
+            
+            if st.form_submit_button(t("milestones.share")):
+                submission = submission_key(st.session_state.user_id, milestone_text, milestone_type,
+                                            child_age_milestone, share_publicly,
+                                            milestone_photo.file_id if milestone_photo is not None else "")
+                if milestone_text and over_limit(SHARE):
+                    milestone_text = None
+                if milestone_text and not get_submission_keys().claim(submission):
+                    # A double-click or a second tab sending the same form again
+                    st.info(t("milestones.already_shared"))
+                    milestone_text = None
+                
+                similar = get_repost_index().similar(milestone_text) if milestone_text and share_publicly else []
+                if similar and get_repost_index().reposted(milestone_text, st.session_state.user_id):
+                    st.warning(t("milestones.repost"))
+                    get_submission_keys().release(submission)
+                    milestone_text = None
+                
+                photo_key = None
+                if milestone_text and milestone_photo is not None:
+                    try:
+                        photo_key = get_photo_store().put(milestone_photo)
+                    except PhotoRejected as exc:
+                        st.error(t(f"milestones.photo_rejected.{exc.reason}", mb=MAX_UPLOAD_BYTES // (1024 * 1024)))
+                        get_submission_keys().release(submission)
+                        milestone_text = None
                 if milestone_text:
                     new_milestone_share = {
+                        "id": uuid.uuid4().hex,
                         "text": milestone_text,
                         "type": milestone_type,
                         "child_age": child_age_milestone,
-                        "shared_by": st.session_state.user_profile.get("parent_name", "Anonymous"),
+                        "shared_by": first_name(st.session_state.user_profile.get("parent_name")),
                         "date": date.today(),
                         "public": share_publicly,
                         "celebrations": 0
                     }
+                    if photo_key:
+                        new_milestone_share["photo"] = photo_key
                     
-                    st.session_state.milestone_shares.append(new_milestone_share)
+                    screening = screen(milestone_text)
+                    copied = any(similarity >= COPY_SIMILARITY and owner != st.session_state.user_id
+                                 for similarity, _, owner in similar) \
+                        and len(normalize(milestone_text)) >= COPY_MIN_CHARS
+                    held = share_publicly and (screening.flagged or screening.needs_review or copied)
+                    if held:
+                        new_milestone_share["moderation"] = HELD
                     
-                    st.success("🎉 Milestone shared! The community celebrates with you!")
-                    st.balloons()
-                    st.rerun()
+                    record(MILESTONE_SHARED, {"item": new_milestone_share})
+                    if held:
+                        get_moderation_queue().hold(st.session_state.user_id, new_milestone_share)
+                    elif share_publicly:
+                        get_feed_hub().share(COMMUNITY_FEED, new_milestone_share, owner=st.session_state.user_id)
+                        get_repost_index().add(new_milestone_share["id"], milestone_text,
+                                               owner=st.session_state.user_id)
+                    
+                    if held or screening.flagged:
+                        if held:
+                            st.info(t("milestones.held"))
+                        if screening.resources():
+                            show_crisis_resources(screening, t("crisis.resources_intro"))
+                    else:
+                        st.success(t("milestones.shared"))
+                        st.balloons()
+                        st.rerun()
     
     with tab2:
-        # Display shared milestones
-        if st.session_state.milestone_shares:
-            st.markdown("### 🎊 Recent Community Celebrations")
-            
-            for i, milestone in enumerate(sorted(st.session_state.milestone_shares, key=lambda x: x["date"], reverse=True)):
-                if milestone.get("public", True):
-                    with st.container():
-                        col1, col2 = st.columns([4, 1])
-                        
-                        with col1:
-                            milestone_icon = {"Communication": "🗣️", "Educational": "📚", "Social": "👫", 
-                                            "Medical": "🏥", "Behavioral": "🎯", "Daily Living": "🏠"}.get(milestone["type"], "🎉")
-                            
-                            st.write(f"{milestone_icon} **{milestone['text']}**")
-                            
-                            details = []
-                            if milestone.get("child_age"):
-                                details.append(f"Age: {milestone['child_age']}")
-                            details.append(f"Type: {milestone['type']}")
-                            details.append(f"Shared by {milestone['shared_by']}")
-                            details.append(f"{milestone['date']}")
-                            
-                            st.caption(" • ".join(details))
-                        
-                        with col2:
-                            if st.button("🎉 Celebrate!", key=f"celebrate_{i}"):
-                                st.session_state.milestone_shares[i]["celebrations"] += 1
-                                st.success("🎉")
-                                st.rerun()
-                            
-                            celebrations = milestone.get("celebrations", 0)
-                            if celebrations > 0:
-                                st.write(f"🎉 {celebrations} celebration{'s' if celebrations > 1 else ''}")
-                        
-                        st.markdown("---")
-        
-        else:
-            st.info("🎉 No milestones shared yet. Be the first to share a celebration!")
+        community_feed()
+        feed_watcher()
+
+    
+    for tab in moderation_tab:
+        with tab:
+            held = get_moderation_queue().pending()
+            if not held:
+                st.info(t("milestones.review_empty"))
+            for owner, milestone in held:
+                with st.container(border=True):
+                    st.write(f"**{milestone['text']}**")
+                    st.caption(t("milestones.review_details", type=t.label("milestones.types", milestone["type"]),
+                                 name=milestone["shared_by"] or t("profile.a_parent"), date=milestone["date"]))
+
+                    review = screen(milestone["text"])
+                    reasons = sorted(review.categories | {category for category, _ in review.negated})
+                    if reasons:
+                        st.caption(t("milestones.review_screening", reasons=", ".join(
+                            t.label("milestones.screening_categories", reason) for reason in reasons)))
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button(t("milestones.release"), key=f"release_{milestone['id']}"):
+                            moderate(milestone["id"], RELEASED)
+                            st.rerun()
+                    with col2:
+                        if st.button(t("milestones.keep_private"), key=f"reject_{milestone['id']}"):
+
+                            moderate(milestone["id"], REJECTED)
+                            st.rerun()
 
 # --- Crisis Support Page ---
 elif selected_page == "📱 Crisis Support":
-    st.markdown('<h2 class="section-header">📱 Crisis Support & Emergency Resources</h2>', unsafe_allow_html=True)
+    st.markdown(f'<h2 class="section-header">{t("page.crisis")}</h2>', unsafe_allow_html=True)
     
     # Emergency header
-    st.markdown("""
+    st.markdown(f"""
     <div class="emergency-card">
-        <h3>🚨 In Case of Emergency</h3>
-        <p><strong>If this is a life-threatening emergency, call 911 immediately.</strong></p>
-        <p>For mental health crises: National Suicide Prevention Lifeline: <strong>988</strong></p>
-        <p>Crisis Text Line: Text <strong>HOME</strong> to <strong>741741</strong></p>
+        <h3>{t("crisis.emergency_title")}</h3>
+        <p><strong>{t("crisis.emergency_911")}</strong></p>
+        <p>{t("crisis.emergency_988")}</p>
+        <p>{t("crisis.emergency_text")}</p>
     </div>
     """, unsafe_allow_html=True)
     
-    tab1, tab2, tab3, tab4 = st.tabs(["🆘 Immediate Help", "📞 Crisis Contacts", "🧠 Mental Health", "📋 Crisis Plans"])
+    tab1, tab2, tab3, tab4 = st.tabs(t("crisis.tabs"))
     
     with tab1:
-        st.markdown("### 🆘 Immediate Support Resources")
+        st.markdown(t("crisis.immediate_title"))
         
         # Quick access buttons
-        st.markdown("#### 🔥 Quick Access")
+        st.markdown(t("crisis.quick_access"))
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            if st.button("🚨 Call 911", use_container_width=True, type="primary"):
-                st.error("☎️ Calling 911 for emergency services...")
+            if st.button(t("crisis.call_911"), use_container_width=True, type="primary"):
+                st.error(t("crisis.calling_911"))
         
         with col2:
-            if st.button("💭 Crisis Text", use_container_width=True):
-                st.info("📱 Text HOME to 741741")
+            if st.button(t("crisis.crisis_text"), use_container_width=True):
+                st.info(t("crisis.text_home"))
         
         with col3:
-            if st.button("🧠 Mental Health Crisis", use_container_width=True):
-                st.info("☎️ Call 988 - Suicide & Crisis Lifeline")
+            if st.button(t("crisis.mental_health_crisis"), use_container_width=True):
+                st.info(t("crisis.call_988"))
         
         with col4:
-            if st.button("👮 Non-Emergency Police", use_container_width=True):
-                st.info("Contact your local non-emergency line")
+            if st.button(t("crisis.non_emergency"), use_container_width=True):
+                st.info(t("crisis.non_emergency_info"))
+        
+        # Nearest services from the bundled offline dataset
+        st.markdown(t("nearby.title"))
+        place = family_location()
+        if place:
+            st.caption(t("nearby.closest_to", place=place[2]))
+            near_cols = st.columns(3)
+            for near_col, kind in zip(near_cols, (HOSPITAL, PARENT_CENTER, CRISIS)):
+                with near_col:
+                    st.markdown(f"**{SERVICE_ICONS[kind]} {t.label('nearby.kinds', kind)}**")
+                    for service in nearby(place[:2], kind, k=2):
+                        line = service["name"]
+                        if service["phone"]:
+                            line += f" · ☎️ {service['phone']}"
+                        st.write(line)
+                        if "miles" in service:
+                            st.caption(f"{service['city']}, {service['state']} · {t('nearby.miles', miles=service['miles'])}")
+        elif st.session_state.user_profile.get("location"):
+            st.caption(unresolved_location(st.session_state.user_profile["location"]))
+        else:
+            st.caption(t("nearby.no_location"))
         
         # Situation-specific help
-        st.markdown("### 🎯 Situation-Specific Resources")
-        
-        crisis_situations = {
-            "Behavioral Crisis/Meltdown": {
-                "icon": "🌪️",
-                "immediate_steps": [
-                    "Ensure safety for everyone present",
-                    "Remove triggers if possible", 
-                    "Use calm, reassuring voice",
-                    "Try preferred calming strategies",
-                    "Give space and time to de-escalate"
-                ],
-                "when_to_call": "Call 911 if there's risk of serious injury to self or others",
-                "resources": [
-                    "Autism Crisis Support: 1-800-4AUTISM",
-                    "Local Crisis Mobile Response Team",
-                    "Your child's behavioral therapist"
-                ]
-            },
-            "Medical Emergency": {
-                "icon": "🏥",
-                "immediate_steps": [
-                    "Call 911 immediately",
-                    "Have medical information ready",
-                    "Know current medications",
-                    "Contact emergency contact person",
-                    "Bring medical summary to hospital"
-                ],
-                "when_to_call": "For seizures, breathing problems, loss of consciousness, severe injury",
-                "resources": [
-                    "Poison Control: 1-800-222-1222",
-                    "Your child's primary doctor",
-                    "Nearest children's hospital emergency department"
-                ]
-            },
-            "School Crisis": {
-                "icon": "🏫",
-                "immediate_steps": [
-                    "Contact school administration immediately",
-                    "Document the incident",
-                    "Request immediate IEP/504 meeting",
-                    "Know your rights",
-                    "Consider temporary alternative placement"
-                ],
-                "when_to_call": "For suspension threats, safety concerns, or discrimination",
-                "resources": [
-                    "Special Education Attorney",
-                    "State Department of Education Complaint Line",
-                    "Disability Rights Organizations"
-                ]
-            },
-            "Mental Health Crisis": {
-                "icon": "🧠",
-                "immediate_steps": [
-                    "Stay with the person",
-                    "Listen without judgment",
-                    "Remove means of self-harm",
-                    "Call crisis line for guidance",
-                    "Seek immediate professional help"
-                ],
-                "when_to_call": "For suicidal thoughts, self-harm, or severe depression/anxiety",
-                "resources": [
-                    "988 Suicide & Crisis Lifeline",
-                    "Crisis Text Line: 741741",
-                    "Local emergency mental health services"
-                ]
-            }
-        }
-        
-        for situation, info in crisis_situations.items():
+        st.markdown(t("crisis.situation_title"))
+        
+        for info in t("crisis.situations"):
+            situation = info["name"]
             with st.expander(f"{info['icon']} {situation}"):
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.markdown("**Immediate Steps:**")
+                    st.markdown(t("crisis.immediate_steps"))
                     for step in info["immediate_steps"]:
                         st.write(f"• {step}")
                     
-                    st.markdown(f"**When to Call 911:** {info['when_to_call']}")
+                    st.markdown(t("crisis.when_to_call", text=info["when_to_call"]))
                 
                 with col2:
-                    st.markdown("**Key Resources:**")
+                    st.markdown(t("crisis.key_resources"))
                     for resource in info["resources"]:
                         st.write(f"• {resource}")
+                    if place and info["id"] in SITUATION_SERVICES:
+                        closest = nearby(place[:2], SITUATION_SERVICES[info["id"]], k=1)[0]
+                        st.write(f"• 📍 " + (t("nearby.nearest", name=closest["name"], miles=closest["miles"])
+                                             if "miles" in closest else closest["name"]))
                 
                 # Quick action button
-                if st.button(f"📞 Get Help for {situation}", key=f"help_{situation}"):
-                    st.info(f"Connecting you with {situation.lower()} resources...")
+                if st.button(t("crisis.get_help", situation=situation), key=f"help_{info['id']}"):
+                    st.info(t("crisis.connecting", situation=situation))
     
     with tab2:
-        st.markdown("### 📞 Emergency Contact Directory")
+        st.markdown(t("contacts.directory_title"))
         
         # Personal emergency contacts
-        st.markdown("#### 👨‍👩‍👧‍👦 Your Personal Emergency Contacts")
+        st.markdown(t("contacts.personal_title"))
         
-        with st.expander("➕ Add Emergency Contact"):
+        with st.expander(t("contacts.add")):
             with st.form("emergency_contact"):
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    contact_name = st.text_input("Name*")
-                    contact_phone = st.text_input("Phone Number*")
-                    contact_relationship = st.selectbox("Relationship", 
+                    contact_name = st.text_input(t("contacts.name"))
+                    contact_phone = st.text_input(t("contacts.phone"))
+                    contact_relationship = st.selectbox(t("contacts.relationship"), 
                         ["Spouse/Partner", "Parent/Guardian", "Sibling", "Extended Family", 
-                         "Doctor", "Therapist", "Teacher", "Neighbor", "Friend", "Other"])
+                         "Doctor", "Therapist", "Teacher", "Neighbor", "Friend", "Other"],
+                        format_func=lambda value: t.label("contacts.relationships", value))
                 
                 with col2:
-                    contact_email = st.text_input("Email (optional)")
-                    contact_address = st.text_area("Address (optional)")
-                    contact_notes = st.text_area("Special Notes", 
-                        placeholder="e.g., 'Has key to house', 'Knows child's routine', 'Available 24/7'")
+                    contact_email = st.text_input(t("contacts.email"))
+                    contact_address = st.text_area(t("contacts.address"))
+                    contact_notes = st.text_area(t("contacts.notes"), 
+                        placeholder=t("contacts.notes_placeholder"))
                 
-                primary_contact = st.checkbox("Primary emergency contact")
+                primary_contact = st.checkbox(t("contacts.primary"))
                 
-                if st.form_submit_button("Add Contact"):
-                    if contact_name and contact_phone:
+                if st.form_submit_button(t("contacts.add_button")):
+                    if contact_name and contact_phone and not over_limit(ADD_CONTACT):
                         new_emergency_contact = {
+                            "id": uuid.uuid4().hex,
                             "name": contact_name,
                             "phone": contact_phone,
                             "email": contact_email,
@@ -532,8 +1334,8 @@ elif selected_page == "📱 Crisis Support":
                             "primary": primary_contact,
                             "added_date": date.today()
                         }
-                        st.session_state.emergency_contacts.append(new_emergency_contact)
-                        st.success(f"✅ Emergency contact {contact_name} added!")
+                        record(CONTACT_ADDED, {"item": new_emergency_contact})
+                        st.success(t("contacts.added", name=contact_name))
                         st.rerun()
         
         # Display emergency contacts
@@ -542,13 +1344,13 @@ elif selected_page == "📱 Crisis Support":
             other_contacts = [c for c in st.session_state.emergency_contacts if not c.get("primary", False)]
             
             if primary_contacts:
-                st.markdown("**🔴 Primary Emergency Contacts:**")
+                st.markdown(t("contacts.primary_heading"))
                 for i, contact in enumerate(primary_contacts):
                     with st.container():
                         col1, col2, col3 = st.columns([2, 1, 1])
                         
                         with col1:
-                            st.write(f"**{contact['name']}** - {contact['relationship']}")
+                            st.write(f"**{contact['name']}** - {t.label('contacts.relationships', contact['relationship'])}")
                             if contact.get('notes'):
                                 st.write(f"*{contact['notes']}*")
                         
@@ -558,42 +1360,34 @@ elif selected_page == "📱 Crisis Support":
                                 st.write(f"📧 {contact['email']}")
                         
                         with col3:
-                            if st.button("📞 Call", key=f"call_primary_{i}"):
-                                st.info(f"Calling {contact['name']}...")
-                            if st.button("🗑️", key=f"delete_primary_{i}", help="Delete"):
-                                st.session_state.emergency_contacts.remove(contact)
+                            if st.button(t("contacts.call"), key=f"call_primary_{i}"):
+                                st.info(t("contacts.calling", name=contact['name']))
+                            if st.button("🗑️", key=f"delete_primary_{i}", help=t("contacts.delete")):
+                                record(CONTACT_DELETED, {"id": contact["id"]})
                                 st.rerun()
             
             if other_contacts:
-                st.markdown("**📞 Other Emergency Contacts:**")
+                st.markdown(t("contacts.other_heading"))
                 for i, contact in enumerate(other_contacts):
-                    with st.expander(f"📞 {contact['name']} - {contact['relationship']}"):
+                    with st.expander(f"📞 {contact['name']} - {t.label('contacts.relationships', contact['relationship'])}"):
                         col1, col2 = st.columns(2)
                         with col1:
-                            st.write(f"**Phone:** {contact['phone']}")
+                            st.write(t("contacts.phone_label", phone=contact['phone']))
                             if contact.get('email'):
-                                st.write(f"**Email:** {contact['email']}")
+                                st.write(t("contacts.email_label", email=contact['email']))
                         with col2:
                             if contact.get('address'):
-                                st.write(f"**Address:** {contact['address']}")
+                                st.write(t("contacts.address_label", address=contact['address']))
                             if contact.get('notes'):
-                                st.write(f"**Notes:** {contact['notes']}")
+                                st.write(t("contacts.notes_label", notes=contact['notes']))
         
         else:
-            st.warning("⚠️ No emergency contacts added yet. Add at least one primary emergency contact.")
+            st.warning(t("contacts.none_warning"))
         
         # National crisis resources
-        st.markdown("### 🇺🇸 National Crisis Resources")
-        
-        national_resources = [
-            {"name": "911", "description": "Emergency services", "phone": "911", "type": "Emergency"},
-            {"name": "988 Suicide & Crisis Lifeline", "description": "24/7 mental health crisis support", "phone": "988", "type": "Mental Health"},
-            {"name": "Crisis Text Line", "description": "24/7 crisis support via text", "phone": "Text HOME to 741741", "type": "Mental Health"},
-            {"name": "National Child Abuse Hotline", "description": "Report child abuse", "phone": "1-800-4-A-CHILD (1-800-422-4453)", "type": "Safety"},
-            {"name": "Poison Control", "description": "24/7 poison emergency help", "phone": "1-800-222-1222", "type": "Medical"},
-            {"name": "Autism Crisis & Safety Resources", "description": "Autism-specific crisis support", "phone": "1-800-4-AUTISM", "type": "Disability-Specific"},
-            {"name": "NAMI Helpline", "description": "Mental health information and support", "phone": "1-800-950-NAMI (6264)", "type": "Mental Health"},
-        ]
+        st.markdown(t("contacts.national_title"))
+        
+        national_resources = t("contacts.national_resources")
         
         for resource in national_resources:
             with st.container():
@@ -605,46 +1399,54 @@ elif selected_page == "📱 Crisis Support":
                 
                 with col2:
                     st.write(f"📞 **{resource['phone']}**")
-                    st.write(f"Type: {resource['type']}")
+                    st.write(t("contacts.type_label", type=resource['type']))
                 
                 with col3:
-                    if st.button("📞 Call", key=f"call_{resource['name']}"):
-                        st.info(f"Calling {resource['name']}...")
-                    if st.button("💾 Save", key=f"save_{resource['name']}"):
-                        st.success("Saved to contacts!")
+                    if st.button(t("contacts.call"), key=f"call_{resource['name']}"):
+                        st.info(t("contacts.calling", name=resource['name']))
+                    if st.button(t("contacts.save"), key=f"save_{resource['name']}"):
+                        st.success(t("contacts.saved"))
     
     with tab3:
-        st.markdown("### 🧠 Mental Health Support")
+        st.markdown(t("checkin.title"))
         
         # Mental health assessment
-        st.markdown("#### 📊 Quick Mental Health Check")
+        st.markdown(t("checkin.quick_check"))
         
         with st.form("mental_health_check"):
-            st.write("How are you feeling right now? (This information is private and not shared)")
+            st.write(t("checkin.prompt"))
             
             col1, col2 = st.columns(2)
+            option_label = lambda value: t.label("checkin.options", value)
             
             with col1:
-                stress_level = st.select_slider("Stress Level", 
-                    options=["Very Low", "Low", "Moderate", "High", "Very High"])
-                energy_level = st.select_slider("Energy Level",
-                    options=["Very Low", "Low", "Moderate", "High", "Very High"])
-                mood = st.selectbox("Overall Mood", 
-                    ["Very Good", "Good", "Neutral", "Low", "Very Low"])
+                stress_level = st.select_slider(t("checkin.stress"), 
+                    options=["Very Low", "Low", "Moderate", "High", "Very High"], format_func=option_label)
+                energy_level = st.select_slider(t("checkin.energy"),
+                    options=["Very Low", "Low", "Moderate", "High", "Very High"], format_func=option_label)
+                mood = st.selectbox(t("checkin.mood"), 
+                    ["Very Good", "Good", "Neutral", "Low", "Very Low"], format_func=option_label)
             
             with col2:
-                sleep_quality = st.selectbox("Sleep Quality", 
-                    ["Excellent", "Good", "Fair", "Poor", "Very Poor"])
-                support_feeling = st.selectbox("Feeling Supported", 
-                    ["Very Supported", "Supported", "Neutral", "Unsupported", "Very Unsupported"])
-                coping_ability = st.selectbox("Ability to Cope", 
-                    ["Very Well", "Well", "Okay", "Struggling", "Very Struggling"])
+                sleep_quality = st.selectbox(t("checkin.sleep"), 
+                    ["Excellent", "Good", "Fair", "Poor", "Very Poor"], format_func=option_label)
+                support_feeling = st.selectbox(t("checkin.support"), 
+                    ["Very Supported", "Supported", "Neutral", "Unsupported", "Very Unsupported"], format_func=option_label)
+                coping_ability = st.selectbox(t("checkin.coping"), 
+                    ["Very Well", "Well", "Okay", "Struggling", "Very Struggling"], format_func=option_label)
             
-            additional_concerns = st.text_area("Any additional concerns or thoughts?")
+            additional_concerns = st.text_area(t("checkin.concerns"))
             
-            if st.form_submit_button("Submit Check-in"):
+            submitted = st.form_submit_button(t("checkin.submit"))
+            if submitted and over_limit(SUBMIT_CHECKIN):
+                # Not stored, but crisis resources are never held back by the limiter
+                screening = screen(additional_concerns)
+                if screening.resources():
+                    show_crisis_resources(screening, t("crisis.checkin_resources_intro"))
+            elif submitted:
                 # Store the mental health check
                 mental_health_entry = {
+                    "id": uuid.uuid4().hex,
                     "date": date.today(),
                     "stress_level": stress_level,
                     "energy_level": energy_level,
@@ -655,47 +1457,78 @@ elif selected_page == "📱 Crisis Support":
                     "additional_concerns": additional_concerns
                 }
                 
-                if "mental_health_checks" not in st.session_state:
-                    st.session_state.mental_health_checks = []
-                st.session_state.mental_health_checks.append(mental_health_entry)
+                record(CHECKIN_RECORDED, {"item": mental_health_entry})
+                risk = get_risk_model().update(st.session_state.user_id, mental_health_entry)
+                
+                st.success(t("checkin.recorded"))
                 
-                st.success("✅ Mental health check-in recorded. Thank you for taking care of yourself!")
+                screening = screen(additional_concerns)
                 
                 # Provide recommendations based on responses
-                if stress_level in ["High", "Very High"] or mood in ["Low", "Very Low"]:
-                    st.warning("⚠️ It looks like you might be experiencing some challenges. Consider reaching out for support.")
-                    st.info("💡 Immediate self-care suggestions: Take deep breaths, call a friend, go for a walk, or practice mindfulness.")
+                if screening.resources():
+                    show_crisis_resources(screening, t("crisis.checkin_resources_intro"))
+                elif risk["level"] == "High":
+                    st.warning(t("checkin.sustained"))
+                    st.info(t("checkin.self_care"))
+                elif stress_level in ["High", "Very High"] or mood in ["Low", "Very Low"] or risk["level"] == "Elevated":
+                    st.warning(t("checkin.challenges"))
+                    st.info(t("checkin.self_care"))
     
     with tab4:
-        st.markdown("### 📋 Crisis Response Plans")
+        st.markdown(t("plans.title"))
+        
+        # Find the right plan by what is happening, without opening every plan
+        if st.session_state.crisis_plans:
+            plan_query = st.text_input(t("plans.search"), key="plan_query",
+                                       placeholder=t("plans.search_placeholder"))
+            if plan_query.strip():
+                plans_by_id = {plan["id"]: plan for plan in st.session_state.crisis_plans}
+                found = [(plans_by_id[plan_id], matched)
+                         for plan_id, _, matched in get_plan_index().search(st.session_state.user_id, plan_query)
+                         if plan_id in plans_by_id]
+                if not found:
+                    st.info(t("plans.search_none"))
+                for plan, matched in found:
+                    st.markdown(f"**📋 {plan['name']}** ({t.label('plans.types', plan['type'])})")
+                    signs = matching_lines(plan["warning_signs"], matched)
+                    if signs:
+                        st.markdown(t("plans.warning_heading"))
+                        for line in signs:
+                            st.write(f"• {line}")
+                    st.markdown(t("plans.steps_heading"))
+                    for number, line in enumerate(lines(plan["immediate_steps"]), 1):
+                        st.write(f"{number}. {line}")
+                    st.markdown("---")
         
         # Create new crisis plan
-        with st.expander("➕ Create New Crisis Plan"):
+        with st.expander(t("plans.create")):
             with st.form("crisis_plan"):
-                plan_name = st.text_input("Plan Name", placeholder="e.g., 'Behavioral Meltdown Plan'")
-                crisis_type = st.selectbox("Crisis Type", 
-                    ["Behavioral", "Medical", "Mental Health", "School", "Safety", "Other"])
+                plan_name = st.text_input(t("plans.name"), placeholder=t("plans.name_placeholder"))
+                crisis_type = st.selectbox(t("plans.type"), 
+                    ["Behavioral", "Medical", "Mental Health", "School", "Safety", "Other"],
+                    format_func=lambda value: t.label("plans.types", value))
                 
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    warning_signs = st.text_area("Warning Signs", 
-                        placeholder="List early warning signs that indicate this crisis may be developing...")
-                    immediate_steps = st.text_area("Immediate Response Steps", 
-                        placeholder="Step-by-step actions to take when crisis occurs...")
+                    warning_signs = st.text_area(t("plans.warning_signs"), 
+                        placeholder=t("plans.warning_signs_placeholder"))
+                    immediate_steps = st.text_area(t("plans.steps"), 
+                        placeholder=t("plans.steps_placeholder"))
                 
                 with col2:
-                    contacts_to_call = st.text_area("Who to Contact", 
-                        placeholder="List people/services to contact in order of priority...")
-                    resources_needed = st.text_area("Resources/Items Needed", 
-                        placeholder="List any specific items, medications, or resources needed...")
+                    contacts_to_call = st.text_area(t("plans.contacts"), 
+                        placeholder=t("plans.contacts_placeholder"))
+                    resources_needed = st.text_area(t("plans.resources"), 
+                        placeholder=t("plans.resources_placeholder"))
                 
-                notes = st.text_area("Additional Notes", 
-                    placeholder="Any other important information...")
+                notes = st.text_area(t("plans.notes"), 
+                    placeholder=t("plans.notes_placeholder"))
                 
-                if st.form_submit_button("💾 Save Crisis Plan"):
+                if st.form_submit_button(t("plans.save")):
                     if plan_name and immediate_steps:
                         new_crisis_plan = {
+                            "id": uuid.uuid4().hex,
                             "name": plan_name,
                             "type": crisis_type,
                             "warning_signs": warning_signs,
@@ -706,133 +1539,140 @@ elif selected_page == "📱 Crisis Support":
                             "created_date": date.today(),
                             "last_used": None
                         }
-                        st.session_state.crisis_plans.append(new_crisis_plan)
-                        st.success(f"✅ Crisis plan '{plan_name}' saved!")
-                        st.rerun()
+                        record(PLAN_SAVED, {"item": new_crisis_plan})
+                        st.success(t("plans.saved", name=plan_name))
+                        
+                        screening = screen(notes)
+                        if screening.urgent:
+                            show_crisis_resources(screening, t("crisis.plan_notes_intro"))
+                        else:
+                            st.rerun()
         
         # Display existing crisis plans
         if st.session_state.crisis_plans:
-            st.markdown("### 📋 Your Crisis Plans")
+            st.markdown(t("plans.your_plans"))
             
             for i, plan in enumerate(st.session_state.crisis_plans):
-                with st.expander(f"📋 {plan['name']} ({plan['type']})"):
+                with st.expander(f"📋 {plan['name']} ({t.label('plans.types', plan['type'])})"):
                     col1, col2 = st.columns(2)
                     
                     with col1:
-                        st.markdown("**⚠️ Warning Signs:**")
+                        st.markdown(t("plans.warning_heading"))
                         st.write(plan['warning_signs'])
                         
-                        st.markdown("**🚨 Immediate Steps:**")
+                        st.markdown(t("plans.steps_heading"))
                         st.write(plan['immediate_steps'])
                     
                     with col2:
-                        st.markdown("**📞 Contacts to Call:**")
+                        st.markdown(t("plans.contacts_heading"))
                         st.write(plan['contacts_to_call'])
                         
-                        st.markdown("**🎒 Resources Needed:**")
+                        st.markdown(t("plans.resources_heading"))
                         st.write(plan['resources_needed'])
                     
                     if plan['notes']:
-                        st.markdown("**📝 Additional Notes:**")
+                        st.markdown(t("plans.notes_heading"))
                         st.write(plan['notes'])
                     
                     # Action buttons
                     button_col1, button_col2, button_col3 = st.columns(3)
                     
                     with button_col1:
-                        if st.button("🚨 Activate Plan", key=f"activate_{i}"):
-                            st.session_state.crisis_plans[i]["last_used"] = date.today()
-                            st.success(f"✅ Crisis plan '{plan['name']}' activated!")
-                            st.info("📞 Remember to follow the contact list and immediate steps outlined in your plan.")
+                        if st.button(t("plans.activate"), key=f"activate_{i}"):
+                            record(PLAN_ACTIVATED, {"id": plan["id"], "date": date.today()})
+                            get_metrics().plan_activations.inc()
+                            st.session_state.plan_activations[i] = activate_plan(
+                                plan, st.session_state.emergency_contacts,
+                                st.session_state.user_profile.get("parent_name") or "A parent")
+                            st.success(t("plans.activated", name=plan['name']))
+                            st.info(t("plans.follow_reminder"))
                     
                     with button_col2:
-                        if st.button("✏️ Edit", key=f"edit_{i}"):
-                            st.info("Edit functionality would open the plan for editing...")
+                        if st.button(t("plans.edit"), key=f"edit_{i}"):
+                            st.info(t("plans.edit_info"))
                     
                     with button_col3:
-                        if st.button("🗑️ Delete", key=f"delete_plan_{i}"):
-                            st.session_state.crisis_plans.pop(i)
-                            st.success("Crisis plan deleted!")
+                        if st.button(t("plans.delete"), key=f"delete_plan_{i}"):
+                            record(PLAN_DELETED, {"id": plan["id"]})
+                            st.session_state.plan_activations.clear()
+                            st.success(t("plans.deleted"))
                             st.rerun()
+
+                    if i in st.session_state.plan_activations:
+                        st.markdown(t("plans.progress_heading"))
+                        show_activation(st.session_state.plan_activations[i])
         
         else:
-            st.info("📋 No crisis plans created yet. Create your first plan to be prepared for emergencies.")
+            st.info(t("plans.none"))
 
 # --- Resources & Forms Page ---
 elif selected_page == "📚 Resources & Forms":
-    st.markdown('<h2 class="section-header">📚 Resources & Forms</h2>', unsafe_allow_html=True)
+    st.markdown(f'<h2 class="section-header">{t("page.resources")}</h2>', unsafe_allow_html=True)
+    
+    # One search box drives all three tabs
+    search_index = get_search_index(catalog_version(RESOURCES, TEMPLATE_CATEGORIES, EXTERNAL_LINKS), t.language)
+    search_term = st.text_input(t("resources.search"), key="catalog_query",
+                                placeholder=t("resources.search_placeholder"))
+    search_results = search_index.search(search_term)
     
-    tab1, tab2, tab3 = st.tabs(["📖 Educational Resources", "📋 Forms & Templates", "🔗 External Links"])
+    suggestions = [entry for entry in search_index.suggest(search_term, limit=6)
+                   if entry["label"].casefold() != search_term.strip().casefold()]
+    if suggestions:
+        st.caption(t("resources.suggestions"))
+        suggestion_cols = st.columns(len(suggestions))
+        for suggestion_col, entry in zip(suggestion_cols, suggestions):
+            with suggestion_col:
+                st.button(f"{KIND_ICONS[entry['kind']]} {entry['label']}",
+                          key=f"suggest_{entry['kind']}_{entry['key']}",
+                          on_click=pick_suggestion, args=(entry["label"],))
+    if search_results is not None:
+        st.caption(t("resources.search_summary",
+                     resources=len(search_results[RESOURCE]),
+                     templates=len(search_results[TEMPLATE]),
+                     links=len(search_results[LINK])))
+    
+    tab1, tab2, tab3 = st.tabs(t("resources.tabs"))
     
     with tab1:
-        st.markdown("### 📖 Educational Resources")
+        recommendations = recommended_resources()
+        if recommendations:
+            st.markdown(t("resources.recommended"))
+            rec_cols = st.columns(len(recommendations))
+            for rec_col, (resource, _, reasons) in zip(rec_cols, recommendations):
+                with rec_col:
+                    st.write(f"**📄 {resource_text(resource, 'title')}**")
+                    st.caption(f"{t.label('resources.types', resource['type'])} • {resource['length']}")
+                    st.caption(t("resources.because", reasons=", ".join(reason_text(reason) for reason in reasons)))
+                    if st.button(t("resources.save"), key=f"save_rec_{resource['title']}") and not over_limit(SAVE):
+                        record(RESOURCE_SAVED, {"item": resource})
+                        st.success(t("resources.saved"))
+                        st.rerun()
         
-        # Search and filter
-        col1, col2, col3 = st.columns(3)
+        st.markdown(t("resources.title"))
+        
+        # Filter
+        col1, col2 = st.columns(2)
         
         with col1:
-            search_term = st.text_input("🔍 Search resources", placeholder="Enter keywords...")
+            resource_category = st.selectbox(t("resources.category"), 
+                ["All", "Autism", "ADHD", "Learning Disabilities", "Behavioral", "Medical", "Legal", "Educational"],
+                format_func=lambda value: t.label("resources.categories", value))
         
         with col2:
-            resource_category = st.selectbox("Category", 
-                ["All", "Autism", "ADHD", "Learning Disabilities", "Behavioral", "Medical", "Legal", "Educational"])
+            resource_type = st.selectbox(t("resources.type"), 
+                ["All", "Article", "Video", "Webinar", "Podcast", "Book", "Guide", "Checklist"],
+                format_func=lambda value: t.label("resources.types", value))
         
-        with col3:
-            resource_type = st.selectbox("Type", 
-                ["All", "Article", "Video", "Webinar", "Podcast", "Book", "Guide", "Checklist"])
-        
-        # Sample resources
-        sample_resources = [
-            {
-                "title": "Understanding IEP vs 504 Plans",
-                "description": "Comprehensive guide to special education services and accommodations",
-                "type": "Guide",
-                "category": "Educational",
-                "topics": ["IEP", "504 Plan", "Special Education", "Accommodations"],
-                "length": "15 min read",
-                "rating": 4.8,
-                "url": "#"
-            },
-            {
-                "title": "Autism Sensory Strategies",
-                "description": "Practical strategies for managing sensory challenges in daily life",
-                "type": "Article",
-                "category": "Autism",
-                "topics": ["Sensory Processing", "Autism", "Daily Living", "Strategies"],
-                "length": "10 min read",
-                "rating": 4.9,
-                "url": "#"
-            },
-            {
-                "title": "ADHD Medication Guide",
-                "description": "Understanding medication options and side effects for ADHD",
-                "type": "Guide",
-                "category": "ADHD",
-                "topics": ["ADHD", "Medication", "Treatment", "Side Effects"],
-                "length": "20 min read",
-                "rating": 4.7,
-                "url": "#"
-            },
-            {
-                "title": "Behavioral Intervention Strategies",
-                "description": "Evidence-based approaches to managing challenging behaviors",
-                "type": "Video",
-                "category": "Behavioral",
-                "topics": ["Behavior", "Intervention", "ABA", "Strategies"],
-                "length": "45 min watch",
-                "rating": 4.6,
-                "url": "#"
-            }
-        ]
+        sample_resources = RESOURCES
         
         # Filter resources based on search and category
         filtered_resources = sample_resources
         
-        if search_term:
-            filtered_resources = [r for r in filtered_resources 
-                                if search_term.lower() in r['title'].lower() or 
-                                   search_term.lower() in r['description'].lower() or
-                                   any(search_term.lower() in topic.lower() for topic in r['topics'])]
+        if search_results is not None:
+            filtered_resources = [entry["item"] for entry in search_results[RESOURCE]]
+            matched_topics = {entry["key"] for entry in search_results[TOPIC]}
+            filtered_resources += [r for r in sample_resources
+                                   if r not in filtered_resources and matched_topics & set(r['topics'])]
         
         if resource_category != "All":
             filtered_resources = [r for r in filtered_resources if r['category'] == resource_category]
@@ -847,129 +1687,106 @@ elif selected_page == "📚 Resources & Forms":
                     col1, col2, col3 = st.columns([3, 1, 1])
                     
                     with col1:
-                        st.write(f"**📄 {resource['title']}**")
-                        st.write(resource['description'])
+                        st.write(f"**📄 {resource_text(resource, 'title')}**")
+                        st.write(resource_text(resource, 'description'))
                         topics_text = " • ".join(resource['topics'])
-                        st.write(f"**Topics:** {topics_text}")
+                        st.write(t("resources.topics_label", topics=topics_text))
                         
                     with col2:
-                        st.write(f"**Type:** {resource['type']}")
-                        st.write(f"**Length:** {resource['length']}")
+                        st.write(t("resources.type_label", type=t.label("resources.types", resource['type'])))
+                        st.write(t("resources.length_label", length=resource['length']))
                         rating_stars = "⭐" * int(resource['rating'])
-                        st.write(f"**Rating:** {rating_stars} {resource['rating']}")
+                        st.write(t("resources.rating_label", stars=rating_stars, rating=resource['rating']))
                     
                     with col3:
-                        if st.button("📖 Read Now", key=f"read_{resource['title']}"):
-                            st.info("Opening resource viewer...")
-                        if st.button("💾 Save", key=f"save_{resource['title']}"):
-                            if resource not in st.session_state.saved_resources:
-                                st.session_state.saved_resources.append(resource)
-                                st.success("Saved to your library!")
-                            else:
-                                st.info("Already in your library!")
+                        if st.button(t("resources.read_now"), key=f"read_{resource['title']}"):
+                            st.info(t("resources.opening_viewer"))
+                        if st.button(t("resources.save"), key=f"save_{resource['title']}"):
+                            if resource in st.session_state.saved_resources:
+                                st.info(t("resources.already_saved"))
+                            elif not over_limit(SAVE):
+                                record(RESOURCE_SAVED, {"item": resource})
+                                st.success(t("resources.saved"))
                     
                     st.markdown("---")
         else:
-            st.info("No resources found matching your criteria. Try adjusting your search or filters.")
+            st.info(t("resources.no_results"))
     
     with tab2:
-        st.markdown("### 📋 Forms & Templates")
+        st.markdown(t("resources.templates_title"))
         
         # Template categories
-        template_categories = {
-            "IEP & 504 Planning": [
-                "IEP Meeting Preparation Checklist",
-                "IEP Goal Tracking Sheet", 
-                "504 Plan Request Template",
-                "Parent Input Form for IEP",
-                "Transition Assessment Form"
-            ],
-            "Medical & Therapy": [
-                "Medical History Summary",
-                "Therapy Progress Tracker", 
-                "Medication Log Template",
-                "Doctor Visit Preparation Form",
-                "Insurance Appeal Letter Template"
-            ],
-            "Daily Living": [
-                "Behavior Support Plan Template",
-                "Daily Schedule Visual",
-                "Chore Chart Template",
-                "Social Stories Template",
-                "Communication Board Template"
-            ],
-            "Legal & Advocacy": [
-                "Special Education Complaint Form",
-                "Due Process Request Template",
-                "Accommodation Request Letter",
-                "Meeting Documentation Form",
-                "Rights Violation Report"
-            ]
-        }
+        template_categories = TEMPLATE_CATEGORIES
+        
+        if search_results is not None:
+            matched_templates = {entry["key"] for entry in search_results[TEMPLATE]}
+            template_categories = {category: [template for template in templates if template in matched_templates]
+                                   for category, templates in template_categories.items()}
+            template_categories = {category: templates for category, templates in template_categories.items() if templates}
+            if not template_categories:
+                st.info(t("resources.no_template_results"))
         
         for category, templates in template_categories.items():
-            with st.expander(f"📁 {category}"):
+            with st.expander(f"📁 {t.label('template_categories', category)}", expanded=search_results is not None):
                 col1, col2 = st.columns(2)
                 
                 for i, template in enumerate(templates):
+                    template_name = t.label("templates", template)
                     with col1 if i % 2 == 0 else col2:
-                        st.write(f"📄 **{template}**")
+                        st.write(f"📄 **{template_name}**")
                         
                         template_col1, template_col2 = st.columns(2)
                         with template_col1:
-                            if st.button("📥 Download", key=f"download_{template}"):
-                                st.success(f"Downloaded {template}!")
+                            if st.button(t("resources.download"), key=f"download_{template}"):
+                                st.success(t("resources.downloaded", template=template_name))
                         with template_col2:
-                            if st.button("👁️ Preview", key=f"preview_{template}"):
-                                st.info(f"Previewing {template}...")
+                            if st.button(t("resources.preview"), key=f"preview_{template}"):
+                                st.info(t("resources.previewing", template=template_name))
     
     with tab3:
-        st.markdown("### 🔗 Helpful External Links")
-        
-        external_links = {
-            "Government Resources": [
-                {"name": "IDEA - Individuals with Disabilities Education Act", "url": "https://sites.ed.gov/idea/"},
-                {"name": "Office for Civil Rights", "url": "https://www2.ed.gov/about/offices/list/ocr/"},
-                {"name": "Social Security Disability Benefits", "url": "https://www.ssa.gov/disability/"},
-                {"name": "Centers for Disease Control - Developmental Disabilities", "url": "https://www.cdc.gov/ncbddd/developmentaldisabilities/"}
-            ],
-            "National Organizations": [
-                {"name": "Autism Society", "url": "https://autismsociety.org/"},
-                {"name": "National Down Syndrome Society", "url": "https://www.ndss.org/"},
-                {"name": "CHADD - ADHD Support", "url": "https://chadd.org/"},
-                {"name": "National Association for Mental Illness (NAMI)", "url": "https://nami.org/"}
-            ],
-            "Educational Support": [
-                {"name": "Understood.org", "url": "https://www.understood.org/"},
-                {"name": "Wrightslaw - Special Education Law", "url": "https://www.wrightslaw.com/"},
-                {"name": "Council of Parent Attorneys and Advocates", "url": "https://www.copaa.org/"},
-                {"name": "National Center for Learning Disabilities", "url": "https://www.ncld.org/"}
-            ]
-        }
+        st.markdown(t("resources.links_title"))
+        
+        external_links = EXTERNAL_LINKS
+        link_health = get_link_health()
+        
+        if search_results is not None:
+            matched_links = {entry["key"] for entry in search_results[LINK]}
+            external_links = {category: [link for link in links if link['name'] in matched_links]
+                              for category, links in external_links.items()}
+            external_links = {category: links for category, links in external_links.items() if links}
+            if not external_links:
+                st.info(t("resources.no_link_results"))
         
         for category, links in external_links.items():
-            with st.expander(f"🔗 {category}"):
+            with st.expander(f"🔗 {t.label('link_categories', category)}", expanded=search_results is not None):
                 for link in links:
                     col1, col2 = st.columns([3, 1])
                     with col1:
                         st.write(f"**{link['name']}**")
+                        st.caption(link_status(link_health.get(link['url'])))
                     with col2:
-                        if st.button("🔗 Visit", key=f"visit_{link['name']}"):
-                            st.info(f"Opening {link['name']}...")
+                        if st.button(t("resources.visit"), key=f"visit_{link['name']}"):
+                            st.info(t("resources.opening", name=link['name']))
 
 # --- Progress Analytics Page ---
 elif selected_page == "📊 Progress Analytics":
-    st.markdown('<h2 class="section-header">📊 Progress Analytics</h2>', unsafe_allow_html=True)
+    st.markdown(f'<h2 class="section-header">{t("page.analytics")}</h2>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["📈 Milestone Trends", "🧠 Mental Health Tracking", "📋 Activity Summary"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(t("analytics.tabs"))
     
     with tab1:
-        st.markdown("### 📈 Milestone Progress Over Time")
+        st.markdown(t("analytics.trends_title"))
         
-        if st.session_state.milestone_shares:
+        milestone_range = st.selectbox(t("analytics.time_range"), HISTORY_RANGES, key="milestone_range",
+                                       format_func=lambda value: t.label("analytics.ranges", value))
+        milestones = family_history("milestone_shares", milestone_range)
+        if milestone_range == "Recent" and archived_count("milestone_shares"):
+            st.caption(t("analytics.archived", count=archived_count("milestone_shares")))
+        
+        if milestones:
             # Create milestone data for visualization
             milestone_data = []
-            for milestone in st.session_state.milestone_shares:
+            for milestone in milestones:
                 milestone_data.append({
                     "Date": milestone["date"],
                     "Type": milestone["type"],
@@ -979,67 +1796,77 @@ elif selected_page == "📊 Progress Analytics":
             df = pd.DataFrame(milestone_data)
             
             # Milestone count by type
-            st.markdown("#### 🎯 Milestones by Type")
+            st.markdown(t("analytics.by_type"))
             milestone_counts = df['Type'].value_counts()
             
             col1, col2 = st.columns(2)
             
             with col1:
                 for milestone_type, count in milestone_counts.items():
-                    st.metric(milestone_type, count)
+                    st.metric(t.label("milestones.types", milestone_type), count)
             
             with col2:
                 # Simple bar chart representation
-                st.write("**Distribution:**")
+                st.write(t("analytics.distribution"))
                 for milestone_type, count in milestone_counts.items():
                     percentage = (count / len(df)) * 100
-                    st.write(f"{milestone_type}: {count} ({percentage:.1f}%)")
+                    st.write(t("analytics.share_of_type", type=t.label("milestones.types", milestone_type),
+                               count=count, percent=percentage))
             
             # Recent milestone activity
-            st.markdown("#### 📅 Recent Activity")
-            recent_milestones = sorted(st.session_state.milestone_shares, key=lambda x: x["date"], reverse=True)[:5]
+            st.markdown(t("analytics.recent_activity"))
+            recent_milestones = milestones[:5]
             
             for milestone in recent_milestones:
                 col1, col2, col3 = st.columns([2, 1, 1])
                 with col1:
                     st.write(f"**{milestone['text'][:50]}...**" if len(milestone['text']) > 50 else f"**{milestone['text']}**")
                 with col2:
-                    st.write(f"{milestone['type']}")
+                    st.write(t.label("milestones.types", milestone["type"]))
                 with col3:
                     st.write(f"{milestone['date']}")
         
         else:
-            st.info("📊 No milestone data available yet. Start sharing milestones to see your progress!")
+            st.info(t("analytics.no_milestones"))
     
     with tab2:
-        st.markdown("### 🧠 Mental Health Trends")
+        st.markdown(t("analytics.wellbeing_title"))
         
-        if "mental_health_checks" in st.session_state and st.session_state.mental_health_checks:
-            # Display recent mental health trends
-            recent_checks = sorted(st.session_state.mental_health_checks, key=lambda x: x["date"], reverse=True)[:5]
+        total_checks = len(st.session_state.mental_health_checks) + archived_count("mental_health_checks")
+        if total_checks:
+            # Older check-ins are only read from the archive once the family asks for them
+            checks_shown = st.session_state.get("checks_shown", 5)
+            checks = family_history("mental_health_checks",
+                                    "All time" if checks_shown > len(st.session_state.mental_health_checks) else "Recent")
+            recent_checks = checks[:checks_shown]
             
-            st.markdown("#### 📊 Recent Check-ins")
+            st.markdown(t("analytics.recent_checkins"))
             
             for check in recent_checks:
-                with st.expander(f"Check-in from {check['date']}"):
+                with st.expander(t("analytics.checkin_from", date=check["date"])):
                     col1, col2 = st.columns(2)
                     
                     with col1:
-                        st.write(f"**Stress Level:** {check['stress_level']}")
-                        st.write(f"**Energy Level:** {check['energy_level']}")
-                        st.write(f"**Mood:** {check['mood']}")
+                        st.write(f"**{t('checkin.stress')}:** {t.label('checkin.options', check['stress_level'])}")
+                        st.write(f"**{t('checkin.energy')}:** {t.label('checkin.options', check['energy_level'])}")
+                        st.write(f"**{t('checkin.mood')}:** {t.label('checkin.options', check['mood'])}")
                     
                     with col2:
-                        st.write(f"**Sleep Quality:** {check['sleep_quality']}")
-                        st.write(f"**Feeling Supported:** {check['support_feeling']}")
-                        st.write(f"**Coping Ability:** {check['coping_ability']}")
+                        st.write(f"**{t('checkin.sleep')}:** {t.label('checkin.options', check['sleep_quality'])}")
+                        st.write(f"**{t('checkin.support')}:** {t.label('checkin.options', check['support_feeling'])}")
+                        st.write(f"**{t('checkin.coping')}:** {t.label('checkin.options', check['coping_ability'])}")
                     
                     if check.get('additional_concerns'):
-                        st.write(f"**Additional Concerns:** {check['additional_concerns']}")
+                        st.write(f"**{t('analytics.additional_concerns')}:** {check['additional_concerns']}")
+            
+            if checks_shown < total_checks:
+                if st.button(t("analytics.show_older")):
+                    st.session_state.checks_shown = checks_shown + 10
+                    st.rerun()
             
             # Simple trend indicators
             if len(recent_checks) >= 2:
-                st.markdown("#### 📈 Trend Indicators")
+                st.markdown(t("analytics.trend_title"))
                 
                 latest = recent_checks[0]
                 previous = recent_checks[1]
@@ -1057,110 +1884,219 @@ elif selected_page == "📊 Progress Analytics":
                 
                 with col1:
                     if latest_stress_idx < previous_stress_idx:
-                        st.success("📉 Stress levels are improving!")
+                        st.success(t("analytics.stress_improving"))
                     elif latest_stress_idx > previous_stress_idx:
-                        st.warning("📈 Stress levels have increased")
+                        st.warning(t("analytics.stress_increased"))
                     else:
-                        st.info("➡️ Stress levels are stable")
+                        st.info(t("analytics.stress_stable"))
                 
                 with col2:
                     if latest_mood_idx < previous_mood_idx:
-                        st.success("😊 Mood is improving!")
+                        st.success(t("analytics.mood_improving"))
                     elif latest_mood_idx > previous_mood_idx:
-                        st.warning("😔 Mood has declined")
+                        st.warning(t("analytics.mood_declined"))
                     else:
-                        st.info("➡️ Mood is stable")
+                        st.info(t("analytics.mood_stable"))
+            
+            risk = get_risk_model().score(st.session_state.user_id)
+            if risk:
+                st.markdown(t("analytics.risk_title"))
+                level_icon = {"Low": "🟢", "Elevated": "🟡", "High": "🔴"}[risk["level"]]
+                st.metric(t("analytics.risk_overall"), f"{level_icon} {t.label('analytics.risk_levels', risk['level'])}",
+                          help=t("analytics.risk_help"))
+                
+                col1, col2 = st.columns(2)
+                for j, name in enumerate(["sustained_stress", "mood_trend", "poor_sleep", "falling_support"]):
+                    with col1 if j % 2 == 0 else col2:
+                        st.write(t.label("analytics.risk_components", name))
+                        st.progress(risk["components"][name])
         
         else:
-            st.info("🧠 No mental health check-ins recorded yet. Complete a check-in in the Crisis Support section to track your wellbeing.")
+            st.info(t("analytics.no_checkins"))
     
     with tab3:
-        st.markdown("### 📋 Activity Summary")
+        st.markdown(t("analytics.summary_title"))
         
         # Overall statistics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("🎉 Total Milestones", len(st.session_state.milestone_shares))
+            st.metric(t("analytics.total_milestones"),
+                      len(st.session_state.milestone_shares) + archived_count("milestone_shares"))
         
         with col2:
-            st.metric("📞 Emergency Contacts", len(st.session_state.emergency_contacts))
+            st.metric(t("profile.emergency_contacts"), len(st.session_state.emergency_contacts))
         
         with col3:
-            st.metric("📋 Crisis Plans", len(st.session_state.crisis_plans))
+            st.metric(t("profile.crisis_plans"), len(st.session_state.crisis_plans))
         
         with col4:
-            mental_health_checks = len(st.session_state.get("mental_health_checks", []))
-            st.metric("🧠 Mental Health Check-ins", mental_health_checks)
+            mental_health_checks = len(st.session_state.mental_health_checks) + archived_count("mental_health_checks")
+            st.metric(t("analytics.checkins"), mental_health_checks)
         
         # Activity breakdown
-        st.markdown("#### 📊 Activity Breakdown")
+        st.markdown(t("analytics.breakdown"))
         
         if st.session_state.milestone_shares:
             # Milestone celebrations received
             total_celebrations = sum(milestone.get("celebrations", 0) for milestone in st.session_state.milestone_shares)
-            st.write(f"🎉 **Total Celebrations Received:** {total_celebrations}")
+            st.write(t("analytics.total_celebrations", count=total_celebrations))
             
             # Most celebrated milestone
             if total_celebrations > 0:
                 most_celebrated = max(st.session_state.milestone_shares, key=lambda x: x.get("celebrations", 0))
-                st.write(f"🏆 **Most Celebrated Milestone:** {most_celebrated['text'][:50]}... ({most_celebrated.get('celebrations', 0)} celebrations)")
+                st.write(t("analytics.most_celebrated", text=most_celebrated["text"][:50],
+                           count=most_celebrated.get("celebrations", 0)))
         
         # Profile completion
-        st.markdown("#### ✅ Profile Completion")
+        st.markdown(t("analytics.completion_title"))
         
         profile_items = [
-            ("Parent Name", bool(st.session_state.user_profile.get("parent_name"))),
-            ("Family Information", bool(st.session_state.user_profile.get("children_info"))),
-            ("Emergency Contacts", len(st.session_state.emergency_contacts) > 0),
-            ("Crisis Plans", len(st.session_state.crisis_plans) > 0),
-            ("Milestones Shared", len(st.session_state.milestone_shares) > 0)
+            ("parent_name", bool(st.session_state.user_profile.get("parent_name"))),
+            ("family", bool(st.session_state.user_profile.get("children_info"))),
+            ("contacts", len(st.session_state.emergency_contacts) > 0),
+            ("plans", len(st.session_state.crisis_plans) > 0),
+            ("milestones", len(st.session_state.milestone_shares) > 0)
         ]
         
         completed_items = sum(1 for _, completed in profile_items if completed)
         completion_percentage = (completed_items / len(profile_items)) * 100
         
         st.progress(completion_percentage / 100)
-        st.write(f"**Profile Completion: {completion_percentage:.0f}%**")
+        st.write(t("analytics.completion", percent=completion_percentage))
         
         for item_name, completed in profile_items:
             status = "✅" if completed else "❌"
-            st.write(f"{status} {item_name}")
+            st.write(f"{status} {t.label('analytics.completion_items', item_name)}")
         
         # Recommendations
-        st.markdown("#### 💡 Recommendations")
+        st.markdown(t("analytics.recommendations_title"))
         
         recommendations = []
         
         if len(st.session_state.emergency_contacts) == 0:
-            recommendations.append("Add at least one emergency contact for safety")
+            recommendations.append("contact")
         
         if len(st.session_state.crisis_plans) == 0:
-            recommendations.append("Create a crisis response plan to be prepared")
+            recommendations.append("plan")
         
         if not st.session_state.user_profile.get("parent_name"):
-            recommendations.append("Complete your profile information")
+            recommendations.append("profile")
         
         if len(st.session_state.milestone_shares) == 0:
-            recommendations.append("Share your first milestone with the community")
+            recommendations.append("milestone")
         
-        mental_health_checks = st.session_state.get("mental_health_checks", [])
+        mental_health_checks = st.session_state.mental_health_checks
         if len(mental_health_checks) == 0:
-            recommendations.append("Complete a mental health check-in to track your wellbeing")
+            recommendations.append("checkin")
         
         if recommendations:
             for rec in recommendations:
-                st.write(f"💡 {rec}")
+                st.write(f"💡 {t.label('analytics.recommendations', rec)}")
         else:
-            st.success("🎉 Great job! You're making full use of the support hub!")
+            st.success(t("analytics.all_done"))
+
+    with tab4:
+        st.markdown(t("analytics.report_title"))
+        st.write(t("analytics.report_intro"))
+        
+        today = date.today()
+        report_range = st.date_input(t("analytics.report_period"), value=(today - timedelta(days=365), today),
+                                     max_value=today, key="report_range")
+        if st.button(t("analytics.report_create"), type="primary"):
+            if len(report_range) == 2:
+                st.session_state.report_key = get_report_builder().request(report_snapshot(*report_range))
+            else:
+                st.warning(t("analytics.report_dates"))
+        
+        report_key = st.session_state.get("report_key")
+        if report_key:
+            builder = get_report_builder()
+            status = builder.status(report_key)
+            if status == BUILDING:
+                report_progress(report_key)
+            elif status == READY:
+                st.success(t("analytics.report_ready"))
+                st.download_button(t("analytics.report_download"), builder.read(report_key),
+                                   file_name=f"progress-report-{today.isoformat()}.pdf", mime="application/pdf")
+            elif status == FAILED:
+                st.error(t("analytics.report_failed"))
+
+    with tab5:
+        st.markdown(t("analytics.insights_title"))
+        
+        # Read from the hourly rollup only; nothing here touches other families' records
+        summaries = get_community_rollup().summaries()
+        if summaries is None:
+            st.info(t("analytics.insights_preparing"))
+        else:
+            st.caption(t("analytics.insights_caption", families=summaries["families"], k=summaries["k"],
+                         updated=datetime.fromtimestamp(summaries["generated"]).strftime("%b %d, %H:%M")))
+            
+            st.markdown(t("analytics.mix_title"))
+            mix = summaries["tables"]["milestone_mix"]
+            regions = [ALL] + [region for region in CENSUS_REGIONS if region in set(mix.get("region", []))]
+            my_region = region_of(st.session_state.user_profile)
+            col1, col2 = st.columns(2)
+            with col1:
+                region = st.selectbox(t("analytics.region"), regions,
+                                      index=regions.index(my_region) if my_region in regions else 0,
+                                      format_func=lambda value: t.label("analytics.regions", value))
+            with col2:
+                ages = [ALL] + sorted(band for band in set(mix.get("age_band", [])) if band != ALL)
+                age = st.selectbox(t("analytics.child_age"), ages,
+                                   format_func=lambda value: t.label("analytics.ages", value))
+            shown = mix[(mix["region"] == region) & (mix["age_band"] == age)] if not mix.empty else mix
+            if shown.empty:
+                st.info(t("analytics.group_too_small"))
+            else:
+                chart = shown.set_index("type")[["share"]].rename(columns={"share": t("analytics.community")})
+                mine = pd.Series([milestone["type"] for milestone in st.session_state.milestone_shares])
+                if not mine.empty:
+                    chart[t("analytics.your_family")] = mine.value_counts(normalize=True).reindex(chart.index).fillna(0)
+                chart.index = [t.label("milestones.types", milestone_type) for milestone_type in chart.index]
+                st.bar_chart(chart)
+            
+            st.markdown(t("analytics.engagement_title"))
+            engagement = summaries["tables"]["engagement"]
+            if engagement.empty:
+                st.info(t("analytics.engagement_empty"))
+            else:
+                st.line_chart(engagement.set_index("month")[["share_celebrated"]].rename(
+                    columns={"share_celebrated": t("analytics.share_celebrated")}))
+                latest = engagement.iloc[-1]
+                st.write(t("analytics.engagement_month", month=latest["month"], milestones=int(latest["milestones"]),
+                           celebrations=int(latest["celebrations"])))
+            
+            st.markdown(t("analytics.community_wellbeing_title"))
+            wellbeing = summaries["tables"]["wellbeing"]
+            if wellbeing.empty:
+                st.info(t("analytics.community_wellbeing_empty"))
+            else:
+                st.caption(t("analytics.community_wellbeing_caption"))
+                st.line_chart(wellbeing.set_index("month")[["stress_level", "mood", "sleep_quality", "support_feeling"]]
+                              .rename(columns=t.section("analytics.series")))
+
+                st.write(t("analytics.not_alone"))
+
+
+# --- Peer Chat Page ---
+elif selected_page == "💬 Peer Chat":
+    st.markdown(f'<h2 class="section-header">{t("page.chat")}</h2>', unsafe_allow_html=True)
+    st.write(t("chat.intro"))
+    
+    chat_room_choice = st.selectbox(t("chat.room"), list(ROOMS), key="chat_room",
+                                    format_func=lambda room: f"{ROOMS[room]} {t.label('chat.rooms', room)}")
+    chat_room(chat_room_choice)
 
 # Footer
 st.markdown("---")
-st.markdown("""
+st.markdown(f"""
 <div style='text-align: center; color: #666; padding: 2rem;'>
-    <p>🌟 <strong>Special Needs Parenting Support Hub</strong> 🌟</p>
-    <p>You're not alone in this journey. We're here to support you every step of the way.</p>
-    <p><em>Remember: You are your child's best advocate, and you're doing an amazing job!</em></p>
+    <p>🌟 <strong>{t("app.title")}</strong> 🌟</p>
+    <p>{t("app.footer_support")}</p>
+    <p><em>{t("app.footer_advocate")}</em></p>
 </div>
 """, unsafe_allow_html=True)
 
+get_metrics().rerun_seconds.observe(time.perf_counter() - rerun_started, page_label)
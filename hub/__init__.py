@@ -0,0 +1,6 @@
+"""Background services used by the Special Needs Parenting Support Hub app."""
+
+import os
+
+# Where services keep durable files; override with HUB_DATA_DIR in deployments
+DATA_DIR = os.environ.get("HUB_DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
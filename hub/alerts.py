@@ -0,0 +1,266 @@
+"""Crisis-plan activation: concurrent alert fan-out to a family's contacts.
+
+An activation sends the same alert to every recipient at once on a bounded
+asyncio worker pool, so reaching five contacts takes as long as the slowest
+one. A hard overall deadline caps the whole fan-out, and a failed delivery
+escalates to the next unused emergency contact.
+
+No SMS or email gateway is wired in yet. default_sender only queues alerts
+in OUTBOX and reports them as QUEUED, never DELIVERED. The page therefore
+tells the family to call their contacts themselves. A real gateway sender
+returns nothing (or DELIVERED) once the provider accepts the message.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+PENDING = "pending"
+SENDING = "sending"
+DELIVERED = "delivered"
+FAILED = "failed"
+TIMED_OUT = "timed out"
+QUEUED = "queued"
+
+STATUS_ICONS = {
+    PENDING: "⏳",
+    SENDING: "📤",
+    QUEUED: "📥",
+    DELIVERED: "✅",
+    FAILED: "❌",
+    TIMED_OUT: "⌛",
+}
+
+# Alerts handed to the delivery channel, newest last
+OUTBOX = deque(maxlen=1000)
+
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{5,}\d")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+# Entries are separated by lines, semicolons, commas and "then"
+_ENTRY_SPLIT_RE = re.compile(r"[\n;,]+|\bthen\b", re.IGNORECASE)
+_TOKEN_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)?")
+
+
+class DeliveryError(Exception):
+    """Raised by a sender when an alert could not be delivered."""
+
+
+async def default_sender(recipient, message):
+    """Queue an alert in the outbox; swap in an SMS/email gateway here.
+
+    Returns QUEUED: nothing has reached the recipient.
+    """
+    if not recipient.get("phone") and not recipient.get("email"):
+        raise DeliveryError("no phone or email on file")
+    OUTBOX.append({
+        "to": recipient.get("phone") or recipient.get("email"),
+        "name": recipient["name"],
+        "message": message,
+        "sent_at": datetime.now(),
+    })
+    return QUEUED
+
+
+def _recipient(name, phone="", email="", relationship="", source="plan"):
+    return {
+        "name": name,
+        "phone": phone,
+        "email": email,
+        "relationship": relationship,
+        "source": source,
+        "status": PENDING,
+        "detail": "",
+        "escalated_from": None,
+    }
+
+
+def _from_contact(contact, source):
+    return _recipient(contact["name"], contact.get("phone", ""), contact.get("email", ""),
+                      contact.get("relationship", ""), source)
+
+
+def _tokens(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _named_contact(entry, emergency_contacts):
+    """The saved contact whose whole name appears as words in `entry`, longest name first."""
+    words = _tokens(entry)
+    best, best_length = None, 0
+    for contact in emergency_contacts:
+        name = _tokens(contact["name"])
+        if len(name) > best_length and any(words[i:i + len(name)] == name
+                                           for i in range(len(words) - len(name) + 1)):
+            best, best_length = contact, len(name)
+    return best
+
+
+def _entries(text, emergency_contacts):
+    """Split contacts_to_call into one entry per person.
+
+    "Dr. Lee, pediatrician 555-0101" is one person: a piece with a number
+    that names no saved contact joins the piece before it on the same line,
+    when that piece has neither a number nor a saved contact.
+    """
+    entries = []
+    for line in (text or "").splitlines():
+        pieces = []
+        for piece in _ENTRY_SPLIT_RE.split(_BULLET_RE.sub("", line)):
+            piece = piece.strip(" -:")
+            if not piece:
+                continue
+            if (pieces and _PHONE_RE.search(piece) and not _PHONE_RE.search(pieces[-1])
+                    and not _named_contact(piece, emergency_contacts)
+                    and not _named_contact(pieces[-1], emergency_contacts)):
+                pieces[-1] = f"{pieces[-1]}, {piece}"
+            else:
+                pieces.append(piece)
+        entries.extend(pieces)
+    return entries
+
+
+def _key(rec):
+    digits = re.sub(r"\D", "", rec["phone"])
+    return digits[-10:] if digits else rec["name"].lower()
+
+
+def build_recipients(plan, emergency_contacts):
+    """Return (recipients, escalation) for activating a crisis plan.
+
+    Recipients are the plan's `contacts_to_call` in the order written,
+    followed by the primary emergency contacts. An entry naming a saved
+    contact (as whole words: "Dan" is not "Dana") picks up that contact's
+    details, but a number written in the entry always wins over the saved
+    one. The remaining emergency contacts form the escalation queue.
+    """
+    recipients = []
+    seen = set()
+
+    def add(rec, contact=None):
+        keys = {_key(rec)} | ({_key(_from_contact(contact, ""))} if contact else set())
+        if not keys & seen:
+            seen.update(keys)
+            recipients.append(rec)
+
+    for entry in _entries(plan.get("contacts_to_call"), emergency_contacts):
+        match = _named_contact(entry, emergency_contacts)
+        phone = _PHONE_RE.search(entry)
+        if match:
+            rec = _from_contact(match, "plan")
+            if phone:
+                rec["phone"] = phone.group(0).strip()
+            add(rec, match)
+            continue
+        name = _PHONE_RE.sub("", entry).strip(" -:,") or entry
+        add(_recipient(name, phone.group(0).strip() if phone else "", source="plan"))
+
+    for contact in emergency_contacts:
+        if contact.get("primary", False):
+            add(_from_contact(contact, "primary"))
+
+    escalation = []
+    for contact in emergency_contacts:
+        key = _key(_from_contact(contact, "escalation"))
+        if key not in seen:
+            seen.add(key)
+            escalation.append(_from_contact(contact, "escalation"))
+
+    return recipients, escalation
+
+
+class Activation:
+    """One crisis-plan activation running on a background event loop."""
+
+    def __init__(self, plan_name, recipients, escalation, message,
+                 deadline=30.0, max_workers=4, sender=default_sender):
+        self.plan_name = plan_name
+        self.recipients = list(recipients)
+        self.escalation = deque(escalation)
+        self.message = message
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self.sender = sender
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=asyncio.run, args=(self._run(),),
+                                        name=f"activation-{self.plan_name}", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def done(self):
+        return self.finished_at is not None
+
+    def elapsed(self):
+        end = self.finished_at or time.monotonic()
+        return end - (self.started_at or end)
+
+    def snapshot(self):
+        """Return a copy of the per-recipient statuses for display."""
+        with self._lock:
+            return [dict(r) for r in self.recipients]
+
+    def counts(self):
+        counts = {status: 0 for status in STATUS_ICONS}
+        for rec in self.snapshot():
+            counts[rec["status"]] += 1
+        return counts
+
+    def _set(self, rec, status, detail=""):
+        with self._lock:
+            rec["status"] = status
+            rec["detail"] = detail
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def deliver(rec):
+            async with semaphore:
+                self._set(rec, SENDING)
+                try:
+                    status = await self.sender(rec, self.message)
+                except Exception as exc:
+                    self._set(rec, FAILED, str(exc))
+                else:
+                    self._set(rec, status or DELIVERED)
+                    return
+            if self.escalation:
+                with self._lock:
+                    backup = self.escalation.popleft()
+                    backup["escalated_from"] = rec["name"]
+                    self.recipients.append(backup)
+                await deliver(backup)
+
+        tasks = [asyncio.create_task(deliver(rec)) for rec in self.recipients]
+        try:
+            if tasks:
+                _, pending = await asyncio.wait(tasks, timeout=self.deadline)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            with self._lock:
+                for rec in self.recipients:
+                    if rec["status"] in (PENDING, SENDING):
+                        rec["status"] = TIMED_OUT
+                        rec["detail"] = f"no confirmation within {self.deadline:.0f}s"
+            self.finished_at = time.monotonic()
+
+
+def activate_plan(plan, emergency_contacts, sender_name, deadline=30.0, max_workers=4,
+                  sender=default_sender):
+    """Build the recipient list for `plan` and start fanning out alerts."""
+    recipients, escalation = build_recipients(plan, emergency_contacts)
+    message = (f"🚨 {sender_name} has activated the crisis plan '{plan['name']}' "
+               f"({plan['type']}). Please get in touch as soon as possible.")
+    return Activation(plan["name"], recipients, escalation, message,
+                      deadline=deadline, max_workers=max_workers, sender=sender).start()
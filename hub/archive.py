@@ -0,0 +1,166 @@
+"""Hot/cold tiering for a family's milestones and check-ins.
+
+Recent records stay in the family's live state (the hot tier). Older ones
+are moved into gzip-compressed JSONL segments partitioned by month:
+
+    data/archive/<user>/<collection>/<YYYY-MM>.jsonl.gz
+
+plus a small index.json of record counts per month. Segments are only
+ever appended to, as further gzip members, so compaction never rewrites
+what is already archived. A record is written to its segment before an
+ARCHIVED event takes it out of the hot state. If the process dies in
+between, the next run archives it again; write() skips ids its segment
+already holds, so neither the segment nor the index counts it twice.
+
+Milestones still showing in the community feed are kept hot whatever
+their age. A celebration is recorded on the owner's log and replayed onto
+the live milestone, so one that had moved to the archive would lose it.
+
+Reads are lazy. Totals come from the index alone, and a segment is only
+decompressed when a view asks for a date range that reaches its month.
+"""
+
+import gzip
+import json
+import os
+import threading
+from datetime import date, timedelta
+from functools import lru_cache
+
+from hub import DATA_DIR
+from hub.events import ARCHIVED, dumps, item_key, loads
+
+ARCHIVED_COLLECTIONS = ("milestone_shares", "mental_health_checks")
+
+# Records older than this move to the archive...
+HOT_DAYS = 180
+# ...except the most recent few, which every summary screen shows
+KEEP_RECENT = 20
+
+
+def month_of(day):
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+class Archive:
+    """Month-partitioned compressed segments for every family."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(DATA_DIR, "archive")
+        self._lock = threading.Lock()
+
+    def _dir(self, user_id, collection):
+        if not user_id.isalnum() or collection not in ARCHIVED_COLLECTIONS:
+            raise ValueError(f"invalid archive location {user_id!r}/{collection!r}")
+        return os.path.join(self.directory, user_id, collection)
+
+    def index(self, user_id, collection):
+        """Record counts per archived month, e.g. {"2024-03": 12}."""
+        try:
+            with open(os.path.join(self._dir(user_id, collection), "index.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def count(self, user_id, collection):
+        return sum(self.index(user_id, collection).values())
+
+    def months(self, user_id, collection):
+        """Archived months, newest first."""
+        return sorted(self.index(user_id, collection), reverse=True)
+
+    def write(self, user_id, collection, items):
+        """Append records to their month segments and update the index.
+
+        Records whose segment already holds their id are skipped; returns how
+        many were written.
+        """
+        by_month = {}
+        for item in items:
+            by_month.setdefault(month_of(item["date"]), []).append(item)
+        directory = self._dir(user_id, collection)
+        written = 0
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            index = self.index(user_id, collection)
+            for month, records in by_month.items():
+                archived = {item_key(record) for record in self.segment(user_id, collection, month)}
+                records = [record for record in records if item_key(record) not in archived]
+                if not records:
+                    continue
+                path = os.path.join(directory, f"{month}.jsonl.gz")
+                payload = "".join(dumps(record) + "\n" for record in records).encode("utf-8")
+                with open(path, "ab") as f:
+                    f.write(gzip.compress(payload))
+                    f.flush()
+                    os.fsync(f.fileno())
+                index[month] = index.get(month, 0) + len(records)
+                written += len(records)
+            tmp = os.path.join(directory, f"index.json.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f, sort_keys=True)
+            os.replace(tmp, os.path.join(directory, "index.json"))
+        return written
+
+    def segment(self, user_id, collection, month):
+        """All records archived for one month, oldest first."""
+        path = os.path.join(self._dir(user_id, collection), f"{month}.jsonl.gz")
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return []
+        return list(_read_segment(path, stat.st_mtime_ns, stat.st_size))
+
+    def history(self, user_id, collection, since=None):
+        """Archived records dated on or after `since` (all when None), newest first.
+
+        Only the segments for months that overlap the range are read.
+        """
+        records, seen = [], set()
+        floor = month_of(since) if since else ""
+        for month in self.months(user_id, collection):
+            if month < floor:
+                break
+            for record in reversed(self.segment(user_id, collection, month)):
+                key = item_key(record)
+                if key in seen or (since and record["date"] < since):
+                    continue
+                seen.add(key)
+                records.append(record)
+        records.sort(key=lambda record: record["date"], reverse=True)
+        return records
+
+    def compact(self, store, user_id, today=None, hot_days=HOT_DAYS, keep_recent=KEEP_RECENT, keep=()):
+        """Move a family's cold records out of their live state; returns how many moved.
+
+        Records whose id is in `keep`, e.g. milestones still in the community
+        feed, stay hot.
+        """
+        cutoff = (today or date.today()) - timedelta(days=hot_days)
+        keep = set(keep)
+        state = store.load(user_id)
+        moved = 0
+        for collection in ARCHIVED_COLLECTIONS:
+            items = state[collection]
+            if len(items) <= keep_recent:
+                continue
+            newest_first = sorted(items, key=lambda item: item["date"], reverse=True)
+            cold = [item for item in newest_first[keep_recent:]
+                    if item["date"] < cutoff and item_key(item) not in keep]
+
+            if not cold:
+                continue
+            self.write(user_id, collection, cold)
+            store.record(user_id, ARCHIVED, {"collection": collection,
+                                             "ids": [item_key(item) for item in cold]})
+            moved += len(cold)
+        if moved:
+            store.snapshot(user_id)
+        return moved
+
+
+@lru_cache(maxsize=64)
+def _read_segment(path, mtime_ns, size):
+    # Keyed on mtime and size so an appended segment is never served stale
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return tuple(loads(line) for line in f if line.strip())
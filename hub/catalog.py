@@ -0,0 +1,176 @@
+"""Resource catalog shown on the Resources & Forms page."""
+
+RESOURCES = [
+    {
+        "title": "Understanding IEP vs 504 Plans",
+        "description": "Comprehensive guide to special education services and accommodations",
+        "type": "Guide",
+        "category": "Educational",
+        "topics": ["IEP", "504 Plan", "Special Education", "Accommodations"],
+        "length": "15 min read",
+        "rating": 4.8,
+        "url": "#"
+    },
+    {
+        "title": "Autism Sensory Strategies",
+        "description": "Practical strategies for managing sensory challenges in daily life",
+        "type": "Article",
+        "category": "Autism",
+        "topics": ["Sensory Processing", "Autism", "Daily Living", "Strategies"],
+        "length": "10 min read",
+        "rating": 4.9,
+        "url": "#"
+    },
+    {
+        "title": "ADHD Medication Guide",
+        "description": "Understanding medication options and side effects for ADHD",
+        "type": "Guide",
+        "category": "ADHD",
+        "topics": ["ADHD", "Medication", "Treatment", "Side Effects"],
+        "length": "20 min read",
+        "rating": 4.7,
+        "url": "#"
+    },
+    {
+        "title": "Behavioral Intervention Strategies",
+        "description": "Evidence-based approaches to managing challenging behaviors",
+        "type": "Video",
+        "category": "Behavioral",
+        "topics": ["Behavior", "Intervention", "ABA", "Strategies"],
+        "length": "45 min watch",
+        "rating": 4.6,
+        "url": "#"
+    },
+    {
+        "title": "Know Your Rights Under IDEA",
+        "description": "What the law guarantees your child, from evaluations to due process",
+        "type": "Guide",
+        "category": "Legal",
+        "topics": ["IDEA", "Parent Rights", "Due Process", "Special Education"],
+        "length": "25 min read",
+        "rating": 4.8,
+        "url": "#"
+    },
+    {
+        "title": "Reading Support for Dyslexia at Home",
+        "description": "Simple daily routines that build reading confidence",
+        "type": "Article",
+        "category": "Learning Disabilities",
+        "topics": ["Dyslexia", "Reading", "Homework", "Strategies"],
+        "length": "12 min read",
+        "rating": 4.6,
+        "url": "#"
+    },
+    {
+        "title": "Preparing for Medical Appointments",
+        "description": "A checklist for getting the most out of doctor and specialist visits",
+        "type": "Checklist",
+        "category": "Medical",
+        "topics": ["Doctor Visits", "Medication", "Care Team", "Seizures"],
+        "length": "5 min read",
+        "rating": 4.7,
+        "url": "#"
+    },
+    {
+        "title": "Building Social Skills Through Play",
+        "description": "Play-based activities that help children practice turn-taking and conversation",
+        "type": "Webinar",
+        "category": "Autism",
+        "topics": ["Social Skills", "Communication", "Play", "Autism"],
+        "length": "60 min watch",
+        "rating": 4.7,
+        "url": "#"
+    },
+    {
+        "title": "Caregiver Burnout: Recognizing the Signs",
+        "description": "How to spot burnout early and build self-care into a demanding routine",
+        "type": "Podcast",
+        "category": "Behavioral",
+        "topics": ["Self-Care", "Caregiver Wellbeing", "Stress", "Support Network"],
+        "length": "35 min listen",
+        "rating": 4.9,
+        "url": "#"
+    },
+    {
+        "title": "Special Education for Bilingual Families",
+        "description": "Navigating evaluations, interpreters and IEP meetings in your home language",
+        "type": "Article",
+        "category": "Educational",
+        "topics": ["Bilingual", "IEP", "Interpreters", "Communication"],
+        "length": "15 min read",
+        "rating": 4.5,
+        "url": "#"
+    },
+    {
+        "title": "Finding Your Parent Support Network",
+        "description": "Where to find support groups, respite care and other parents who get it",
+        "type": "Guide",
+        "category": "Behavioral",
+        "topics": ["Support Network", "Support Groups", "Respite Care", "Caregiver Wellbeing"],
+        "length": "10 min read",
+        "rating": 4.6,
+        "url": "#"
+    },
+    {
+        "title": "Speech and Language Milestones",
+        "description": "What to expect at each age and how to support communication at home",
+        "type": "Video",
+        "category": "Educational",
+        "topics": ["Communication", "Speech Therapy", "Milestones", "Daily Living"],
+        "length": "30 min watch",
+        "rating": 4.8,
+        "url": "#"
+    }
+]
+
+TEMPLATE_CATEGORIES = {
+    "IEP & 504 Planning": [
+        "IEP Meeting Preparation Checklist",
+        "IEP Goal Tracking Sheet", 
+        "504 Plan Request Template",
+        "Parent Input Form for IEP",
+        "Transition Assessment Form"
+    ],
+    "Medical & Therapy": [
+        "Medical History Summary",
+        "Therapy Progress Tracker", 
+        "Medication Log Template",
+        "Doctor Visit Preparation Form",
+        "Insurance Appeal Letter Template"
+    ],
+    "Daily Living": [
+        "Behavior Support Plan Template",
+        "Daily Schedule Visual",
+        "Chore Chart Template",
+        "Social Stories Template",
+        "Communication Board Template"
+    ],
+    "Legal & Advocacy": [
+        "Special Education Complaint Form",
+        "Due Process Request Template",
+        "Accommodation Request Letter",
+        "Meeting Documentation Form",
+        "Rights Violation Report"
+    ]
+}
+
+EXTERNAL_LINKS = {
+    "Government Resources": [
+        {"name": "IDEA - Individuals with Disabilities Education Act", "url": "https://sites.ed.gov/idea/"},
+        {"name": "Office for Civil Rights", "url": "https://www2.ed.gov/about/offices/list/ocr/"},
+        {"name": "Social Security Disability Benefits", "url": "https://www.ssa.gov/disability/"},
+        {"name": "Centers for Disease Control - Developmental Disabilities", "url": "https://www.cdc.gov/ncbddd/developmentaldisabilities/"}
+    ],
+    "National Organizations": [
+        {"name": "Autism Society", "url": "https://autismsociety.org/"},
+        {"name": "National Down Syndrome Society", "url": "https://www.ndss.org/"},
+        {"name": "CHADD - ADHD Support", "url": "https://chadd.org/"},
+        {"name": "National Association for Mental Illness (NAMI)", "url": "https://nami.org/"}
+    ],
+    "Educational Support": [
+        {"name": "Understood.org", "url": "https://www.understood.org/"},
+        {"name": "Wrightslaw - Special Education Law", "url": "https://www.wrightslaw.com/"},
+        {"name": "Council of Parent Attorneys and Advocates", "url": "https://www.copaa.org/"},
+        {"name": "National Center for Learning Disabilities", "url": "https://www.ncld.org/"}
+    ]
+}
@@ -0,0 +1,138 @@
+"""In-process message broker for the peer-support chat rooms.
+
+Each room keeps only its last HISTORY messages in a ring buffer, so memory
+per room is bounded however long a conversation runs. Messages carry a
+per-room sequence number that doubles as the subscriber's cursor. Because
+the retained sequence numbers are contiguous, a fetch works out where to
+start in the buffer by arithmetic instead of scanning it. A session whose
+cursor has fallen out of the buffer gets the oldest retained messages and
+a flag telling it that some were missed.
+
+Idle members cost the broker nothing: there is no per-member queue, only
+a last-seen time used for the "here now" count, and the cursor lives in
+the member's own session.
+"""
+
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+ROOMS = {
+    "autism": "🧩",
+    "adhd": "⚡",
+    "iep": "📋",
+    "burnout": "🫶",
+}
+
+HISTORY = 200
+MAX_MESSAGE_CHARS = 1000
+# Members seen within this many seconds count as "here now"
+PRESENT_FOR = 120
+
+
+class _Room:
+    __slots__ = ("seq", "messages", "seen", "lock")
+
+    def __init__(self, history):
+        self.seq = 0
+        self.messages = deque(maxlen=history)
+        self.seen = {}
+        self.lock = threading.Lock()
+
+
+class ChatBroker:
+    """Fixed set of topic rooms with bounded history and cursor-based reads."""
+
+    def __init__(self, rooms=ROOMS, history=HISTORY):
+        self._rooms = {room: _Room(history) for room in rooms}
+
+    def _room(self, room):
+        try:
+            return self._rooms[room]
+        except KeyError:
+            raise ValueError(f"unknown chat room {room!r}") from None
+
+    def latest(self, room):
+        """Sequence number of the room's newest message; O(1), safe on every tick."""
+        return self._room(room).seq
+
+    def post(self, room, author, text, name="Anonymous"):
+        """Append a message to a room and return it.
+
+        `author` identifies the posting session; `name` is what others see.
+        """
+        text = text.strip()[:MAX_MESSAGE_CHARS]
+        if not text:
+            raise ValueError("empty chat message")
+        target = self._room(room)
+        with target.lock:
+            target.seq += 1
+            message = {"seq": target.seq, "author": author, "name": name, "text": text,
+                       "t": time.time()}
+            target.messages.append(message)
+        return message
+
+    def fetch(self, room, after=0, limit=None):
+        """Return (messages, missed) for the messages with seq greater than `after`.
+
+        `missed` is True when some of those messages have already rotated
+        out of the room's buffer.
+        """
+        target = self._room(room)
+        with target.lock:
+            if after >= target.seq or not target.messages:
+                return [], False
+            first = target.messages[0]["seq"]
+            start = max(after + 1 - first, 0)
+            stop = None if limit is None else start + limit
+            return list(islice(target.messages, start, stop)), after + 1 < first
+
+    def touch(self, room, member):
+        """Mark a member as present in a room."""
+        target = self._room(room)
+        now = time.time()
+        target.seen[member] = now
+        if len(target.seen) > 1000:
+            self._prune(target, now)
+
+    def present(self, room):
+        """How many members have looked at the room recently."""
+        target = self._room(room)
+        now = time.time()
+        self._prune(target, now)
+        return len(target.seen)
+
+    @staticmethod
+    def _prune(target, now):
+        for member, seen in list(target.seen.items()):
+            if now - seen > PRESENT_FOR:
+                target.seen.pop(member, None)
+
+
+class ChatView:
+    """A session's window onto one room, advanced from its cursor."""
+
+    def __init__(self, broker, room, keep=50):
+        self.broker = broker
+        self.room = room
+        self.cursor = 0
+        self.messages = deque(maxlen=keep)
+        self.missed = False
+
+    def sync(self):
+        """Pull messages after the cursor; returns how many arrived."""
+        latest = self.broker.latest(self.room)
+        if latest == self.cursor:
+            return 0
+        if not self.cursor:
+            # A newcomer starts from the tail rather than the whole buffer
+            self.cursor = max(latest - self.messages.maxlen, 0)
+            messages, _ = self.broker.fetch(self.room, self.cursor)
+        else:
+            messages, missed = self.broker.fetch(self.room, self.cursor)
+            self.missed = self.missed or missed
+        self.messages.extend(messages)
+        if messages:
+            self.cursor = messages[-1]["seq"]
+        return len(messages)
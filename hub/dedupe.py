@@ -0,0 +1,172 @@
+"""Duplicate and near-duplicate detection for community milestone posts.
+
+Two layers:
+
+Submission keys. A submission's key is a hash of the family and the
+normalized content. It is claimed before anything is written. A
+double-click, a retried request or a second tab sends the same key within
+the window and is dropped. A key cannot live in the form's own session
+state, because Streamlit replays queued clicks after the first click has
+already rerun the script.
+
+MinHash/LSH. Each public milestone's character shingles are summarized by
+NUM_PERM min-hashes, split into BANDS bands of ROWS. Two posts that agree
+on a whole band land in the same bucket, so a submit only compares itself
+against the handful of posts it collides with. The cost does not grow with
+the size of the feed. The index holds the last CAPACITY posts, and older
+ones are evicted in insertion order so memory stays flat.
+
+A family's own near-identical post only counts as a repost within
+REPOST_WINDOW of the earlier one. Sharing "slept through the night" again
+next week is news, not a duplicate.
+"""
+
+import hashlib
+import random
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 4
+CAPACITY = 10000
+# Estimated Jaccard similarity at which a post counts as a repost
+THRESHOLD = 0.8
+# Seconds during which a family's own earlier post blocks a near-identical one
+REPOST_WINDOW = 6 * 3600
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def normalize(text):
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", "", (text or "").lower())).strip()
+
+
+def submission_key(owner, *fields):
+    """Stable key for one logical submission by `owner`."""
+    payload = "\x1f".join([owner] + [normalize(str(field)) for field in fields])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SubmissionKeys:
+    """Claim-once keys that expire after `ttl` seconds."""
+
+    def __init__(self, ttl=600, capacity=CAPACITY):
+        self.ttl = ttl
+        self.capacity = capacity
+        self._claimed = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, key):
+        """True the first time a key is seen within the window, False for repeats."""
+        now = time.time()
+        with self._lock:
+            while self._claimed and (len(self._claimed) > self.capacity
+                                     or now - next(iter(self._claimed.values())) > self.ttl):
+                self._claimed.popitem(last=False)
+            if key in self._claimed:
+                return False
+            self._claimed[key] = now
+            return True
+
+    def release(self, key):
+        """Give a key back, e.g. when the submission was rejected and may be retried."""
+        with self._lock:
+            self._claimed.pop(key, None)
+
+
+def shingles(text, size=SHINGLE):
+    text = normalize(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class NearDuplicateIndex:
+    """Bounded MinHash/LSH index of recent posts."""
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, capacity=CAPACITY, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.capacity = capacity
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._buckets = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def signature(self, text):
+        values = [struct.unpack("<I", hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest())[0]
+                  for shingle in shingles(text)]
+        if not values:
+            return None
+        return tuple(min(((a * value + b) % _PRIME) & _MAX_HASH for value in values)
+                     for a, b in self._perms)
+
+    def _bands(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def add(self, item_id, text, owner=None, at=None):
+        """Index a post; `at` is when it was shared, as a timestamp (now when None)."""
+        signature = self.signature(text)
+        if signature is None:
+            return
+        with self._lock:
+            self._discard(item_id)
+            self._entries[item_id] = (signature, owner, time.time() if at is None else at)
+            for band in self._bands(signature):
+                self._buckets.setdefault(band, set()).add(item_id)
+            while len(self._entries) > self.capacity:
+                self._discard(next(iter(self._entries)))
+
+    def remove(self, item_id):
+        with self._lock:
+            self._discard(item_id)
+
+    def _discard(self, item_id):
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+        for band in self._bands(entry[0]):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self._buckets[band]
+
+    def similar(self, text, threshold=THRESHOLD):
+        """Recent posts resembling `text` as (similarity, item_id, owner), most similar first."""
+        return [(agreement, item_id, owner) for agreement, item_id, owner, _ in self._matches(text, threshold)]
+
+    def reposted(self, text, owner, within=REPOST_WINDOW, threshold=THRESHOLD):
+        """True when `owner` shared a post resembling `text` in the last `within` seconds."""
+        cutoff = time.time() - within
+        return any(by == owner and at >= cutoff for _, _, by, at in self._matches(text, threshold))
+
+    def _matches(self, text, threshold):
+        signature = self.signature(text)
+        if signature is None:
+            return []
+        with self._lock:
+            candidates = set()
+            for band in self._bands(signature):
+                candidates.update(self._buckets.get(band, ()))
+            matches = []
+            for item_id in candidates:
+                other, owner, at = self._entries[item_id]
+                agreement = sum(1 for mine, theirs in zip(signature, other) if mine == theirs) / self.num_perm
+                if agreement >= threshold:
+                    matches.append((agreement, item_id, owner, at))
+        matches.sort(key=lambda match: match[:2], reverse=True)
+        return matches
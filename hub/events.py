@@ -0,0 +1,354 @@
+"""Append-only activity log that a family's saved state is rebuilt from.
+
+Every change a family makes is recorded as one event line in their own
+JSONL log (data/events/<user>.jsonl) before it touches their state. The
+state is never saved on its own. Every SNAPSHOT_EVERY events a snapshot
+stores the whole state together with the log offset it covers. A restart
+loads the snapshot and replays only the lines after that offset.
+
+Each event carries its own inverse, worked out from the state it was
+applied to. Undo appends that inverse as a new event, so the log stays
+append-only and snapshots never need rewriting.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+
+from hub import DATA_DIR
+
+PROFILE_UPDATED = "profile_updated"
+MILESTONE_SHARED = "milestone_shared"
+MILESTONE_REMOVED = "milestone_removed"
+MILESTONE_CELEBRATED = "milestone_celebrated"
+MILESTONE_MODERATED = "milestone_moderated"
+CONTACT_ADDED = "contact_added"
+CONTACT_DELETED = "contact_deleted"
+PLAN_SAVED = "plan_saved"
+PLAN_ACTIVATED = "plan_activated"
+PLAN_DELETED = "plan_deleted"
+CHECKIN_RECORDED = "checkin_recorded"
+RESOURCE_SAVED = "resource_saved"
+RESOURCE_REMOVED = "resource_removed"
+ARCHIVED = "archived"
+UNDONE = "undone"
+
+# Events that add to or remove from one of the family's lists
+COLLECTIONS = {
+    MILESTONE_SHARED: ("milestone_shares", True),
+    MILESTONE_REMOVED: ("milestone_shares", False),
+    CONTACT_ADDED: ("emergency_contacts", True),
+    CONTACT_DELETED: ("emergency_contacts", False),
+    PLAN_SAVED: ("crisis_plans", True),
+    PLAN_DELETED: ("crisis_plans", False),
+    RESOURCE_SAVED: ("saved_resources", True),
+    RESOURCE_REMOVED: ("saved_resources", False),
+    CHECKIN_RECORDED: ("mental_health_checks", True),
+}
+
+INVERSES = {
+    MILESTONE_SHARED: MILESTONE_REMOVED,
+    MILESTONE_REMOVED: MILESTONE_SHARED,
+    CONTACT_ADDED: CONTACT_DELETED,
+    CONTACT_DELETED: CONTACT_ADDED,
+    PLAN_SAVED: PLAN_DELETED,
+    PLAN_DELETED: PLAN_SAVED,
+    RESOURCE_SAVED: RESOURCE_REMOVED,
+    RESOURCE_REMOVED: RESOURCE_SAVED,
+}
+
+DESCRIPTIONS = {
+    PROFILE_UPDATED: "Updated profile",
+    MILESTONE_SHARED: "Shared a milestone",
+    MILESTONE_REMOVED: "Removed a milestone",
+    MILESTONE_CELEBRATED: "Someone celebrated your milestone",
+    MILESTONE_MODERATED: "A moderator reviewed a milestone",
+    CONTACT_ADDED: "Added an emergency contact",
+    CONTACT_DELETED: "Deleted an emergency contact",
+    PLAN_SAVED: "Saved a crisis plan",
+    PLAN_ACTIVATED: "Activated a crisis plan",
+    PLAN_DELETED: "Deleted a crisis plan",
+    CHECKIN_RECORDED: "Completed a wellbeing check-in",
+    RESOURCE_SAVED: "Saved a resource",
+    RESOURCE_REMOVED: "Removed a saved resource",
+    ARCHIVED: "Moved older history to the archive",
+    UNDONE: "Undid a change",
+}
+
+SNAPSHOT_EVERY = 50
+UNDO_DEPTH = 20
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not serializable")
+
+
+def _decode(obj):
+    if len(obj) == 1:
+        if "$date" in obj:
+            return date.fromisoformat(obj["$date"])
+        if "$dt" in obj:
+            return datetime.fromisoformat(obj["$dt"])
+    return obj
+
+
+def dumps(value):
+    return json.dumps(value, default=_encode, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(text):
+    return json.loads(text, object_hook=_decode)
+
+
+def empty_state():
+    state = {"user_profile": {}, "seq": 0, "undo": []}
+    for collection, _ in COLLECTIONS.values():
+        state[collection] = []
+    return state
+
+
+def item_key(item):
+    """Identity of a list item: its id, the title for catalog resources, else its content."""
+    return item.get("id") or item.get("title") or dumps(item)
+
+
+def _find(items, key):
+    for index, item in enumerate(items):
+        if item_key(item) == key:
+            return index
+    return None
+
+
+def inverse(state, kind, data):
+    """The event that reverses `kind` applied to `state`, or None if it can't be undone."""
+    if kind == PROFILE_UPDATED:
+        profile = state["user_profile"]
+        return PROFILE_UPDATED, {
+            "changes": {key: profile[key] for key in data["changes"] if key in profile},
+            "removed": [key for key in data["changes"] if key not in profile],
+        }
+    if kind not in INVERSES:
+        return None
+    collection, adds = COLLECTIONS[kind]
+    if adds:
+        return INVERSES[kind], {"id": item_key(data["item"])}
+    index = _find(state[collection], data["id"])
+    if index is None:
+        return None
+    return INVERSES[kind], {"item": copy.deepcopy(state[collection][index]), "index": index}
+
+
+def apply(state, event):
+    """Apply one event to a state dict in place."""
+    kind, data = event["k"], event["d"]
+    state["seq"] = event["s"]
+    if kind == UNDONE:
+        state["undo"] = [entry for entry in state["undo"] if entry["s"] != data["s"]]
+        kind, data = data["k"], data["d"]
+    elif event.get("u"):
+        state["undo"].append({"s": event["s"], "k": kind, "u": event["u"]})
+        del state["undo"][:-UNDO_DEPTH]
+
+    if kind == PROFILE_UPDATED:
+        state["user_profile"].update(data["changes"])
+        for key in data.get("removed", []):
+            state["user_profile"].pop(key, None)
+    elif kind in COLLECTIONS:
+        collection, adds = COLLECTIONS[kind]
+        items = state[collection]
+        if adds:
+            index = data.get("index")
+            items.insert(len(items) if index is None else index, data["item"])
+        else:
+            index = _find(items, data["id"])
+            if index is not None:
+                items.pop(index)
+    elif kind == ARCHIVED:
+        ids = set(data["ids"])
+        state[data["collection"]][:] = [item for item in state[data["collection"]]
+                                        if item_key(item) not in ids]
+    elif kind == PLAN_ACTIVATED:
+        index = _find(state["crisis_plans"], data["id"])
+        if index is not None:
+            state["crisis_plans"][index]["last_used"] = data["date"]
+    elif kind == MILESTONE_CELEBRATED:
+        # Recorded on the owner's log, so the count is replayed with their milestone
+        index = _find(state["milestone_shares"], data["id"])
+        if index is not None:
+            milestone = state["milestone_shares"][index]
+            milestone["celebrations"] = milestone.get("celebrations", 0) + 1
+    elif kind == MILESTONE_MODERATED:
+        index = _find(state["milestone_shares"], data["id"])
+        if index is not None:
+            state["milestone_shares"][index]["moderation"] = data["moderation"]
+
+
+class EventStore:
+    """Per-family event logs with snapshots, and the live state built from them."""
+
+    def __init__(self, directory=None, snapshot_every=SNAPSHOT_EVERY):
+        self.directory = directory or os.path.join(DATA_DIR, "events")
+        self.snapshot_every = snapshot_every
+        self._states = {}
+        self._lock = threading.RLock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, user_id, suffix):
+        if not user_id.isalnum():
+            raise ValueError(f"invalid user id {user_id!r}")
+        return os.path.join(self.directory, f"{user_id}{suffix}")
+
+    def load(self, user_id):
+        """The family's live state, rebuilt from snapshot + tail on first use."""
+        with self._lock:
+            state = self._states.get(user_id)
+            if state is None:
+                state = self._states[user_id] = self._rebuild(user_id)
+            return state
+
+    def _rebuild(self, user_id, repair=True):
+        """Snapshot plus log tail; `repair` truncates a torn last line and needs the lock."""
+        state, offset, snapshot_seq = empty_state(), 0, 0
+        try:
+            with open(self._path(user_id, ".snapshot.json"), encoding="utf-8") as f:
+                snapshot = loads(f.read())
+            state, offset, snapshot_seq = snapshot["state"], snapshot["offset"], snapshot["seq"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        log = self._path(user_id, ".jsonl")
+        state["_offset"] = offset
+        state["_since_snapshot"] = 0
+        if not os.path.exists(log):
+            return state
+        with open(log, "rb") as f:
+            f.seek(offset)
+            good = offset
+            for line in f:
+                try:
+                    event = loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                if event["s"] > state["seq"]:
+                    apply(state, event)
+                good += len(line)
+        if repair and good < os.path.getsize(log):
+            # Drop a line torn by a crash mid-write so new events append cleanly
+            with open(log, "r+b") as f:
+                f.truncate(good)
+        state["_offset"] = good
+        state["_since_snapshot"] = state["seq"] - snapshot_seq
+        return state
+
+    def record(self, user_id, kind, data):
+        """Append an event to the family's log and apply it to their live state."""
+        with self._lock:
+            state = self.load(user_id)
+            undo = inverse(state, kind, data)
+            event = {"s": state["seq"] + 1, "t": time.time(), "k": kind, "d": data}
+            if undo:
+                event["u"] = list(undo)
+            self._append(user_id, state, event)
+            return event
+
+    def undo(self, user_id):
+        """Reverse the family's most recent undoable change; returns the undo event."""
+        with self._lock:
+            state = self.load(user_id)
+            if not state["undo"]:
+                return None
+            entry = state["undo"][-1]
+            kind, data = entry["u"]
+            event = {"s": state["seq"] + 1, "t": time.time(), "k": UNDONE,
+                     "d": {"s": entry["s"], "k": kind, "d": data, "of": entry["k"]}}
+            self._append(user_id, state, event)
+            return event
+
+    def _append(self, user_id, state, event):
+        line = (dumps(event) + "\n").encode("utf-8")
+        with open(self._path(user_id, ".jsonl"), "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        # Apply a copy so callers can keep mutating their own dicts
+        apply(state, loads(line))
+        state["_offset"] += len(line)
+        state["_since_snapshot"] += 1
+        if state["_since_snapshot"] >= self.snapshot_every:
+            self.snapshot(user_id)
+
+    def snapshot(self, user_id):
+        """Write the family's current state and the log offset it covers."""
+        with self._lock:
+            state = self.load(user_id)
+            saved = {key: value for key, value in state.items() if not key.startswith("_")}
+            path = self._path(user_id, ".snapshot.json")
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(dumps({"offset": state.get("_offset", 0), "seq": state["seq"], "state": saved}))
+            os.replace(tmp, path)
+            state["_since_snapshot"] = 0
+
+    def history(self, user_id, limit=20):
+        """The family's most recent events, newest first."""
+        events = []
+        try:
+            with open(self._path(user_id, ".jsonl"), "rb") as f:
+                f.seek(max(0, os.path.getsize(f.name) - 64 * 1024))
+                for line in f.read().splitlines():
+                    try:
+                        events.append(loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return events[::-1][:limit]
+
+    def unsnapshotted(self):
+        """Events written since each loaded family's last snapshot, summed."""
+        with self._lock:
+            return sum(state["_since_snapshot"] for state in self._states.values())
+
+    def users(self):
+        """Every family with an event log on disk."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".jsonl") and name[:-len(".jsonl")].isalnum():
+                yield name[:-len(".jsonl")]
+
+    def peek(self, user_id):
+        """A family's state without keeping it loaded, e.g. for a startup scan.
+
+        The replay is read-only. It runs outside the lock, so a line being
+        appended meanwhile is only skipped, never truncated.
+        """
+        with self._lock:
+            state = self._states.get(user_id)
+        return state if state is not None else self._rebuild(user_id, repair=False)
+
+    def forget(self, user_id):
+        """Drop the cached state so the next load() rebuilds from disk."""
+        with self._lock:
+            self._states.pop(user_id, None)
+
+
+def describe(event, labels=DESCRIPTIONS, undid="Undid: {change}"):
+    """Short human-readable line for an event in the activity history.
+
+    `labels` maps event kinds to text and `undid` frames an undone change,
+    so a translated catalog section can be passed in.
+    """
+    kind = event["k"]
+    text = labels.get(kind, kind)
+    if kind == UNDONE:
+        undone = event["d"]["of"]
+        text = undid.format(change=labels.get(undone, undone))
+    return text
@@ -0,0 +1,169 @@
+"""In-process pub/sub hub for the community milestone feed.
+
+Every feed carries a version counter that bumps on each change, plus a
+bounded history of deltas. A session remembers the last version it saw;
+when the version has not moved it does nothing, and when it has it pulls
+only the deltas after its cursor instead of re-reading the whole feed.
+The page polls version() on a timer and redraws the feed only when it
+has moved, so an idle session costs one integer comparison per tick.
+
+A feed holds only its WINDOW most recently shared items, oldest first, so
+memory stays flat however long the server runs. A view applies the same
+deltas in the same order and trims itself to the same window. It therefore
+holds exactly the hub's items and never sorts: latest() just reads the
+window from the newest end.
+"""
+
+import threading
+from collections import OrderedDict, deque
+from itertools import islice
+
+MILESTONE_ADDED = "milestone"
+MILESTONE_RETRACTED = "retracted"
+CELEBRATIONS_CHANGED = "celebrations"
+
+WINDOW = 500
+
+
+def _add(items, item, window):
+    """Put an item at the newest end of an ordered window; returns the ids evicted past `window`."""
+    items.pop(item["id"], None)
+    items[item["id"]] = item
+    return [items.popitem(last=False)[0] for _ in range(len(items) - window)]
+
+
+class _Feed:
+    def __init__(self, history):
+        self.version = 0
+        self.items = OrderedDict()
+        # milestone id -> family that shared it; kept out of the items sessions copy
+        self.owners = {}
+        self.deltas = deque(maxlen=history)
+
+
+class FeedHub:
+    """Shared store of public feeds with versioned change notifications."""
+
+    def __init__(self, history=1000, window=WINDOW):
+        self._history = history
+        self.window = window
+        self._feeds = {}
+        self._lock = threading.Lock()
+
+    def _feed(self, name):
+        feed = self._feeds.get(name)
+        if feed is None:
+            feed = self._feeds.setdefault(name, _Feed(self._history))
+        return feed
+
+    def version(self, name):
+        """Current version of a feed; O(1), safe to call on every tick."""
+        feed = self._feeds.get(name)
+        return feed.version if feed else 0
+
+    def _publish(self, feed, delta):
+        feed.version += 1
+        feed.deltas.append((feed.version, delta))
+        return feed.version
+
+    def share(self, name, milestone, owner=None):
+        """Add a milestone (which must carry an "id") to a feed."""
+        with self._lock:
+            feed = self._feed(name)
+            for evicted in _add(feed.items, dict(milestone), self.window):
+                feed.owners.pop(evicted, None)
+            if owner is not None:
+                feed.owners[milestone["id"]] = owner
+            return self._publish(feed, {"op": MILESTONE_ADDED, "item": dict(milestone)})
+
+    def retract(self, name, milestone_id):
+        """Take a milestone back out of a feed, e.g. when its share is undone."""
+        with self._lock:
+            feed = self._feed(name)
+            feed.owners.pop(milestone_id, None)
+            if feed.items.pop(milestone_id, None) is None:
+                return None
+            return self._publish(feed, {"op": MILESTONE_RETRACTED, "id": milestone_id})
+
+    def celebrate(self, name, milestone_id):
+        """Increment a milestone's celebration count; returns the new count."""
+        with self._lock:
+            feed = self._feed(name)
+            item = feed.items.get(milestone_id)
+            if item is None:
+                return None
+            item["celebrations"] = item.get("celebrations", 0) + 1
+            self._publish(feed, {"op": CELEBRATIONS_CHANGED, "id": milestone_id,
+                                 "count": item["celebrations"]})
+            return item["celebrations"]
+
+    def owner(self, name, milestone_id):
+        """The family that shared a milestone, or None if unknown."""
+        with self._lock:
+            return self._feed(name).owners.get(milestone_id)
+
+    def shared_by(self, name, owner):
+        """Ids of the milestones in a feed that one family shared."""
+        with self._lock:
+            return {milestone_id for milestone_id, by in self._feed(name).owners.items() if by == owner}
+
+
+    def snapshot(self, name):
+        """Return (version, items) for a subscriber starting from scratch, oldest first."""
+        with self._lock:
+            feed = self._feed(name)
+            return feed.version, [dict(item) for item in feed.items.values()]
+
+    def changes_since(self, name, version):
+        """Return (version, deltas) published after `version`.
+
+        Deltas is None when the cursor has fallen out of the retained
+        history and the subscriber must resync from a snapshot.
+        """
+        with self._lock:
+            feed = self._feed(name)
+            if version == feed.version:
+                return version, []
+            if not feed.deltas or feed.deltas[0][0] > version + 1:
+                return feed.version, None
+            newer = []
+            for delta_version, delta in reversed(feed.deltas):
+                if delta_version <= version:
+                    break
+                newer.append(delta)
+            newer.reverse()
+            return feed.version, newer
+
+class FeedView:
+    """A session's local copy of a feed, kept current by applying deltas."""
+
+    def __init__(self, hub, name):
+        self.hub = hub
+        self.name = name
+        self._reset(*hub.snapshot(name))
+
+    def _reset(self, version, items):
+        self.version = version
+        self.items = OrderedDict((item["id"], item) for item in items)
+
+    def sync(self):
+        """Apply pending deltas; returns the list applied (empty when idle)."""
+        if self.hub.version(self.name) == self.version:
+            return []
+        version, deltas = self.hub.changes_since(self.name, self.version)
+        if deltas is None:
+            self._reset(*self.hub.snapshot(self.name))
+            return []
+        for delta in deltas:
+            if delta["op"] == MILESTONE_ADDED:
+                _add(self.items, dict(delta["item"]), self.hub.window)
+            elif delta["op"] == MILESTONE_RETRACTED:
+                self.items.pop(delta["id"], None)
+            elif delta["op"] == CELEBRATIONS_CHANGED and delta["id"] in self.items:
+                self.items[delta["id"]]["celebrations"] = delta["count"]
+        self.version = version
+        return deltas
+
+    def latest(self, limit=None):
+        """Most recently shared first; reads `limit` items off the window without sorting."""
+        return list(islice(reversed(self.items.values()), limit))
@@ -0,0 +1,113 @@
+"""Per-language message catalogs driven by the profile's primary_language.
+
+Catalogs live in locales/<code>.json as nested objects. On first use of a
+language its catalog is flattened to dotted keys and compiled to a marshal
+file next to the source, which later processes load without parsing JSON
+again. The compiled file is rebuilt whenever the JSON is newer. The
+language's catalog and its fallbacks are then merged into one dict and
+cached per process, so every lookup on a rerun is a single dict access.
+
+Coverage: every page's interface text is translated, along with the
+community feed, reminder inbox, screening resources, nearby services and
+recommendation reasons. What families and the catalog wrote themselves
+(milestones, plan text, resource topics) is shown as written, and stored
+option values stay in English so saved data reads the same in every
+language; they are translated only for display with Translator.label.
+"""
+
+import json
+import marshal
+import os
+from functools import lru_cache
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "locales")
+COMPILED_DIR = os.path.join(LOCALES_DIR, ".compiled")
+
+LANGUAGES = {"English": "en", "Spanish": "es", "French": "fr", "German": "de"}
+DEFAULT_LANGUAGE = "en"
+
+
+def _flatten(tree, prefix=""):
+    flat = {}
+    for key, value in tree.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+@lru_cache(maxsize=None)
+def load_catalog(code):
+    """Return the flat message dict for one language, compiling it if stale."""
+    source = os.path.join(LOCALES_DIR, f"{code}.json")
+    compiled = os.path.join(COMPILED_DIR, f"{code}.marshal")
+    if not os.path.exists(source):
+        return {}
+    try:
+        if os.path.getmtime(compiled) >= os.path.getmtime(source):
+            with open(compiled, "rb") as f:
+                return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    with open(source, encoding="utf-8") as f:
+        messages = _flatten(json.load(f))
+    try:
+        os.makedirs(COMPILED_DIR, exist_ok=True)
+        tmp = f"{compiled}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            marshal.dump(messages, f)
+        os.replace(tmp, compiled)
+    except OSError:
+        # Read-only deployments still work, they just parse JSON each start
+        pass
+    return messages
+
+
+def fallback_chain(language):
+    """Catalog codes to consult for a profile language, most specific first."""
+    code = LANGUAGES.get(language, language if language in LANGUAGES.values() else DEFAULT_LANGUAGE)
+    return [code] if code == DEFAULT_LANGUAGE else [code, DEFAULT_LANGUAGE]
+
+
+class Translator:
+    """Message lookups for one language with its fallbacks already merged in."""
+
+    def __init__(self, chain):
+        self.language = chain[0]
+        self.messages = {}
+        for code in reversed(chain):
+            self.messages.update(load_catalog(code))
+        self._sections = {}
+
+    def __call__(self, key, **kwargs):
+        text = self.messages.get(key, key)
+        return text.format(**kwargs) if kwargs else text
+
+    def get(self, key, default=None):
+        return self.messages.get(key, default)
+
+    def label(self, section, value):
+        """Translate a stored option value for display, e.g. in format_func."""
+        return self.messages.get(f"{section}.{value}", value)
+
+    def section(self, prefix):
+        """All messages under `prefix` keyed by their remaining name."""
+        section = self._sections.get(prefix)
+        if section is None:
+            start = f"{prefix}."
+            section = {key[len(start):]: value for key, value in self.messages.items() if key.startswith(start)}
+            self._sections[prefix] = section
+        return section
+
+
+@lru_cache(maxsize=None)
+def _translator(chain):
+    return Translator(list(chain))
+
+
+def get_translator(language):
+    """Cached Translator for a primary_language value such as "Spanish"."""
+    return _translator(tuple(fallback_chain(language)))
@@ -0,0 +1,246 @@
+"""Background health checks for the external links shown on the Resources page.
+
+Every catalog URL is probed concurrently with HEAD requests over a small
+asyncio HTTP/1.1 client that keeps idle keep-alive connections per host,
+so the dozen links on one government site share a few sockets instead of
+opening one each. Redirects are followed and their final target recorded.
+Servers that refuse HEAD are retried with a one-byte GET.
+
+Results are cached with a TTL: healthy links for hours, failures for
+minutes so a blip clears quickly. Reruns only read the cache; all fetching
+happens on a daemon thread started once per process.
+"""
+
+import asyncio
+import logging
+import ssl
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+
+HEALTHY = "ok"
+REDIRECTED = "redirected"
+BROKEN = "broken"
+UNREACHABLE = "unreachable"
+UNCHECKED = "unchecked"
+
+HEALTH_BADGES = {
+    HEALTHY: "🟢",
+    REDIRECTED: "🟡",
+    BROKEN: "🔴",
+    UNREACHABLE: "⚫",
+    UNCHECKED: "⚪",
+}
+
+USER_AGENT = "PeerSupportHub-LinkCheck/1.0"
+
+log = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    """Raised when a response cannot be read or parsed."""
+
+
+class ConnectionPool:
+    """Minimal asyncio HTTP/1.1 client that reuses keep-alive connections per host."""
+
+    def __init__(self, per_host=4, timeout=10.0):
+        self.per_host = per_host
+        self.timeout = timeout
+        self._idle = {}
+        self._limits = {}
+        self._ssl = ssl.create_default_context()
+        self.opened = 0
+
+    async def request(self, method, url, headers=None):
+        """Send one request and return (status, headers) without reading a body."""
+        parts = urlsplit(url)
+        secure = parts.scheme == "https"
+        port = parts.port or (443 if secure else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        limit = self._limits.setdefault(key, asyncio.Semaphore(self.per_host))
+        async with limit:
+            reader, writer = await self._connect(key, secure)
+            lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}",
+                     f"User-Agent: {USER_AGENT}", "Accept: */*"]
+            lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+            try:
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+                status, response_headers = await asyncio.wait_for(self._read_head(reader), self.timeout)
+            except BaseException:
+                writer.close()
+                raise
+
+            # Only bodiless responses leave the connection ready for reuse
+            reusable = (method == "HEAD" or response_headers.get("content-length") == "0"
+                        or status in (204, 304))
+            if reusable and response_headers.get("connection", "").lower() != "close":
+                self._idle.setdefault(key, []).append((reader, writer))
+            else:
+                writer.close()
+            return status, response_headers
+
+    async def _connect(self, key, secure):
+        idle = self._idle.get(key, [])
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        _, host, port = key
+        connection = asyncio.open_connection(host, port, ssl=self._ssl if secure else None)
+        self.opened += 1
+        return await asyncio.wait_for(connection, self.timeout)
+
+    @staticmethod
+    async def _read_head(reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise HTTPError("connection closed before a response")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise HTTPError(f"malformed status line {status_line[:40]!r}")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return status, headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+async def check_url(pool, url, max_redirects=5):
+    """Probe one URL and describe its health, following redirects."""
+    started = time.monotonic()
+    result = {"url": url, "status_code": None, "final_url": url, "health": UNREACHABLE,
+              "error": "", "checked_at": time.time(), "elapsed": 0.0}
+    target = url
+    try:
+        for _ in range(max_redirects + 1):
+            status, headers = await pool.request("HEAD", target)
+            if status in (405, 501):
+                status, headers = await pool.request("GET", target, {"Range": "bytes=0-0"})
+            if status in (301, 302, 303, 307, 308) and headers.get("location"):
+                target = urljoin(target, headers["location"])
+                continue
+            break
+        else:
+            raise HTTPError(f"more than {max_redirects} redirects")
+        result["status_code"] = status
+        result["final_url"] = target
+        if status >= 400:
+            result["health"] = BROKEN
+        elif target != url:
+            result["health"] = REDIRECTED
+        else:
+            result["health"] = HEALTHY
+    except (OSError, asyncio.TimeoutError, HTTPError) as exc:
+        result["error"] = str(exc) or type(exc).__name__
+    except Exception as exc:
+        # A bug or an odd URL (bad port, bad IDNA) says nothing about the link; one bad URL
+        # must not fail the gather for all the others
+        result["health"] = UNCHECKED
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    result["elapsed"] = round(time.monotonic() - started, 3)
+    return result
+
+
+class LinkHealth:
+    """TTL cache of link health, refreshed off the request path."""
+
+    def __init__(self, ttl=6 * 3600, failure_ttl=15 * 60, concurrency=8, timeout=10.0):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._results = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def get(self, url):
+        """Cached result for a URL, or an unchecked placeholder. Never fetches."""
+        with self._lock:
+            result = self._results.get(url)
+        if result is None:
+            return {"url": url, "health": UNCHECKED, "status_code": None, "final_url": url,
+                    "error": "", "checked_at": None, "elapsed": 0.0}
+        return result
+
+    def expired(self, urls, now=None):
+        """URLs with no cached result or one older than its TTL."""
+        now = time.time() if now is None else now
+        with self._lock:
+            results = dict(self._results)
+        stale = []
+        for url in urls:
+            result = results.get(url)
+            if result is None:
+                stale.append(url)
+                continue
+            ttl = self.ttl if result["health"] in (HEALTHY, REDIRECTED) else self.failure_ttl
+            if now - result["checked_at"] >= ttl:
+                stale.append(url)
+        return stale
+
+    def check(self, urls):
+        """Probe the given URLs concurrently and cache the results."""
+        urls = [url for url in dict.fromkeys(urls) if urlsplit(url).scheme in ("http", "https")]
+        if not urls:
+            return []
+        results = asyncio.run(self._check_all(urls))
+        with self._lock:
+            for result in results:
+                self._results[result["url"]] = result
+        return results
+
+    async def _check_all(self, urls):
+        pool = ConnectionPool(per_host=self.concurrency, timeout=self.timeout)
+        gate = asyncio.Semaphore(self.concurrency)
+
+        async def probe(url):
+            async with gate:
+                return await check_url(pool, url)
+
+        try:
+            return await asyncio.gather(*(probe(url) for url in urls))
+        finally:
+            pool.close()
+
+    def refresh(self, urls):
+        """Re-check only the URLs whose cached result has expired."""
+        return self.check(self.expired(urls))
+
+    def start_periodic(self, urls, interval=300):
+        """Refresh expired results now and every `interval` seconds on a daemon thread."""
+        if self._thread is None:
+            urls = list(urls)
+
+            def loop():
+                while True:
+                    try:
+                        self.refresh(urls)
+                    except Exception:
+                        # Cached results stay as they are until the next round
+                        log.exception("link health refresh failed")
+                    time.sleep(interval)
+            self._thread = threading.Thread(target=loop, name="link-health", daemon=True)
+            self._thread.start()
+        return self
+
+
+def catalog_urls(resources, external_links):
+    """Every checkable URL in the resource catalog and external link lists."""
+    urls = [resource.get("url", "") for resource in resources]
+    urls += [link["url"] for links in external_links.values() for link in links]
+    return [url for url in dict.fromkeys(urls) if urlsplit(url).scheme in ("http", "https")]
@@ -0,0 +1,261 @@
+""""Find parents like me": approximate nearest neighbours over family profiles.
+
+A profile becomes a sparse, L2-normalized feature vector:
+
+    categorical   one-hot language, state, city, family-size band and each
+                  support network entry
+    children      conditions and age bands recognized in children_info,
+                  plus its remaining words at a low weight
+
+Candidates come from random-hyperplane LSH. A hyperplane is a Gaussian
+coefficient per feature, drawn from a generator seeded by the feature name,
+so any vocabulary works without a fixed dimension and every process draws
+the same planes. A profile's signature in each table is the sign pattern of
+its projections. Profiles with similar directions share a bucket in at
+least one table with high probability. Only those candidates are scored by
+exact cosine, so a query touches a few buckets instead of every family.
+
+Saving a profile moves it between buckets in place. Families who turned off
+public_milestones are left out of the index, so they never show up as
+someone else's match.
+
+Other families only ever see a parent's first name and the city and state
+of their location (public_card). The chat and the community feed use the
+same first_name() rule.
+"""
+
+import hashlib
+import math
+import random
+import re
+import threading
+from functools import lru_cache
+
+TABLES = 12
+BITS = 10
+MIN_CANDIDATES = 50
+# Hyperplanes kept for the most recently seen features; free-text words make
+# the vocabulary open-ended, and a dropped plane is simply drawn again
+PLANE_CACHE = 4096
+
+CONDITIONS = {
+    "Autism": r"\bautis|\basd\b|asperger",
+    "ADHD": r"\badhd\b|\badd\b",
+    "Learning disabilities": r"dyslex|dysgraph|dyscalc|learning disab",
+    "Speech & language": r"speech|language delay|non-?verbal|apraxia",
+    "Epilepsy": r"seizure|epilep",
+    "Cerebral palsy": r"cerebral palsy|\bcp\b",
+    "Down syndrome": r"down'?s? syndrome|trisomy",
+    "Anxiety": r"anxi",
+    "Sensory processing": r"sensory",
+}
+
+AGE_BANDS = ((5, "0-5"), (12, "6-12"), (17, "13-17"), (200, "18+"))
+
+WEIGHTS = {
+    "condition": 1.5,
+    "age": 1.0,
+    "state": 1.0,
+    "city": 1.0,
+    "language": 0.8,
+    "size": 0.4,
+    "network": 0.4,
+    "word": 0.25,
+}
+
+STOPWORDS = frozenset("""a an and are at but by for from has have he her his in is it its loves
+    enjoys likes my of on or our she son daughter the their they to with years year old""".split())
+
+
+def age_band(age):
+    for limit, band in AGE_BANDS:
+        if age <= limit:
+            return band
+
+
+def profile_features(profile):
+    """Sparse unit vector {feature: weight} for a profile; empty when there is nothing to match on."""
+    raw = {}
+
+    def add(kind, value):
+        if value:
+            raw[f"{kind}:{value}"] = WEIGHTS[kind]
+
+    add("language", profile.get("primary_language"))
+    location = [part.strip().lower() for part in (profile.get("location") or "").split(",")]
+    if len(location) >= 2:
+        add("city", location[0])
+        add("state", location[-1])
+    elif location[0]:
+        add("city", location[0])
+    size = profile.get("family_size")
+    if size:
+        add("size", "1-2" if size <= 2 else "3-4" if size <= 4 else "5+")
+    for network in profile.get("support_network", []):
+        add("network", network)
+
+    children = (profile.get("children_info") or "").lower()
+    for condition, pattern in CONDITIONS.items():
+        if re.search(pattern, children):
+            add("condition", condition)
+    for age in re.findall(r"\((\d{1,2})\)|\b(\d{1,2})\s*(?:yo\b|y/o|years?)", children):
+        add("age", age_band(int(age[0] or age[1])))
+    for word in re.findall(r"[a-z]{4,}", children):
+        if word not in STOPWORDS and f"word:{word}" not in raw:
+            add("word", word)
+
+    if not raw:
+        return {}
+    norm = math.sqrt(sum(w * w for w in raw.values()))
+    return {feature: w / norm for feature, w in raw.items()}
+
+
+def describe_feature(feature):
+    """Label for a shared feature in a match's "you both..." line, or None for plain words."""
+    kind, value = feature.split(":", 1)
+    if kind == "condition":
+        return value
+    if kind == "age":
+        return f"children aged {value}"
+    if kind == "state":
+        return value.upper() if len(value) <= 3 else value.title()
+    if kind == "city":
+        return value.title()
+    if kind == "language":
+        return f"speaks {value}"
+    if kind == "network":
+        return f"leans on {value.lower()}"
+    return None
+
+
+def first_name(name):
+    """The part of a parent's name other families see; "" when there is none."""
+    parts = (name or "").split()
+    return parts[0] if parts else ""
+
+
+def public_location(location):
+    """City and state from a free-text location, e.g. "Springfield, IL"; never a street or zip."""
+    location = re.sub(r"\b\d{5}(?:-\d{4})?\b", "", location or "")
+    parts = [part.strip() for part in location.split(",")]
+    return ", ".join([part for part in parts if part and not re.search(r"\d", part)][-2:])
+
+
+def public_card(profile):
+    """What a match may show about a family: first name, city and state, and recognized needs."""
+    children = (profile.get("children_info") or "").lower()
+    return {
+        "name": first_name(profile.get("parent_name")),
+        "location": public_location(profile.get("location")),
+        "conditions": [condition for condition, pattern in CONDITIONS.items() if re.search(pattern, children)],
+    }
+
+
+class PeerIndex:
+    """Incrementally updated LSH index of discoverable family profiles."""
+
+    def __init__(self, tables=TABLES, bits=BITS, seed=0):
+        self.tables = tables
+        self.bits = bits
+        self.seed = seed
+        self._buckets = [{} for _ in range(tables)]
+        self._vectors = {}
+        self._signatures = {}
+        self._cards = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._vectors)
+
+    def _signature(self, vector):
+        sums = [0.0] * (self.tables * self.bits)
+        for feature, weight in vector.items():
+            for i, coefficient in enumerate(_plane(self.seed, feature, self.tables * self.bits)):
+
+                sums[i] += weight * coefficient
+        signature = []
+        for table in range(self.tables):
+            key = 0
+            for value in sums[table * self.bits:(table + 1) * self.bits]:
+                key = (key << 1) | (value > 0)
+            signature.append(key)
+        return tuple(signature)
+
+    def upsert(self, user_id, profile, card=None):
+        """Index (or re-index) a family; drops them when they are not discoverable.
+
+        `card` is the public summary shown to families who match them.
+        """
+        vector = profile_features(profile) if profile.get("public_milestones", True) else {}
+        signature = self._signature(vector) if vector else None
+        with self._lock:
+            self._drop(user_id)
+            if not vector:
+                return False
+            self._vectors[user_id] = vector
+            self._signatures[user_id] = signature
+            self._cards[user_id] = card or {}
+            for table, key in enumerate(signature):
+                self._buckets[table].setdefault(key, set()).add(user_id)
+        return True
+
+    def remove(self, user_id):
+        with self._lock:
+            self._drop(user_id)
+
+    def _drop(self, user_id):
+        signature = self._signatures.pop(user_id, None)
+        if signature is None:
+            return
+        for table, key in enumerate(signature):
+            bucket = self._buckets[table].get(key)
+            if bucket is not None:
+                bucket.discard(user_id)
+                if not bucket:
+                    del self._buckets[table][key]
+        self._vectors.pop(user_id, None)
+        self._cards.pop(user_id, None)
+
+    def _candidates(self, signature, exclude):
+        with self._lock:
+            found = set()
+            for table, key in enumerate(signature):
+                found.update(self._buckets[table].get(key, ()))
+            if len(found) - (exclude in found) < MIN_CANDIDATES:
+                # Multi-probe: also look one bit-flip away in every table
+                for table, key in enumerate(signature):
+                    for bit in range(self.bits):
+                        found.update(self._buckets[table].get(key ^ (1 << bit), ()))
+            found.discard(exclude)
+            return [(user, self._vectors[user], self._cards[user]) for user in found]
+
+    def similar(self, profile, k=5, exclude=None, describe=describe_feature):
+        """Top-k discoverable families for a profile as (user_id, score, shared, card).
+
+        `shared` lists readable labels for what the two families have in common,
+        as worded by `describe(feature)`, e.g. a translating wrapper.
+        """
+        vector = profile_features(profile)
+        if not vector:
+            return []
+        scored = []
+        for user, other, card in self._candidates(self._signature(vector), exclude):
+            common = vector.keys() & other.keys()
+            score = sum(vector[feature] * other[feature] for feature in common)
+            if score > 0:
+                scored.append((score, user, common, card))
+        scored.sort(key=lambda match: match[0], reverse=True)
+        matches = []
+        for score, user, common, card in scored[:k]:
+            labels = [describe(feature)
+                      for feature in sorted(common, key=lambda feature: -vector[feature])]
+            matches.append((user, round(score, 3), [label for label in labels if label], card))
+        return matches
+
+
+@lru_cache(maxsize=PLANE_CACHE)
+def _plane(seed, feature, size):
+    # One coefficient per (table, bit), fixed for a feature across processes
+    digest = hashlib.blake2b(f"{seed}:{feature}".encode("utf-8"), digest_size=8).digest()
+    rng = random.Random(int.from_bytes(digest, "big"))
+    return tuple(rng.gauss(0.0, 1.0) for _ in range(size))
@@ -0,0 +1,294 @@
+"""Prometheus text-format metrics and health checks on a side port.
+
+The hot path only bumps counters and histogram buckets behind a per-metric
+lock. Anything expensive is left to scrape time: session counts, memory
+estimates and queue depths all come from gauges computed by callbacks when
+/metrics is read. A small stdlib HTTP server on its own daemon thread
+serves
+
+    /metrics   Prometheus exposition format (text/plain; version=0.0.4)
+    /healthz   liveness: 200 while the process can answer at all
+    /readyz    readiness: 200 only when every registered check passes
+
+next to the Streamlit server. The port comes from HUB_METRICS_PORT
+(default 9464). When it is already taken, e.g. by another worker on the
+same host, the worker keeps running without a metrics server.
+"""
+
+import bisect
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 9464
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name if name.endswith("_total") else f"{name}_total"
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {} if self.labelnames else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues):
+        return self._values.get(labelvalues, 0)
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labelvalues, value in sorted(values.items()):
+            yield self.name, _labels(self.labelnames, labelvalues), value
+
+
+class Gauge:
+    """Value read at scrape time from a callback returning {labelvalues: value}."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=(), callback=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self):
+        values = self.callback() if self.callback else {}
+        if not isinstance(values, dict):
+            values = {(): values}
+        for labelvalues, value in sorted(values.items()):
+            yield self.name, _labels(self.labelnames, labelvalues), value
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by label values."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            snapshot = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for labelvalues, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield (f"{self.name}_bucket",
+                       _labels(self.labelnames, labelvalues, [("le", _number(bound))]), cumulative)
+            yield f"{self.name}_sum", _labels(self.labelnames, labelvalues), total
+            yield f"{self.name}_count", _labels(self.labelnames, labelvalues), count
+
+
+class Registry:
+    """Named metrics plus the readiness checks served next to them."""
+
+    def __init__(self):
+        self.metrics = []
+        self.checks = {}
+        self.started = time.time()
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=(), callback=None):
+        return self.register(Gauge(name, help, labelnames, callback))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def add_check(self, name, check):
+        """Register a readiness check: a callable that raises or returns False when not ready."""
+        self.checks[name] = check
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            try:
+                for name, labels, value in metric.samples():
+                    lines.append(f"{name}{labels} {_number(value)}")
+            except Exception as exc:
+                # One failing callback must not take the whole scrape down
+                lines.append(f"# {metric.name} unavailable: {_escape(exc)}")
+        return "\n".join(lines) + "\n"
+
+    def readiness(self):
+        """Return (ready, {check: "ok" or the failure reason})."""
+        results = {}
+        for name, check in self.checks.items():
+            try:
+                ok = check()
+                results[name] = "ok" if ok is not False else "not ready"
+            except Exception as exc:
+                results[name] = f"{type(exc).__name__}: {exc}"
+        return all(result == "ok" for result in results.values()), results
+
+
+class SessionTracker:
+    """Last-seen times and state references for the sessions in this process."""
+
+    def __init__(self, idle_after=300, forget_after=3600):
+        self.idle_after = idle_after
+        self.forget_after = forget_after
+        self._sessions = {}
+
+    def touch(self, session_id, *state):
+        """Mark a session as seen; `state` is sized at scrape time, not here."""
+        self._sessions[session_id] = (time.time(), state)
+
+    def _prune(self, now):
+        for session_id, (seen, _) in list(self._sessions.items()):
+            if now - seen > self.forget_after:
+                self._sessions.pop(session_id, None)
+
+    def active(self):
+        now = time.time()
+        self._prune(now)
+        return sum(1 for seen, _ in list(self._sessions.values()) if now - seen <= self.idle_after)
+
+    def memory(self):
+        """Estimated bytes held by each active session's state."""
+        now = time.time()
+        return [deep_sizeof(state) for seen, state in list(self._sessions.values())
+                if now - seen <= self.idle_after]
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate memory held by an object graph of builtin containers."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in list(obj.items()))
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in list(obj))
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def _handler(registry):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                self._send(200, registry.render())
+            elif path == "/healthz":
+                self._send(200, f"ok uptime={time.time() - registry.started:.0f}s\n")
+            elif path == "/readyz":
+                ready, results = registry.readiness()
+                body = "".join(f"{name}: {result}\n" for name, result in sorted(results.items()))
+                self._send(200 if ready else 503, body or "ok\n")
+            else:
+                self._send(404, "not found\n")
+
+        def _send(self, status, body):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(registry, port=None, host="0.0.0.0"):
+    """Start the metrics server on a daemon thread; returns it, or None if the port is taken."""
+    port = int(os.environ.get("HUB_METRICS_PORT", DEFAULT_PORT)) if port is None else port
+    try:
+        server = ThreadingHTTPServer((host, port), _handler(registry))
+    except OSError:
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+class HubMetrics:
+    """The hub's own metrics on one registry, created once per worker process."""
+
+    def __init__(self, registry=None):
+        self.registry = registry = registry or Registry()
+        self.sessions = SessionTracker()
+        self.queues = {}
+
+        self.reruns = registry.counter("hub_reruns", "Script reruns by page.", ["page"])
+        self.rerun_seconds = registry.histogram(
+            "hub_rerun_seconds", "Wall time of a full page script run, by page.", ["page"])
+        self.form_submissions = registry.counter(
+            "hub_form_submissions", "Submitted forms by type.", ["form"])
+        self.plan_activations = registry.counter(
+            "hub_crisis_plan_activations", "Crisis plans activated.")
+        self.reminders_fired = registry.counter(
+            "hub_reminders_fired", "Reminders delivered, by kind.", ["kind"])
+        self.rate_limited = registry.counter(
+            "hub_rate_limited", "Write actions refused by the per-session rate limiter, by action.", ["action"])
+        registry.gauge("hub_active_sessions", "Sessions that reran in the last five minutes.",
+                       callback=self.sessions.active)
+        registry.gauge("hub_session_state_bytes", "Estimated memory held per active session.",
+                       ["stat"], callback=self._session_memory)
+        registry.gauge("hub_storage_queue_depth", "Items waiting in each storage or delivery queue.",
+                       ["queue"], callback=lambda: {(name,): depth() for name, depth in self.queues.items()})
+
+    def _session_memory(self):
+        sizes = self.sessions.memory()
+        if not sizes:
+            return {("max",): 0, ("mean",): 0, ("total",): 0}
+        return {("max",): max(sizes), ("mean",): sum(sizes) // len(sizes), ("total",): sum(sizes)}
@@ -0,0 +1,56 @@
+"""Review queue for public milestones held back by safety screening.
+
+A held milestone keeps `moderation: "held"` in its owner's event log, so the
+hold outlives a restart. The queue is only an index over those records:
+seed() rebuilds it by scanning every family's state once at startup. From
+then on hold() and resolve() keep it in step with the log.
+
+A moderator either releases a post, which then goes to the community feed,
+or rejects it, which leaves it visible to its family only. Both decisions
+are recorded as a MILESTONE_MODERATED event on the owner's log. Opening the
+app with ?moderator=<HUB_MODERATOR_KEY> shows the review tab.
+"""
+
+import threading
+
+HELD = "held"
+RELEASED = "released"
+REJECTED = "rejected"
+
+
+class ModerationQueue:
+    """Held milestones awaiting a moderator, oldest first."""
+
+    def __init__(self):
+        self._held = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._held)
+
+    def seed(self, store):
+        """Index every held milestone found in the event store."""
+        for user_id in store.users():
+            try:
+                state = store.peek(user_id)
+            except (OSError, ValueError):
+                continue
+            for milestone in state["milestone_shares"]:
+                if milestone.get("moderation") == HELD:
+                    self.hold(user_id, milestone)
+        return self
+
+    def hold(self, owner, milestone):
+        with self._lock:
+            self._held[milestone["id"]] = (owner, milestone)
+
+    def pending(self, limit=50):
+        """(owner, milestone) pairs, oldest first."""
+        with self._lock:
+            held = list(self._held.values())
+        return sorted(held, key=lambda entry: entry[1]["date"])[:limit]
+
+    def resolve(self, milestone_id):
+        """Take a milestone off the queue; returns (owner, milestone), or None if already decided."""
+        with self._lock:
+            return self._held.pop(milestone_id, None)
@@ -0,0 +1,243 @@
+"""Minimal PDF writer for printable reports.
+
+Only what the progress reports need: A4/Letter pages, the built-in
+Helvetica faces (every PDF viewer has them, so nothing is embedded),
+word-wrapped paragraphs, simple tables, filled bars for charts and page
+numbers. Text is set in WinAnsiEncoding, so Latin-script languages print
+with their accents. Characters outside it, emoji included, are dropped
+rather than printed as boxes. Line breaking uses the standard Helvetica
+glyph widths, so wrapped lines fit the page without measuring a font at
+run time.
+
+Each page's content stream is compressed with zlib and the document is
+written in one pass with a cross-reference table at the end.
+"""
+
+import unicodedata
+import zlib
+from datetime import date
+
+LETTER = (612, 792)
+A4 = (595, 842)
+
+REGULAR = "F1"
+BOLD = "F2"
+_BASE_FONTS = {REGULAR: "Helvetica", BOLD: "Helvetica-Bold"}
+
+# Advance widths in 1/1000 em for ASCII 32..126 (Adobe core font metrics)
+_WIDTHS = {
+    REGULAR: [278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+              556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+              1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+              667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+              333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+              556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584],
+    BOLD: [278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+           556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+           975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+           667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+           333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+           611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584],
+}
+
+GREY = (0.45, 0.45, 0.45)
+BLACK = (0, 0, 0)
+
+
+def clean(text):
+    """Text reduced to what WinAnsiEncoding can print."""
+    text = str(text or "").replace("\t", "    ")
+    return "".join(char for char in text if char == "\n" or _encodable(char))
+
+
+def _encodable(char):
+    try:
+        char.encode("cp1252")
+    except UnicodeEncodeError:
+        return False
+    return char.isprintable()
+
+
+def text_width(text, font=REGULAR, size=10):
+    widths = _WIDTHS[font]
+    total = 0
+    for char in text:
+        code = ord(char)
+        if not 32 <= code <= 126:
+            # Accented letters are as wide as their base letter, near enough
+            base = unicodedata.normalize("NFKD", char)[:1]
+            code = ord(base) if base and 32 <= ord(base) <= 126 else 110
+        total += widths[code - 32]
+    return total * size / 1000
+
+
+def wrap(text, width, font=REGULAR, size=10):
+    """Split text into lines no wider than `width` points, keeping its own line breaks."""
+    lines = []
+    for paragraph in clean(text).split("\n"):
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if text_width(candidate, font, size) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            # A single word longer than the line is broken by character
+            while text_width(word, font, size) > width:
+                cut = len(word) - 1
+                while cut > 1 and text_width(word[:cut], font, size) > width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+def _literal(text):
+    data = text.encode("cp1252", "ignore")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+class Document:
+    """A flowing document: content is laid out top to bottom across pages."""
+
+    def __init__(self, title="", page_size=LETTER, margin=54, footer=""):
+        self.title = title
+        self.width, self.height = page_size
+        self.margin = margin
+        self.footer = clean(footer)
+        self.pages = []
+        self._ops = None
+        self.y = 0
+        self.new_page()
+
+    @property
+    def usable_width(self):
+        return self.width - 2 * self.margin
+
+    def new_page(self):
+        self._ops = []
+        self.pages.append(self._ops)
+        self.y = self.height - self.margin
+
+    def ensure(self, height):
+        """Start a new page unless `height` points still fit on this one."""
+        if self.y - height < self.margin + 18:
+            self.new_page()
+
+    def space(self, points):
+        self.y -= points
+
+    def text(self, x, y, text, font=REGULAR, size=10, color=BLACK):
+        self._ops.append(b"BT %.3f %.3f %.3f rg /%s %.1f Tf %.2f %.2f Td %s Tj ET"
+                         % (*color, font.encode(), size, x, y, _literal(clean(text))))
+
+    def rect(self, x, y, width, height, color=(0.8, 0.8, 0.8)):
+        self._ops.append(b"%.3f %.3f %.3f rg %.2f %.2f %.2f %.2f re f" % (*color, x, y, width, height))
+
+    def rule(self, color=(0.75, 0.75, 0.75)):
+        self.ensure(10)
+        self.rect(self.margin, self.y - 4, self.usable_width, 0.75, color)
+        self.y -= 12
+
+    def heading(self, text, size=14):
+        self.ensure(size * 2.4)
+        self.y -= size * 0.6
+        self.text(self.margin, self.y - size, text, BOLD, size)
+        self.y -= size * 1.6
+
+    def paragraph(self, text, size=10, font=REGULAR, indent=0, color=BLACK, leading=1.35):
+        for line in wrap(text, self.usable_width - indent, font, size):
+            self.ensure(size * leading)
+            self.text(self.margin + indent, self.y - size, line, font, size, color)
+            self.y -= size * leading
+
+    def table(self, header, rows, widths, size=9):
+        """Rows of cells with fractional column `widths`; the header repeats on each page."""
+        columns = [fraction * self.usable_width for fraction in widths]
+
+        def layout(cells, font):
+            wrapped = [wrap(str(cell), column - 6, font, size) for cell, column in zip(cells, columns)]
+            return wrapped, max(len(lines) for lines in wrapped) * size * 1.3 + 4
+
+        def draw(wrapped, height, font):
+            x = self.margin
+            for lines, column in zip(wrapped, columns):
+                for row, line in enumerate(lines):
+                    self.text(x, self.y - size - row * size * 1.3, line, font, size)
+                x += column
+            self.y -= height
+
+        head, head_height = layout(header, BOLD)
+        first = True
+        for cells in rows:
+            wrapped, height = layout(cells, REGULAR)
+            bottom = self.margin + 18
+            if first or self.y - height < bottom:
+                if self.y - head_height - height < bottom:
+                    self.new_page()
+                draw(head, head_height, BOLD)
+                self.rect(self.margin, self.y + 1, self.usable_width, 0.5, GREY)
+                first = False
+            draw(wrapped, height, REGULAR)
+
+    def bars(self, items, size=9, color=(0.18, 0.53, 0.67), scale=None):
+        """Horizontal bar chart of (label, value, shown) rows."""
+        if not items:
+            return
+        scale = scale or max(value for _, value, _ in items) or 1
+        label_width = min(max(text_width(clean(label), REGULAR, size) for label, _, _ in items) + 10,
+                          self.usable_width * 0.4)
+        bar_space = self.usable_width - label_width - 50
+        for label, value, shown in items:
+            self.ensure(size * 1.8)
+            self.text(self.margin, self.y - size, wrap(label, label_width - 6, REGULAR, size)[0], REGULAR, size)
+            length = max(bar_space * value / scale, 1 if value else 0)
+            self.rect(self.margin + label_width, self.y - size - 1, length, size, color)
+            self.text(self.margin + label_width + length + 4, self.y - size, str(shown), REGULAR, size, GREY)
+            self.y -= size * 1.8
+
+    def render(self):
+        """The finished document as bytes."""
+        objects = []
+
+        def add(body):
+            objects.append(body)
+            return len(objects)
+
+        catalog = add(None)
+        pages = add(None)
+        fonts = {name: add(b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>"
+                           % base.encode())
+                 for name, base in _BASE_FONTS.items()}
+        resources = b"<< /Font << %s >> >>" % b" ".join(b"/%s %d 0 R" % (name.encode(), number)
+                                                       for name, number in fonts.items())
+        kids = []
+        for number, ops in enumerate(self.pages, 1):
+            if self.footer or len(self.pages) > 1:
+                footer = f"{self.footer}    Page {number} of {len(self.pages)}".strip()
+                ops = ops + [b"BT 0.45 0.45 0.45 rg /F1 8 Tf %.2f %.2f Td %s Tj ET"
+                             % (self.margin, self.margin / 2, _literal(footer))]
+            stream = zlib.compress(b"\n".join(ops))
+            content = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(stream), stream))
+            kids.append(add(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>"
+                            % (pages, self.width, self.height, resources, content)))
+        objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages
+        objects[pages - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+        info = add(b"<< /Title %s /Producer (Special Needs Parenting Support Hub) /CreationDate (D:%s) >>"
+                   % (_literal(clean(self.title)), date.today().strftime("%Y%m%d").encode()))
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        out += b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            len(objects) + 1, catalog, info, xref)
+        return bytes(out)
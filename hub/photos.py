@@ -0,0 +1,182 @@
+"""Content-addressed storage and off-thread processing for milestone photos.
+
+An upload is copied in chunks into a temporary file while it is hashed.
+It is then stored under its SHA-256, so the same photo uploaded twice,
+or shared by two parents, is kept and processed once.
+
+Decoding, rotating, resizing and re-encoding run in a separate process
+pool. Each size is a fresh JPEG built from pixels only, so EXIF data
+(GPS position, camera serials, timestamps) never reaches a served file.
+After processing the raw upload is deleted.
+
+Derived images are written under static/photos/, which Streamlit serves
+as plain files when server.enableStaticServing is on. Feed pages then
+send <img loading="lazy"> tags with a srcset instead of image bytes. The
+browser fetches only the thumbnails scrolled into view, at the size the
+screen needs, and caches them: a content hash never changes.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+from hub import DATA_DIR
+from hub.workers import ProcessJobs
+
+# Longest edge in pixels for each derived size
+SIZES = {"thumb": 320, "thumb2x": 640, "display": 1280}
+JPEG_QUALITY = 82
+
+MAX_UPLOAD_BYTES = 15 * 1024 * 1024
+ACCEPTED_TYPES = ["jpg", "jpeg", "png", "webp", "gif"]
+
+READY = "ready"
+PROCESSING = "processing"
+FAILED = "failed"
+MISSING = "missing"
+
+PUBLIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "photos")
+PUBLIC_URL = "app/static/photos"
+
+
+TOO_LARGE = "too_large"
+EMPTY = "empty"
+UNAVAILABLE = "unavailable"
+
+
+class PhotoRejected(Exception):
+    """Raised when an upload is too large or empty, or cannot be processed right now.
+
+    `reason` is one of TOO_LARGE, EMPTY or UNAVAILABLE, for a translated message.
+    """
+
+    def __init__(self, message, reason):
+        super().__init__(message)
+        self.reason = reason
+
+
+def _variant_name(digest, size):
+    return f"{digest}_{size}.jpg"
+
+
+def process_photo(raw_path, public_dir, digest, sizes=SIZES, quality=JPEG_QUALITY):
+    """Worker-process job: write EXIF-free JPEGs for each size, then drop the raw upload."""
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(raw_path) as image:
+            image.load()
+            # Honour the camera's orientation tag before it is discarded
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "L"):
+                background = Image.new("RGB", image.size, "white")
+                rgba = image.convert("RGBA")
+                background.paste(rgba, mask=rgba.getchannel("A"))
+                image = background
+            for size, edge in sizes.items():
+                variant = image.copy()
+                variant.thumbnail((edge, edge), Image.LANCZOS)
+                target = os.path.join(public_dir, _variant_name(digest, size))
+                tmp = f"{target}.{os.getpid()}.tmp"
+                variant.convert("RGB").save(tmp, "JPEG", quality=quality, optimize=True, progressive=True)
+                os.replace(tmp, target)
+        return READY
+    finally:
+        try:
+            os.remove(raw_path)
+        except OSError:
+            pass
+
+
+class PhotoStore:
+    """Deduplicated photo uploads with thumbnails built in a process pool."""
+
+    def __init__(self, directory=None, public_dir=PUBLIC_DIR, public_url=PUBLIC_URL, workers=2):
+        self.incoming = os.path.join(directory or os.path.join(DATA_DIR, "photos"), "incoming")
+        self.public_dir = public_dir
+        self.public_url = public_url
+        self._jobs = ProcessJobs(workers)
+        self._lock = threading.Lock()
+        os.makedirs(self.incoming, exist_ok=True)
+        os.makedirs(self.public_dir, exist_ok=True)
+        self.resume()
+
+    def put(self, upload, chunk_size=256 * 1024):
+        """Store an uploaded file-like object; returns its content hash.
+
+        Known content is not stored or processed again.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        handle, tmp = tempfile.mkstemp(dir=self.incoming, suffix=".part")
+        try:
+            with os.fdopen(handle, "wb") as out:
+                while True:
+                    chunk = upload.read(chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > MAX_UPLOAD_BYTES:
+                        raise PhotoRejected(f"photos must be under {MAX_UPLOAD_BYTES // (1024 * 1024)} MB", TOO_LARGE)
+                    digest.update(chunk)
+                    out.write(chunk)
+            if size == 0:
+                raise PhotoRejected("the uploaded file is empty", EMPTY)
+            key = digest.hexdigest()
+            raw = os.path.join(self.incoming, key)
+            with self._lock:
+                if self.status(key) in (READY, PROCESSING):
+                    os.remove(tmp)
+                    return key
+                os.replace(tmp, raw)
+                try:
+                    self._jobs.submit(key, process_photo, raw, self.public_dir, key)
+                except BrokenProcessPool:
+                    self._jobs.fail(key)
+                    os.remove(raw)
+                    raise PhotoRejected("photo processing is unavailable right now, please try again",
+                                        UNAVAILABLE) from None
+            return key
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def resume(self):
+        """Re-queue raw uploads left behind by a restart mid-processing."""
+        for name in os.listdir(self.incoming):
+            if len(name) == 64:
+                self._jobs.submit(name, process_photo, os.path.join(self.incoming, name), self.public_dir, name)
+
+    def status(self, key):
+        if self._jobs.running(key):
+            return PROCESSING
+        if self._jobs.failed(key):
+            return FAILED
+        if all(os.path.exists(os.path.join(self.public_dir, _variant_name(key, size))) for size in SIZES):
+            return READY
+        return MISSING
+
+    def pending(self):
+        """Uploads still waiting for or in processing."""
+        return len(self._jobs)
+
+    def url(self, key, size="thumb"):
+        """Static URL for one derived size, or None until it exists."""
+        if self.status(key) != READY:
+            return None
+        return f"{self.public_url}/{_variant_name(key, size)}"
+
+    def img_tag(self, key, alt=""):
+        """Lazy-loading <img> with 1x/2x thumbnails, or None while processing."""
+        if self.status(key) != READY:
+            return None
+        thumb, thumb2x = self.url(key, "thumb"), self.url(key, "thumb2x")
+        alt = alt.replace("&", "&amp;").replace('"', "&quot;").replace("<", "&lt;")
+        return (f'<img src="{thumb}" srcset="{thumb} 1x, {thumb2x} 2x" loading="lazy" decoding="async" '
+                f'alt="{alt}" style="max-width:100%;width:{SIZES["thumb"]}px;border-radius:8px">')
+
+    def shutdown(self):
+        self._jobs.shutdown()
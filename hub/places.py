@@ -0,0 +1,276 @@
+"""Offline lookup of services near a family's location.
+
+Two small CSV files ship with the hub in hub/data/:
+
+    gazetteer.csv   state and city centroids
+    services.csv    children's hospitals, parent training and information
+                    centers and crisis lines
+
+Nothing here makes a network call. The free-text profile location ("Austin,
+TX", "austin texas", "Boston", "Boston MA 02115") is resolved against the
+gazetteer once. The result is memoized and also saved with the profile, so
+it never has to be parsed again.
+
+ZIP codes are placed by their first three digits, using the USPS prefix
+ranges below. That gives the state, not a point inside it: a full ZIP
+centroid table is megabytes and goes stale as routes change. A ZIP next to
+a city picks the right one of several same-named cities, and a lone ZIP
+resolves to its state's centroid. A city name found in more than one state
+("Portland") is not guessed at. It resolves to None until a state or ZIP is
+given, and ambiguous_places() lists the choices.
+
+Services are indexed per kind in a k-d tree over points on the unit sphere.
+Straight-line distance between those points grows with great-circle
+distance, so the tree's plain Euclidean pruning finds the truly nearest
+services, even across the date line or near the poles. Rows without
+coordinates (national lines such as 988) apply everywhere and are always
+listed after the local ones.
+"""
+
+import csv
+import heapq
+import math
+import os
+import re
+from functools import lru_cache
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+HOSPITAL = "hospital"
+CRISIS = "crisis"
+PARENT_CENTER = "parent_center"
+
+SERVICE_ICONS = {HOSPITAL: "🏥", CRISIS: "🚑", PARENT_CENTER: "🧑‍🏫"}
+
+EARTH_RADIUS_MILES = 3958.8
+
+# First three ZIP digits -> state, as "low-high ST" ranges
+ZIP_PREFIXES = """
+005-005 NY  010-027 MA  028-029 RI  030-038 NH  039-049 ME  050-054 VT  055-055 MA  056-059 VT
+060-069 CT  070-089 NJ  100-149 NY  150-196 PA  197-199 DE  200-200 DC  201-201 VA  202-205 DC
+206-219 MD  220-246 VA  247-268 WV  270-289 NC  290-299 SC  300-319 GA  320-339 FL  341-349 FL
+350-369 AL  370-385 TN  386-397 MS  398-399 GA  400-427 KY  430-459 OH  460-479 IN  480-499 MI
+500-528 IA  530-549 WI  550-567 MN  569-569 DC  570-577 SD  580-588 ND  590-599 MT  600-629 IL
+630-658 MO  660-679 KS  680-693 NE  700-715 LA  716-729 AR  730-732 OK  733-733 TX  734-749 OK
+750-799 TX  800-816 CO  820-831 WY  832-838 ID  840-847 UT  850-865 AZ  870-884 NM  885-885 TX
+889-898 NV  900-961 CA  967-968 HI  970-979 OR  980-994 WA  995-999 AK
+"""
+_ZIP_RANGES = [(int(span[:3]), int(span[4:]), state.lower())
+               for span, state in zip(ZIP_PREFIXES.split()[::2], ZIP_PREFIXES.split()[1::2])]
+_ZIP = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+
+
+def zip_state(code):
+    """Lowercase state code for a 5-digit ZIP, or None."""
+    prefix = int(code[:3])
+    for low, high, state in _ZIP_RANGES:
+        if low <= prefix <= high:
+            return state
+    return None
+
+
+def _unit(lat, lon):
+    lat, lon = math.radians(lat), math.radians(lon)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def miles_between(a, b):
+    """Great-circle distance between two (lat, lon) points."""
+    chord = math.dist(_unit(*a), _unit(*b))
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, chord / 2))
+
+
+class KDTree:
+    """Static k-d tree over 3-d points, each carrying a payload."""
+
+    __slots__ = ("_nodes",)
+
+    def __init__(self, points):
+        # Flattened: node i holds (point, payload, axis, left, right)
+        self._nodes = []
+        self._build(list(points), 0)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def _build(self, points, depth):
+        if not points:
+            return -1
+        axis = depth % 3
+        points.sort(key=lambda entry: entry[0][axis])
+        middle = len(points) // 2
+        index = len(self._nodes)
+        self._nodes.append(None)
+        left = self._build(points[:middle], depth + 1)
+        right = self._build(points[middle + 1:], depth + 1)
+        self._nodes[index] = (points[middle][0], points[middle][1], axis, left, right)
+        return index
+
+    def nearest(self, target, k=1):
+        """The k payloads closest to `target` as (distance, payload), nearest first."""
+        best = []  # max-heap of (-distance, order, payload)
+        stack = [0] if self._nodes else []
+        order = 0
+        while stack:
+            index = stack.pop()
+            point, payload, axis, left, right = self._nodes[index]
+            distance = math.dist(point, target)
+            if len(best) < k:
+                heapq.heappush(best, (-distance, order, payload))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, order, payload))
+            order += 1
+            gap = target[axis] - point[axis]
+            near, far = (left, right) if gap < 0 else (right, left)
+            # Visit the far side only if the splitting plane is closer than the current kth best
+            if far != -1 and (len(best) < k or abs(gap) < -best[0][0]):
+                stack.append(far)
+            if near != -1:
+                stack.append(near)
+        return [(-distance, payload) for distance, _, payload in sorted(best, reverse=True)]
+
+
+def _rows(name):
+    with open(os.path.join(DATA, name), encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _key(text):
+    return re.sub(r"[^a-z0-9 ]+", "", text.lower().replace("saint ", "st ").replace(".", "")).strip()
+
+
+class Gazetteer:
+    """Place-name lookup from the bundled centroids."""
+
+    def __init__(self, rows=None):
+        self.states = {}
+        self.cities = {}
+        for row in rows if rows is not None else _rows("gazetteer.csv"):
+            point = (float(row["lat"]), float(row["lon"]))
+            if row["kind"] == "state":
+                entry = (point, row["name"], row["state"].lower())
+                self.states[row["state"].lower()] = entry
+                self.states[_key(row["name"])] = entry
+            else:
+                label = f"{row['name']}, {row['state']}"
+                self.cities.setdefault(_key(row["name"]), []).append((row["state"].lower(), point, label))
+
+    def _state(self, text):
+        return self.states.get(_key(text))
+
+    def resolve(self, location):
+        """Return (lat, lon, label) for a free-text location, or None.
+
+        Accepts "City, ST", "City, State", "City ST", a bare city or a bare
+        state, each optionally with a ZIP code, or a ZIP code alone. A city
+        the gazetteer lacks falls back to its state's centroid. A bare city
+        that exists in several states returns None.
+        """
+        text = (location or "").strip()
+        found = _ZIP.search(text)
+        zip_entry = self.states.get(zip_state(found.group(1))) if found else None
+        if found:
+            text = (text[:found.start()] + text[found.end():]).strip(" ,")
+        if not text:
+            return (zip_entry[0][0], zip_entry[0][1], zip_entry[1]) if zip_entry else None
+        parts = [part.strip() for part in text.split(",") if part.strip()]
+        city, state = parts[0], parts[-1] if len(parts) > 1 else ""
+        if not state:
+            # "Austin TX" / "Salt Lake City Utah": try ever longer trailing words as the state
+            words = city.split()
+            for split in range(len(words) - 1, 0, -1):
+                if self._state(" ".join(words[split:])):
+                    city, state = " ".join(words[:split]), " ".join(words[split:])
+                    break
+        state_entry = (self._state(state) if state else None) or zip_entry
+
+        candidates = self.cities.get(_key(city), [])
+        if state_entry:
+            candidates = [candidate for candidate in candidates if candidate[0] == state_entry[2]]
+        if len({candidate[0] for candidate in candidates}) > 1:
+            return None
+        if candidates:
+            _, point, label = candidates[0]
+            return point[0], point[1], label
+        if state_entry:
+            return state_entry[0][0], state_entry[0][1], state_entry[1]
+        # A lone state name, e.g. "Ohio"
+        state_entry = self._state(city)
+        if state_entry:
+            return state_entry[0][0], state_entry[0][1], state_entry[1]
+        return None
+
+
+    def ambiguous(self, location):
+        """Labels of every city a bare, ambiguous city name could mean; empty otherwise."""
+        candidates = self.cities.get(_key(location or ""), [])
+        if len({candidate[0] for candidate in candidates}) < 2:
+            return []
+        return [label for _, _, label in candidates]
+
+
+class Services:
+    """Bundled services indexed per kind for nearest-first lookup."""
+
+    def __init__(self, rows=None):
+        located, self.everywhere = {}, {}
+        for row in rows if rows is not None else _rows("services.csv"):
+            service = {"kind": row["kind"], "name": row["name"], "city": row["city"],
+                       "state": row["state"], "phone": row.get("phone") or ""}
+            if row["lat"] and row["lon"]:
+                service["point"] = (float(row["lat"]), float(row["lon"]))
+                located.setdefault(row["kind"], []).append((_unit(*service["point"]), service))
+            else:
+                self.everywhere.setdefault(row["kind"], []).append(service)
+        self.trees = {kind: KDTree(points) for kind, points in located.items()}
+
+    def nearest(self, point, kind, k=3):
+        """Up to k services of `kind` near (lat, lon), each with "miles", then the national ones."""
+        found = []
+        tree = self.trees.get(kind)
+        if tree is not None and point is not None:
+            for _, service in tree.nearest(_unit(*point), k):
+                found.append(dict(service, miles=round(miles_between(point, service["point"]))))
+        return found + [dict(service) for service in self.everywhere.get(kind, [])]
+
+
+_gazetteer = None
+_services = None
+
+
+@lru_cache(maxsize=4096)
+def resolve_location(location):
+    """Memoized Gazetteer.resolve() on the bundled data."""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer.resolve(location)
+
+
+def ambiguous_places(location):
+    """"Portland" -> ["Portland, ME", "Portland, OR"]; empty unless the name is ambiguous."""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer.ambiguous(location)
+
+
+def nearby(point, kind, k=3):
+    """Nearest bundled services of `kind` to (lat, lon); point may be None."""
+    global _services
+    if _services is None:
+        _services = Services()
+    return _services.nearest(point, kind, k)
+
+
+def state_of(location):
+    """Two-letter state code for a free-text location, or None."""
+    resolved = resolve_location(location)
+    if resolved is None:
+        return None
+    label = resolved[2]
+    if ", " in label:
+        return label.rsplit(", ", 1)[1]
+    # A bare state resolves to its full name
+    entry = _gazetteer._state(label)
+    return entry[2].upper() if entry else None
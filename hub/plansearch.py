@@ -0,0 +1,190 @@
+"""Prefix search over a family's crisis plans.
+
+Each plan's warning signs, immediate steps and crisis type are split into
+words and posted to an inverted index held per family:
+
+    postings    word -> {plan_id: fields the word appears in}
+    vocabulary  the family's words in sorted order, for prefix lookup
+    stems       stem -> words sharing it, so "hitting" also finds "hits"
+
+Every query term is looked up as a prefix with bisect on the sorted
+vocabulary, so a half-written word such as "seiz" still matches. Words
+that share the term's stem match as well. A plan must match
+every term. Plans rank by the fields they matched in, with warning signs
+weighted highest, because that is what a parent types in a developing
+crisis. The plan texts are never rescanned at query time.
+
+Saving a plan re-posts it in place and deleting it withdraws its postings,
+so the index follows the event log without being rebuilt. Each family's
+postings are separate, so one family's search never sees another's plans.
+
+Streamlit's text input sends its value on Enter or when it loses focus,
+not on every keystroke, so a search runs once per submitted query.
+"""
+
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+SIGNS = "warning_signs"
+STEPS = "immediate_steps"
+TYPE = "type"
+
+FIELD_WEIGHTS = {SIGNS: 3.0, TYPE: 2.0, STEPS: 1.0}
+
+_WORD = re.compile(r"[^\W_]+")
+# A list marker ("-", "•", "1.", "2)") followed by space; digits that are content, like 911, stay
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+
+
+def fold(text):
+    """Casefolded text with accents removed, so "convulsión" matches "convulsion"."""
+    decomposed = unicodedata.normalize("NFKD", (text or "").casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def words(text):
+    return _WORD.findall(fold(text))
+
+
+def stem(word):
+    """Crude English suffix stripping: hitting/hits/hit and seizures/seizure agree."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                break
+            if suffix == "es" and not word.endswith(("ches", "shes", "sses", "xes", "zes")):
+                continue
+            word = word[:-len(suffix)]
+            if suffix in ("ing", "ed") and len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            break
+    return word
+
+
+def lines(text):
+    """The non-empty lines of a free-text field, without list bullets."""
+    stripped = (_BULLET.sub("", line).strip() for line in (text or "").splitlines())
+    return [line for line in stripped if line.strip("-•*")]
+
+
+class _Family:
+    __slots__ = ("postings", "vocabulary", "stems", "plans")
+
+    def __init__(self):
+        self.postings = {}
+        self.vocabulary = []
+        self.stems = {}
+        self.plans = {}
+
+
+class PlanIndex:
+    """Per-family inverted index over crisis plans.
+
+    `labels(type)` returns other names for a crisis type, e.g. its
+    translations, which are indexed alongside it.
+    """
+
+    def __init__(self, labels=None):
+        self.labels = labels or (lambda crisis_type: ())
+        self._families = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(family.plans) for family in self._families.values())
+
+    def _fields(self, plan):
+        indexed = {SIGNS: set(words(plan.get(SIGNS))), STEPS: set(words(plan.get(STEPS)))}
+        crisis_type = plan.get(TYPE) or ""
+        indexed[TYPE] = set(words(crisis_type))
+        for label in self.labels(crisis_type):
+            indexed[TYPE].update(words(label))
+        return indexed
+
+    def upsert(self, user_id, plan):
+        """Index a saved or edited plan, replacing whatever was posted for it before."""
+        fields = self._fields(plan)
+        with self._lock:
+            family = self._families.setdefault(user_id, _Family())
+            self._withdraw(family, plan["id"])
+            posted = {}
+            for field, found in fields.items():
+                for word in found:
+                    posted.setdefault(word, set()).add(field)
+            for word, where in posted.items():
+                plans = family.postings.get(word)
+                if plans is None:
+                    plans = family.postings[word] = {}
+                    insort(family.vocabulary, word)
+                    family.stems.setdefault(stem(word), set()).add(word)
+                plans[plan["id"]] = frozenset(where)
+            family.plans[plan["id"]] = tuple(posted)
+
+    def remove(self, user_id, plan_id):
+        with self._lock:
+            family = self._families.get(user_id)
+            if family is not None:
+                self._withdraw(family, plan_id)
+
+    def reset(self, user_id, plans):
+        """Re-index a family from scratch, e.g. after an undo."""
+        with self._lock:
+            self._families.pop(user_id, None)
+        for plan in plans:
+            self.upsert(user_id, plan)
+
+    def _withdraw(self, family, plan_id):
+        for word in family.plans.pop(plan_id, ()):
+            plans = family.postings[word]
+            plans.pop(plan_id, None)
+            if not plans:
+                del family.postings[word]
+                del family.vocabulary[bisect_left(family.vocabulary, word)]
+                sharing = family.stems[stem(word)]
+                sharing.discard(word)
+                if not sharing:
+                    del family.stems[stem(word)]
+
+    def _expand(self, family, term):
+        # Every indexed word the term could mean: words it prefixes and words sharing its stem
+        matched = set(family.stems.get(stem(term), ()))
+        start = bisect_left(family.vocabulary, term)
+        for word in family.vocabulary[start:]:
+            if not word.startswith(term):
+                break
+            matched.add(word)
+        return matched
+
+    def search(self, user_id, query, limit=10):
+        """Plans matching every term of `query` as (plan_id, score, matched words), best first."""
+        terms = words(query)
+        if not terms:
+            return []
+        with self._lock:
+            family = self._families.get(user_id)
+            if family is None:
+                return []
+            scores, matched = None, {}
+            for term in terms:
+                term_scores = {}
+                for word in self._expand(family, term):
+                    for plan_id, where in family.postings[word].items():
+                        weight = max(FIELD_WEIGHTS[field] for field in where)
+                        if weight > term_scores.get(plan_id, 0.0):
+                            term_scores[plan_id] = weight
+                        matched.setdefault(plan_id, set()).add(word)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {plan_id: score + term_scores[plan_id]
+                              for plan_id, score in scores.items() if plan_id in term_scores}
+                if not scores:
+                    return []
+        ranked = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [(plan_id, score, matched[plan_id]) for plan_id, score in ranked]
+
+
+def matching_lines(text, matched):
+    """The lines of a plan field that contain any of the matched words."""
+    return [line for line in lines(text) if matched & set(words(line))]
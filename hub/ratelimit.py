@@ -0,0 +1,127 @@
+"""Per-session token buckets for the hub's write actions.
+
+Every (session, action) pair has a bucket holding up to `burst` tokens,
+refilled at burst/period tokens a second. A write spends one token. When
+the bucket is empty the write is refused, and the caller is told how many
+seconds until a token is back. Refill is worked out lazily from the time of
+the last check, so there is no timer and a check is O(1).
+
+Buckets are kept in least-recently-used order. A bucket that would have
+refilled to capacity is indistinguishable from a missing one, so those are
+dropped from the old end as checks go by. Memory then follows the sessions
+that are actually writing, with MAX_BUCKETS as a hard ceiling.
+
+Crisis actions are never limited. A rate configured for one of them is
+rejected, so a typo in the settings cannot slow down a parent in an
+emergency.
+
+Rates can be overridden with HUB_RATE_LIMITS, e.g.
+"share=5/600,celebrate=30/60" (burst/period in seconds).
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+SHARE = "share"
+CELEBRATE = "celebrate"
+SAVE = "save"
+ADD_CONTACT = "add_contact"
+SUBMIT_CHECKIN = "checkin"
+CHAT = "chat"
+
+# Crisis plans, their activation and crisis resources are never limited
+CRISIS_PLAN = "crisis_plan"
+ACTIVATE_PLAN = "activate_plan"
+EXEMPT = frozenset({CRISIS_PLAN, ACTIVATE_PLAN})
+
+# action: (burst, period in seconds)
+DEFAULT_RATES = {
+    SHARE: (5, 600),
+    CELEBRATE: (30, 60),
+    SAVE: (20, 60),
+    ADD_CONTACT: (10, 600),
+    SUBMIT_CHECKIN: (5, 3600),
+    CHAT: (20, 60),
+}
+
+MAX_BUCKETS = 100000
+
+
+def parse_rates(spec):
+    """Rates from "action=burst/period,..." as {action: (burst, period)}."""
+    rates = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        action, _, rate = part.partition("=")
+        burst, _, period = rate.partition("/")
+        try:
+            rates[action.strip()] = (int(burst), float(period))
+        except ValueError:
+            raise ValueError(f"invalid rate {part.strip()!r}, expected action=burst/seconds") from None
+    return rates
+
+
+def configured_rates():
+    """DEFAULT_RATES with any HUB_RATE_LIMITS overrides applied."""
+    return dict(DEFAULT_RATES, **parse_rates(os.environ.get("HUB_RATE_LIMITS")))
+
+
+class RateLimiter:
+    """Token buckets keyed by (session, action).
+
+    `on_limit(action)` is called for every refused write, e.g. to count it.
+    """
+
+    def __init__(self, rates=None, on_limit=None, max_buckets=MAX_BUCKETS):
+        rates = configured_rates() if rates is None else rates
+        for action, (burst, period) in rates.items():
+            if action in EXEMPT:
+                raise ValueError(f"{action!r} is a crisis action and cannot be rate limited")
+            if burst < 1 or period <= 0:
+                raise ValueError(f"invalid rate for {action!r}: {burst}/{period}")
+        # action -> (capacity, tokens per second)
+        self.rates = {action: (float(burst), burst / period) for action, (burst, period) in rates.items()}
+        self.on_limit = on_limit
+        self.max_buckets = max_buckets
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def take(self, session, action, cost=1):
+        """Spend `cost` tokens; returns 0.0 if allowed, else seconds until it would be."""
+        rate = self.rates.get(action)
+        if rate is None:
+            return 0.0
+        capacity, refill = rate
+        key = (session, action)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = capacity
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill)
+                self._buckets.move_to_end(key)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / refill
+            self._buckets[key] = (tokens, now)
+            self._evict(now)
+        if wait and self.on_limit is not None:
+            self.on_limit(action)
+        return wait
+
+    def _evict(self, now):
+        while self._buckets:
+            (_, action), (tokens, seen) = next(iter(self._buckets.items()))
+            capacity, refill = self.rates[action]
+            if len(self._buckets) <= self.max_buckets and tokens + (now - seen) * refill < capacity:
+                break
+            self._buckets.popitem(last=False)
@@ -0,0 +1,167 @@
+"""Personalized resource recommendations from a precomputed similarity index.
+
+Each resource becomes a sparse feature vector over its category and topics.
+Item-item cosine similarities are computed once through an inverted index
+(only items that share a feature are ever compared) and kept as sparse
+top-k neighbour lists. Adding a resource only compares it with the items
+it shares a feature with. A family's profile, milestones, saved library and
+recent check-ins are mapped onto the same features, so ranking is a few
+dictionary lookups.
+"""
+
+import math
+import re
+import threading
+
+TOP_NEIGHBOURS = 10
+CATEGORY_WEIGHT = 0.5
+TOPIC_WEIGHT = 1.0
+
+# Reason kinds, paired with a value so the page can word them per language
+CATEGORY = "category"
+TOPIC = "topic"
+SIMILAR = "similar"
+TOP_RATED = "top_rated"
+
+# Words in children_info that point at catalog features
+CHILD_KEYWORDS = {
+    r"\bautis|\basd\b|asperger": ["category:autism", "topic:autism", "topic:sensory processing"],
+    r"\badhd\b|\badd\b|attention": ["category:adhd", "topic:adhd"],
+    r"dyslex|dysgraph|dyscalc|learning disab|reading": ["category:learning disabilities", "topic:dyslexia",
+                                                        "topic:reading"],
+    r"speech|language delay|non-?verbal|apraxia": ["topic:communication", "topic:speech therapy"],
+    r"seizure|epilep|cerebral palsy|medical|diabet": ["category:medical", "topic:doctor visits", "topic:seizures"],
+    r"behavio|meltdown|aggress|odd\b": ["category:behavioral", "topic:behavior"],
+    r"\biep\b|\b504\b|school": ["topic:iep", "topic:special education"],
+    r"social|friend": ["topic:social skills"],
+}
+
+SUPPORT_NETWORK_FEATURES = {
+    "Support Groups": ["topic:support groups"],
+    "Therapists": ["topic:speech therapy", "topic:intervention"],
+    "Teachers": ["topic:iep", "topic:special education"],
+    "Medical Team": ["topic:care team", "topic:doctor visits"],
+}
+
+MILESTONE_FEATURES = {
+    "Communication": ["topic:communication"],
+    "Educational": ["category:educational", "topic:special education"],
+    "Social": ["topic:social skills"],
+    "Medical": ["category:medical"],
+    "Behavioral": ["category:behavioral", "topic:behavior"],
+    "Daily Living": ["topic:daily living"],
+}
+
+STRAINED_CHECKIN_FEATURES = ["topic:self-care", "topic:caregiver wellbeing", "topic:support network"]
+
+
+def item_features(resource):
+    features = {f"category:{resource['category'].lower()}": CATEGORY_WEIGHT}
+    for topic in resource["topics"]:
+        features[f"topic:{topic.lower()}"] = TOPIC_WEIGHT
+    norm = math.sqrt(sum(w * w for w in features.values()))
+    return {feature: w / norm for feature, w in features.items()}
+
+
+class SimilarityIndex:
+    """Sparse item-item cosine similarity over catalog features."""
+
+    def __init__(self, resources=()):
+        self.items = {}
+        self.vectors = {}
+        self.postings = {}
+        self.neighbours = {}
+        self.labels = {}
+        self.version = 0
+        self._lock = threading.Lock()
+        for resource in resources:
+            self.add(resource)
+
+    def add(self, resource):
+        """Index one resource, updating only the items it overlaps with."""
+        key = resource["title"]
+        vector = item_features(resource)
+        with self._lock:
+            if key in self.items:
+                self._remove(key)
+            scores = {}
+            for feature, weight in vector.items():
+                for other, other_weight in self.postings.get(feature, {}).items():
+                    scores[other] = scores.get(other, 0.0) + weight * other_weight
+            self.items[key] = resource
+            self.vectors[key] = vector
+            for feature, weight in vector.items():
+                self.postings.setdefault(feature, {})[key] = weight
+            self.labels[f"category:{resource['category'].lower()}"] = resource["category"]
+            for topic in resource["topics"]:
+                self.labels[f"topic:{topic.lower()}"] = topic
+            self.neighbours[key] = dict(sorted(scores.items(), key=lambda kv: -kv[1])[:TOP_NEIGHBOURS])
+            for other, score in scores.items():
+                row = self.neighbours[other]
+                row[key] = score
+                if len(row) > TOP_NEIGHBOURS:
+                    del row[min(row, key=row.get)]
+            self.version += 1
+
+    def _remove(self, key):
+        for feature in self.vectors.pop(key):
+            self.postings[feature].pop(key, None)
+        del self.items[key]
+        self.neighbours.pop(key, None)
+        for row in self.neighbours.values():
+            row.pop(key, None)
+
+    def recommend(self, interests, seeds=(), exclude=(), limit=3):
+        """Rank resources for a family.
+
+        `interests` maps features to weights, `seeds` are titles the family
+        already engaged with. Returns (resource, score, reasons) tuples,
+        where each reason is a (kind, value) pair such as (SIMILAR, title).
+        """
+        scores = {}
+        reasons = {}
+        for feature, weight in interests.items():
+            for key, item_weight in self.postings.get(feature, {}).items():
+                scores[key] = scores.get(key, 0.0) + weight * item_weight
+                reasons.setdefault(key, []).append((feature.split(":", 1)[0], self.labels[feature]))
+        for seed in seeds:
+            for key, similarity in self.neighbours.get(seed, {}).items():
+                scores[key] = scores.get(key, 0.0) + similarity
+                reasons.setdefault(key, []).append((SIMILAR, seed))
+        if not scores:
+            # Nothing known about the family yet: fall back to top-rated items
+            scores = {key: 0.0 for key in self.items}
+            reasons = {key: [(TOP_RATED, None)] for key in self.items}
+        ranked = sorted((key for key in scores if key not in exclude),
+                        key=lambda key: (-scores[key], -self.items[key]["rating"]))
+        return [(self.items[key], round(scores[key], 3), list(dict.fromkeys(reasons[key]))[:3])
+                for key in ranked[:limit]]
+
+
+def family_interests(profile, milestones, checks):
+    """Map a family's profile, milestone types and check-ins to feature weights."""
+    interests = {}
+
+    def bump(features, weight):
+        for feature in features:
+            interests[feature] = interests.get(feature, 0.0) + weight
+
+    children_info = (profile.get("children_info") or "").lower()
+    for pattern, features in CHILD_KEYWORDS.items():
+        if re.search(pattern, children_info):
+            bump(features, 1.0)
+    for network in profile.get("support_network", []):
+        bump(SUPPORT_NETWORK_FEATURES.get(network, []), 0.3)
+    if not profile.get("support_network") and profile:
+        bump(["topic:support network", "topic:support groups"], 0.5)
+    if profile.get("primary_language") not in (None, "", "English"):
+        bump(["topic:bilingual", "topic:interpreters"], 1.0)
+
+    for milestone in milestones[-20:]:
+        bump(MILESTONE_FEATURES.get(milestone["type"], []), 0.2)
+
+    recent = checks[-3:]
+    if any(c["stress_level"] in ("High", "Very High") or c["support_feeling"] in ("Unsupported", "Very Unsupported")
+           for c in recent):
+        bump(STRAINED_CHECKIN_FEATURES, 1.0)
+    return interests
@@ -0,0 +1,316 @@
+"""Timer-heap scheduler for check-in, plan-review and meeting reminders.
+
+Every reminder in the process sits in one min-heap keyed on its next fire
+time. Scheduling and rescheduling cost O(log n). A single timer thread
+sleeps on a condition until the earliest entry is due, so nothing polls per
+family, however many reminders are waiting. A rescheduled or cancelled
+reminder leaves its old heap entry behind. The entry carries a revision
+number and is skipped when it surfaces. The heap is rebuilt once stale
+entries outnumber live ones.
+
+Recurring reminders are defined in the family's wall-clock time ("every 7
+days at 19:00 Eastern"), and each next occurrence is computed through
+zoneinfo, so they stay at 19:00 across daylight-saving changes.
+
+Reminders live in an append-only JSONL log (data/reminders/reminders.jsonl)
+that is replayed on start and rewritten once it is mostly superseded
+records. A fired reminder stays pending until the family dismisses it. That
+is what surfaces it in the app after a restart. Reminders that fell due
+while the process was down fire once on start, not once per missed period.
+"""
+
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from hub import DATA_DIR
+
+CHECKIN = "checkin"
+PLAN_REVIEW = "plan_review"
+MEETING = "meeting"
+
+REMINDER_ICONS = {CHECKIN: "🧠", PLAN_REVIEW: "📋", MEETING: "📅"}
+
+# Profile timezone choices to IANA zones
+TIMEZONES = {
+    "Eastern": "America/New_York",
+    "Central": "America/Chicago",
+    "Mountain": "America/Denver",
+    "Pacific": "America/Los_Angeles",
+    "Alaska": "America/Anchorage",
+    "Hawaii": "Pacific/Honolulu",
+}
+DEFAULT_TIMEZONE = "Eastern"
+
+log = logging.getLogger(__name__)
+
+
+def zone(timezone):
+    return ZoneInfo(TIMEZONES.get(timezone, TIMEZONES[DEFAULT_TIMEZONE]))
+
+
+def local_time(timestamp, timezone):
+    """A UTC timestamp as an aware datetime in the family's timezone."""
+    return datetime.fromtimestamp(timestamp, zone(timezone))
+
+
+def at_local(day, clock, timezone):
+    """UTC timestamp of wall-clock `clock` ("HH:MM") on `day` in the family's timezone."""
+    hour, minute = (int(part) for part in clock.split(":"))
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=zone(timezone)).timestamp()
+
+
+def next_occurrence(reminder, after):
+    """Next fire time of a recurring reminder strictly after `after`, in UTC seconds."""
+    tz = reminder["timezone"]
+    day = local_time(reminder["next"], tz).date()
+    step = timedelta(days=reminder["every_days"])
+    current = reminder["next"]
+    if current <= after:
+        # Skip whole missed periods at once rather than firing each of them
+        behind = (local_time(after, tz).date() - day).days // reminder["every_days"]
+        day += step * max(behind, 0)
+        current = at_local(day, reminder["clock"], tz)
+    while current <= after:
+        day += step
+        current = at_local(day, reminder["clock"], tz)
+    return current
+
+
+class ReminderScheduler:
+    """Process-wide reminder heap with a single timer thread and a JSONL log."""
+
+    def __init__(self, deliver=None, directory=None, compact_ratio=2.0):
+        self.deliver = deliver
+        self.directory = directory or os.path.join(DATA_DIR, "reminders")
+        self.compact_ratio = compact_ratio
+        self._reminders = {}
+        self._by_user = {}
+        self._heap = []
+        self._records = 0
+        self._wake = threading.Condition()
+        self._thread = None
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    @property
+    def _log(self):
+        return os.path.join(self.directory, "reminders.jsonl")
+
+    def __len__(self):
+        return len(self._reminders)
+
+    # --- persistence ---
+
+    def _load(self):
+        try:
+            with open(self._log, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._records += 1
+                    if record.get("cancel"):
+                        self._reminders.pop(record["id"], None)
+                    else:
+                        self._reminders[record["id"]] = record
+        except OSError:
+            pass
+        for reminder in self._reminders.values():
+            self._by_user.setdefault(reminder["user"], set()).add(reminder["id"])
+        self._heap = [(r["next"], r["rev"], r["id"]) for r in self._reminders.values() if r["next"] is not None]
+        heapq.heapify(self._heap)
+
+    def _write(self, record):
+        with open(self._log, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._records += 1
+        if self._records > self.compact_ratio * max(len(self._reminders), 100):
+            self._compact()
+
+    def _compact(self):
+        tmp = f"{self._log}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for reminder in self._reminders.values():
+                f.write(json.dumps(reminder, separators=(",", ":")) + "\n")
+        os.replace(tmp, self._log)
+        self._records = len(self._reminders)
+
+    # --- scheduling ---
+
+    def schedule(self, reminder_id, user_id, kind, title, first, timezone=DEFAULT_TIMEZONE,
+                 every_days=None, clock=None):
+        """Create or replace a reminder first firing at UTC timestamp `first`.
+
+        A recurring reminder repeats every `every_days` days at the local
+        wall-clock time `clock` ("HH:MM").
+        """
+        with self._wake:
+            previous = self._reminders.get(reminder_id)
+            reminder = {
+                "id": reminder_id, "user": user_id, "kind": kind, "title": title,
+                "next": first, "timezone": timezone, "every_days": every_days, "clock": clock,
+                "rev": (previous["rev"] + 1) if previous else 1,
+                "fired_at": previous["fired_at"] if previous else None,
+                "pending": previous["pending"] if previous else False,
+            }
+            self._reminders[reminder_id] = reminder
+            self._by_user.setdefault(user_id, set()).add(reminder_id)
+            self._write(reminder)
+            self._push(reminder)
+            return dict(reminder)
+
+    def _push(self, reminder):
+        heapq.heappush(self._heap, (reminder["next"], reminder["rev"], reminder["id"]))
+        if len(self._heap) > 2 * len(self._reminders) + 64:
+            self._heap = [(r["next"], r["rev"], r["id"]) for r in self._reminders.values() if r["next"] is not None]
+            heapq.heapify(self._heap)
+        # Wake the timer in case this is now the earliest reminder
+        self._wake.notify()
+
+    def cancel(self, reminder_id):
+        with self._wake:
+            reminder = self._reminders.pop(reminder_id, None)
+            if reminder is not None:
+                mine = self._by_user.get(reminder["user"], set())
+                mine.discard(reminder_id)
+                if not mine:
+                    self._by_user.pop(reminder["user"], None)
+                self._write({"id": reminder_id, "cancel": True})
+
+    def _mine(self, user_id):
+        return [self._reminders[reminder_id] for reminder_id in self._by_user.get(user_id, ())]
+
+    def retime(self, user_id, timezone):
+        """Move a family's recurring reminders to a new timezone, keeping their local times."""
+        with self._wake:
+            for reminder in self._mine(user_id):
+                if reminder["timezone"] == timezone or not reminder["every_days"] or reminder["next"] is None:
+                    continue
+                day = local_time(reminder["next"], reminder["timezone"]).date()
+                self.schedule(reminder["id"], user_id, reminder["kind"], reminder["title"],
+                              at_local(day, reminder["clock"], timezone), timezone,
+                              reminder["every_days"], reminder["clock"])
+
+    def retitle(self, reminder_id, title):
+        """Change a reminder's title without touching when it fires."""
+        with self._wake:
+            reminder = self._reminders.get(reminder_id)
+            if reminder is not None and reminder["title"] != title:
+                reminder["title"] = title
+                self._write(reminder)
+
+    def get(self, reminder_id):
+        reminder = self._reminders.get(reminder_id)
+        return dict(reminder) if reminder else None
+
+    def reminders(self, user_id):
+        """All of a family's reminders, scheduled or already fired."""
+        with self._wake:
+            return [dict(r) for r in self._mine(user_id)]
+
+    def upcoming(self, user_id):
+        """A family's scheduled reminders, soonest first."""
+        with self._wake:
+            mine = [dict(r) for r in self._mine(user_id) if r["next"] is not None]
+        return sorted(mine, key=lambda reminder: reminder["next"])
+
+    def pending(self, user_id):
+        """Reminders that have fired and not been dismissed, newest first."""
+        with self._wake:
+            mine = [dict(r) for r in self._mine(user_id) if r["pending"]]
+        return sorted(mine, key=lambda reminder: reminder["fired_at"], reverse=True)
+
+    def dismiss(self, reminder_id, forget=False):
+        """Clear a fired reminder from the inbox.
+
+        With `forget`, a one-shot reminder that has fired is deleted outright;
+        otherwise it is kept so whoever scheduled it can see it already fired.
+        """
+        with self._wake:
+            reminder = self._reminders.get(reminder_id)
+            if reminder is None or not reminder["pending"]:
+                return
+            if forget and reminder["next"] is None:
+                self.cancel(reminder_id)
+                return
+            reminder["pending"] = False
+            self._write(reminder)
+
+    # --- firing ---
+
+    def run_due(self, now=None):
+        """Fire every reminder due by `now`; returns how many fired."""
+        now = time.time() if now is None else now
+        fired = []
+        with self._wake:
+            while self._heap and self._heap[0][0] <= now:
+                _, rev, reminder_id = heapq.heappop(self._heap)
+                reminder = self._reminders.get(reminder_id)
+                if reminder is None or reminder["rev"] != rev:
+                    continue
+                reminder["fired_at"] = now
+                reminder["pending"] = True
+                reminder["rev"] += 1
+                if reminder["every_days"]:
+                    reminder["next"] = next_occurrence(reminder, now)
+                    heapq.heappush(self._heap, (reminder["next"], reminder["rev"], reminder_id))
+                else:
+                    reminder["next"] = None
+                self._write(reminder)
+                fired.append(dict(reminder))
+        for reminder in fired:
+            if self.deliver is not None:
+                try:
+                    self.deliver(reminder)
+                except Exception:
+                    # Delivery is best-effort; the reminder stays pending in the app
+                    log.exception("delivering reminder %s failed", reminder["id"])
+        return len(fired)
+
+    def next_due(self):
+        with self._wake:
+            return self._heap[0][0] if self._heap else None
+
+    def start(self):
+        """Start the timer thread; returns self for use in a cached factory."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="reminder-timer", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            with self._wake:
+                due = self._heap[0][0] if self._heap else None
+                delay = None if due is None else due - time.time()
+                if delay is None or delay > 0:
+                    # Sleeps until the earliest reminder or a schedule() call, whichever first
+                    self._wake.wait(timeout=None if delay is None else min(delay, 3600))
+                    continue
+            try:
+                self.run_due()
+            except Exception:
+                # One failed write must not stop the timer for every later reminder
+                log.exception("firing due reminders failed")
+                time.sleep(1)
+
+
+def checkin_first(timezone, clock="19:00", days=7, today=None):
+    """First weekly check-in reminder: `days` from today at `clock` local time."""
+    today = today or datetime.now(zone(timezone)).date()
+    return at_local(today + timedelta(days=days), clock, timezone)
+
+
+def plan_review_due(plan, timezone, after_days=90, clock="10:00"):
+    """When a crisis plan is due for review: 90 days after it was last used or created."""
+    anchor = plan.get("last_used") or plan.get("created_date") or date.today()
+    if isinstance(anchor, datetime):
+        anchor = anchor.date()
+    return at_local(anchor + timedelta(days=after_days), clock, timezone)
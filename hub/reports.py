@@ -0,0 +1,271 @@
+"""Printable progress reports for IEP and doctor meetings.
+
+A report is built from a plain snapshot of the family's records. It covers
+milestones by type over a date range, monthly wellbeing trends from
+check-ins, crisis plans and the care team. The app gathers that snapshot,
+including archived months for long ranges, and the snapshot is all a
+report depends on. Its SHA-256 (with REPORT_VERSION) names the finished
+PDF. Asking again for the same report returns the cached file straight
+away. Any changed record produces a new key.
+
+Layout and PDF writing run in a separate process pool, so a multi-year
+report never holds the GIL or a Streamlit script thread. A worker writes
+its progress as a fraction to a small sidecar file next to the PDF. The
+app polls status() and progress() for its progress bar. The PDF itself
+is written to a temporary name and renamed into place, so a half-written
+report is never served. Only the newest CACHE_SIZE reports are kept.
+"""
+
+import hashlib
+import os
+import threading
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+
+from hub import DATA_DIR
+from hub.events import dumps, loads
+from hub.pdf import BOLD, GREY, Document
+from hub.workers import ProcessJobs
+
+# Bump when the layout changes so cached reports are rebuilt
+REPORT_VERSION = 1
+CACHE_SIZE = 200
+
+READY = "ready"
+BUILDING = "building"
+FAILED = "failed"
+MISSING = "missing"
+
+# Check-in answers scored 1 (worst) to 5 (best)
+WELLBEING_SCALES = {
+    "stress_level": ("Low stress", ["Very High", "High", "Moderate", "Low", "Very Low"]),
+    "mood": ("Mood", ["Very Low", "Low", "Neutral", "Good", "Very Good"]),
+    "sleep_quality": ("Sleep", ["Very Poor", "Poor", "Fair", "Good", "Excellent"]),
+    "energy_level": ("Energy", ["Very Low", "Low", "Moderate", "High", "Very High"]),
+    "support_feeling": ("Feeling supported", ["Very Unsupported", "Unsupported", "Neutral", "Supported",
+                                               "Very Supported"]),
+    "coping_ability": ("Coping", ["Very Struggling", "Struggling", "Okay", "Well", "Very Well"]),
+}
+
+
+def report_key(snapshot):
+    """Content hash naming the PDF built from a report snapshot."""
+    payload = f"{REPORT_VERSION}:{dumps(snapshot)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def in_range(records, start, end):
+    """Records dated within [start, end], oldest first."""
+    return sorted((record for record in records if start <= record["date"] <= end), key=lambda record: record["date"])
+
+
+def monthly_wellbeing(checks):
+    """Average 1-5 score per month and scale: {"2024-03": {"mood": 3.5, ...}}."""
+    months = {}
+    for check in checks:
+        month = months.setdefault(f"{check['date'].year:04d}-{check['date'].month:02d}", {})
+        for field, (_, levels) in WELLBEING_SCALES.items():
+            if check.get(field) in levels:
+                month.setdefault(field, []).append(levels.index(check[field]) + 1)
+    return {month: {field: sum(scores) / len(scores) for field, scores in fields.items()}
+            for month, fields in sorted(months.items())}
+
+
+def _day(value):
+    return value.strftime("%b %d, %Y") if isinstance(value, date) else (value or "-")
+
+
+def render_report(snapshot, progress=None):
+    """Lay out a report snapshot as PDF bytes, reporting progress from 0 to 1."""
+    progress = progress or (lambda fraction: None)
+    profile = snapshot["profile"]
+    start, end = snapshot["start"], snapshot["end"]
+    milestones, checks = snapshot["milestones"], snapshot["checks"]
+    # Rough share of the work per section, so the bar moves evenly
+    total = max(len(milestones) + len(checks) + 10 * (len(snapshot["plans"]) + 1), 1)
+    done = 0
+
+    def advance(amount):
+        nonlocal done
+        done += amount
+        progress(min(done / total, 0.99))
+
+    doc = Document(title="Progress Report", footer=f"Progress report · {_day(start)} to {_day(end)}")
+    doc.heading("Progress Report", 20)
+    family = profile.get("parent_name") or "Family"
+    doc.paragraph(f"Prepared for {family} · {_day(start)} to {_day(end)} · generated {_day(snapshot['generated'])}",
+                  color=GREY)
+    if profile.get("children_info"):
+        doc.space(4)
+        doc.paragraph(f"About our children: {profile['children_info']}")
+    doc.rule()
+
+    doc.heading("Milestones")
+    if milestones:
+        counts = Counter(milestone["type"] for milestone in milestones)
+        doc.paragraph(f"{len(milestones)} milestones recorded in this period.")
+        doc.space(4)
+        doc.bars([(kind, count, count) for kind, count in counts.most_common()])
+        doc.space(6)
+        by_type = {}
+        for milestone in milestones:
+            by_type.setdefault(milestone["type"], []).append(milestone)
+        for kind, items in sorted(by_type.items(), key=lambda item: -len(item[1])):
+            doc.heading(f"{kind} ({len(items)})", 11)
+            doc.table(["Date", "Milestone"], [(_day(item["date"]), item["text"]) for item in items], [0.2, 0.8])
+            advance(len(items))
+    else:
+        doc.paragraph("No milestones were recorded in this period.", color=GREY)
+
+    doc.heading("Wellbeing Trends")
+    monthly = monthly_wellbeing(checks)
+    advance(len(checks))
+    if monthly:
+        doc.paragraph(f"{len(checks)} wellbeing check-ins. Monthly averages on a 1-5 scale, where 5 is best.")
+        doc.space(4)
+        fields = [field for field in WELLBEING_SCALES if any(field in scores for scores in monthly.values())]
+        doc.table(["Month"] + [WELLBEING_SCALES[field][0] for field in fields],
+                  [[month] + [f"{scores[field]:.1f}" if field in scores else "-" for field in fields]
+                   for month, scores in monthly.items()],
+                  [0.16] + [0.84 / len(fields)] * len(fields))
+        doc.space(8)
+        overall = {field: [scores[field] for scores in monthly.values() if field in scores] for field in fields}
+        doc.paragraph("Average over the whole period:", font=BOLD)
+        doc.bars([(WELLBEING_SCALES[field][0], sum(values) / len(values), f"{sum(values) / len(values):.1f} / 5")
+                  for field, values in overall.items()], scale=5)
+    else:
+        doc.paragraph("No wellbeing check-ins were recorded in this period.", color=GREY)
+
+    doc.heading("Crisis Plans")
+    if snapshot["plans"]:
+        for plan in snapshot["plans"]:
+            doc.heading(f"{plan['name']} ({plan['type']})", 11)
+            for label, field in (("Warning signs", "warning_signs"), ("Immediate steps", "immediate_steps"),
+                                 ("Who to contact", "contacts_to_call"), ("Resources needed", "resources_needed"),
+                                 ("Notes", "notes")):
+                if plan.get(field):
+                    doc.paragraph(f"{label}:", size=9, font=BOLD)
+                    doc.paragraph(plan[field], size=9, indent=12)
+            doc.paragraph(f"Created {_day(plan.get('created_date'))} · last used {_day(plan.get('last_used'))}",
+                          size=8, color=GREY)
+            doc.space(4)
+            advance(10)
+    else:
+        doc.paragraph("No crisis plans on file.", color=GREY)
+
+    doc.heading("Care Team")
+    contacts = snapshot["contacts"]
+    if contacts:
+        doc.table(["Name", "Relationship", "Phone", "Notes"],
+                  [(("* " if contact.get("primary") else "") + contact["name"], contact.get("relationship", ""),
+                    contact.get("phone", ""), contact.get("notes", "")) for contact in contacts],
+                  [0.26, 0.2, 0.2, 0.34])
+        if any(contact.get("primary") for contact in contacts):
+            doc.paragraph("* primary emergency contact", size=8, color=GREY)
+    else:
+        doc.paragraph("No emergency contacts on file.", color=GREY)
+    if profile.get("support_network"):
+        doc.space(4)
+        doc.paragraph("Support network: " + ", ".join(profile["support_network"]))
+    advance(10)
+    return doc.render()
+
+
+def build_report(encoded, target, progress_path):
+    """Worker-process job: render a report and move it into place atomically."""
+
+    def progress(fraction):
+        try:
+            with open(progress_path, "w", encoding="utf-8") as f:
+                f.write(f"{fraction:.3f}")
+        except OSError:
+            pass
+
+    try:
+        pdf = render_report(loads(encoded), progress)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp, target)
+        return len(pdf)
+    finally:
+        try:
+            os.remove(progress_path)
+        except OSError:
+            pass
+
+
+class ReportBuilder:
+    """Content-addressed PDF reports built in a process pool."""
+
+    def __init__(self, directory=None, workers=1, cache_size=CACHE_SIZE):
+        self.directory = directory or os.path.join(DATA_DIR, "reports")
+        self.cache_size = cache_size
+        self._jobs = ProcessJobs(workers, on_done=lambda key: self._prune())
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _progress_path(self, key):
+        return os.path.join(self.directory, f"{key}.progress")
+
+    def request(self, snapshot):
+        """Key of the report for a snapshot, queueing a build unless it is cached or underway."""
+        key = report_key(snapshot)
+        with self._lock:
+            if self._jobs.running(key):
+                return key
+            if os.path.exists(self.path(key)):
+                # Touch so the cache keeps reports people still ask for
+                os.utime(self.path(key))
+                return key
+            try:
+                self._jobs.submit(key, build_report, dumps(snapshot), self.path(key), self._progress_path(key))
+            except BrokenProcessPool:
+                self._jobs.fail(key)
+        return key
+
+    def status(self, key):
+        if self._jobs.running(key):
+            return BUILDING
+        if self._jobs.failed(key):
+            return FAILED
+        return READY if os.path.exists(self.path(key)) else MISSING
+
+    def progress(self, key):
+        """Fraction done for a report: 1.0 once ready, 0.0 until the worker reports in."""
+        status = self.status(key)
+        if status == READY:
+            return 1.0
+        if status != BUILDING:
+            return 0.0
+        try:
+            with open(self._progress_path(key), encoding="utf-8") as f:
+                return float(f.read() or 0)
+        except (OSError, ValueError):
+            return 0.0
+
+    def read(self, key):
+        with open(self.path(key), "rb") as f:
+            return f.read()
+
+    def pending(self):
+        """Reports queued or being built."""
+        return len(self._jobs)
+
+    def _prune(self):
+        reports = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".pdf")]
+        if len(reports) <= self.cache_size:
+            return
+        reports.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in reports[:len(reports) - self.cache_size]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def shutdown(self):
+        self._jobs.shutdown()
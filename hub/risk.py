@@ -0,0 +1,198 @@
+"""Wellbeing risk scoring across mental-health check-ins.
+
+Check-ins are encoded as small integer codes (0 = best, 4 = worst) and the
+most recent `window` check-ins of every user are laid out as one padded
+(users x window) matrix per answer. Every signal is then a handful of numpy
+reductions over that matrix, so a batch over millions of check-ins runs in
+seconds. A new submission rescores only its own user's window.
+
+The batch reloads every family's check-ins from `source`, e.g. a scan of
+the event store, so families who have not visited since a restart are
+scored too. Only the last `window` check-ins per family are kept in memory.
+Archived check-ins are not read: archiving keeps the newest 20 records
+live, more than a window.
+
+Signals:
+- sustained stress: share of recent check-ins at High/Very High stress
+- mood trend: least-squares slope of mood across the window (worsening > 0)
+- poor sleep streak: consecutive Poor/Very Poor sleep up to the latest check-in
+- falling support: slope of "Feeling Supported" plus feeling unsupported now
+"""
+
+import logging
+import threading
+import time
+from datetime import date
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+SCALES = {
+    "stress_level": ["Very Low", "Low", "Moderate", "High", "Very High"],
+    "mood": ["Very Good", "Good", "Neutral", "Low", "Very Low"],
+    "sleep_quality": ["Excellent", "Good", "Fair", "Poor", "Very Poor"],
+    "support_feeling": ["Very Supported", "Supported", "Neutral", "Unsupported", "Very Unsupported"],
+}
+FIELDS = list(SCALES)
+_CODES = {field: {label: code for code, label in enumerate(scale)} for field, scale in SCALES.items()}
+
+WEIGHTS = {"sustained_stress": 0.35, "mood_trend": 0.25, "poor_sleep": 0.2, "falling_support": 0.2}
+LEVELS = [(0.6, "High"), (0.3, "Elevated"), (0.0, "Low")]
+
+# A code of 3 or more is High stress / Low mood / Poor sleep / Unsupported
+WORSE = 3
+SLEEP_STREAK_CAP = 4
+
+
+def encode(check):
+    """Return the (day ordinal, codes) row for one check-in dict."""
+    day = check["date"]
+    day = day.toordinal() if isinstance(day, date) else date.fromisoformat(str(day)).toordinal()
+    return day, tuple(_CODES[field].get(check.get(field), 2) for field in FIELDS)
+
+
+def _slope(values, valid, x):
+    n = valid.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+    xm = (x * valid).sum(axis=1) / safe_n
+    ym = np.where(valid, values, 0).sum(axis=1) / safe_n
+    dx = np.where(valid, x - xm[:, None], 0)
+    dy = np.where(valid, values - ym[:, None], 0)
+    var = (dx * dx).sum(axis=1)
+    return np.where(var > 0, (dx * dy).sum(axis=1) / np.where(var > 0, var, 1), 0.0)
+
+
+def score_matrix(users, days, codes, window=8):
+    """Score every user from flat check-in arrays.
+
+    `users` holds integer user indexes, `days` date ordinals and `codes` an
+    (n, 4) array in FIELDS order. Returns (user indexes, components dict,
+    scores) with one entry per distinct user.
+    """
+    users = np.asarray(users)
+    days = np.asarray(days)
+    codes = np.asarray(codes, dtype=np.float32).reshape(-1, len(FIELDS))
+    if not len(users):
+        return users, {name: np.zeros(0) for name in WEIGHTS}, np.zeros(0)
+
+    order = np.lexsort((days, users))
+    users, codes = users[order], codes[order]
+    distinct, user_rows, counts = np.unique(users, return_inverse=True, return_counts=True)
+    ends = np.cumsum(counts)
+    from_end = ends[user_rows] - 1 - np.arange(len(users))
+    keep = from_end < window
+
+    matrix = np.full((len(distinct), window, len(FIELDS)), np.nan, dtype=np.float32)
+    matrix[user_rows[keep], window - 1 - from_end[keep]] = codes[keep]
+    valid = ~np.isnan(matrix[:, :, 0])
+    x = np.arange(window, dtype=np.float32)[None, :]
+    stress, mood, sleep, support = (matrix[:, :, i] for i in range(len(FIELDS)))
+
+    with np.errstate(invalid="ignore"):
+        high_stress = (stress >= WORSE) & valid
+        poor_sleep = (sleep >= WORSE) & valid
+    sustained_stress = high_stress.sum(axis=1) / np.maximum(valid.sum(axis=1), 1)
+    mood_trend = np.clip(_slope(mood, valid, x), 0, 1)
+    # Latest check-in sits in the last column, so a streak is a run of
+    # poor nights read right to left
+    sleep_streak = np.cumprod(poor_sleep[:, ::-1], axis=1).sum(axis=1)
+    poor_sleep_score = np.minimum(sleep_streak / SLEEP_STREAK_CAP, 1)
+    unsupported_now = support[:, -1] >= WORSE
+    falling_support = np.clip(np.clip(_slope(support, valid, x), 0, 1) + 0.5 * unsupported_now, 0, 1)
+
+    components = {
+        "sustained_stress": sustained_stress,
+        "mood_trend": mood_trend,
+        "poor_sleep": poor_sleep_score,
+        "falling_support": falling_support,
+    }
+    scores = sum(WEIGHTS[name] * values for name, values in components.items())
+    return distinct, components, scores
+
+
+def level(score):
+    return next(label for threshold, label in LEVELS if score >= threshold)
+
+
+class RiskModel:
+    """Per-user check-in history with batch and incremental risk scores.
+
+    `source()` yields (user_id, check-ins) for every family; rebuild()
+    reloads the history from it.
+    """
+
+    def __init__(self, window=8, source=None):
+        self.window = window
+        self.source = source
+        self._history = {}
+        self._scores = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def update(self, user_id, check):
+        """Record one check-in and rescore only that user."""
+        with self._lock:
+            rows = self._history.get(user_id, []) + [encode(check)]
+            recent = self._history[user_id] = sorted(rows)[-self.window:]
+        days = [day for day, _ in recent]
+        codes = [row for _, row in recent]
+        _, components, scores = score_matrix(np.zeros(len(recent), dtype=np.int64), days, codes, self.window)
+        result = self._result(scores[0], {name: values[0] for name, values in components.items()})
+        with self._lock:
+            self._scores[user_id] = result
+        return result
+
+    def rebuild(self):
+        """Reload every user's check-ins from the source, then rescore them in one vectorized pass."""
+        if self.source is not None:
+            loaded = {}
+            for user_id, checks in self.source():
+                if checks:
+                    loaded[user_id] = sorted(encode(check) for check in checks)[-self.window:]
+            with self._lock:
+                self._history.update(loaded)
+        with self._lock:
+            user_ids = list(self._history)
+            histories = [self._history[user_id] for user_id in user_ids]
+        counts = [len(rows) for rows in histories]
+        users = np.repeat(np.arange(len(user_ids)), counts)
+        flat = [row for rows in histories for row in rows]
+        days = np.fromiter((day for day, _ in flat), dtype=np.int64, count=len(flat))
+        codes = np.array([row for _, row in flat], dtype=np.int8).reshape(-1, len(FIELDS))
+        distinct, components, scores = score_matrix(users, days, codes, self.window)
+        rescored = {
+            user_ids[u]: self._result(scores[k], {name: values[k] for name, values in components.items()})
+            for k, u in enumerate(distinct)
+        }
+        with self._lock:
+            self._scores.update(rescored)
+        return rescored
+
+    def score(self, user_id):
+        return self._scores.get(user_id)
+
+    def start_periodic(self, interval=3600):
+        """Run rebuild() now and then every `interval` seconds on a daemon thread."""
+        if self._thread is None:
+            def loop():
+                while True:
+                    try:
+                        self.rebuild()
+                    except Exception:
+                        # Keep serving the last good scores and try again next interval
+                        log.exception("risk model rebuild failed")
+                    time.sleep(interval)
+            self._thread = threading.Thread(target=loop, name="risk-rebuild", daemon=True)
+            self._thread.start()
+        return self
+
+    @staticmethod
+    def _result(score, components):
+        score = float(score)
+        return {
+            "score": round(score, 3),
+            "level": level(score),
+            "components": {name: round(float(value), 3) for name, value in components.items()},
+            "scored_at": time.time(),
+        }
@@ -0,0 +1,325 @@
+"""Periodic community rollup: anonymized summaries across every family.
+
+A background job scans the event store BATCH_SIZE families at a time. Each
+batch is flattened into column lists and loaded as one pandas DataFrame.
+It is reduced to partial aggregates with groupby and discarded, so memory
+stays at one batch however many families there are. Every family falls in
+exactly one batch, so partial distinct-family counts simply add up.
+
+The job materializes three small tables:
+
+    milestone_mix   milestones by type per census region and child age band,
+                    each also rolled up to "All"
+    engagement      milestones, celebrations and share celebrated per month
+    wellbeing       average 1-5 check-in scores per month
+
+k-anonymity: a row survives only if at least K_ANONYMITY distinct families
+contribute to it, so no summary describes an identifiable family. Families
+who turned off public_milestones are left out entirely, and so is every
+milestone that was not shared publicly. An "All" row is the sum of the rows
+it rolls up. If one of those is suppressed, the All row is suppressed too,
+because otherwise the hidden count is the total minus the published ones.
+Shares are worked out over the published rows only, for the same reason.
+
+Tables are written as Parquet when pyarrow is installed, and as CSV
+otherwise, next to a manifest.json naming the files. Each file is written
+to a temporary name and renamed. The manifest goes last, so readers see
+either the previous rollup or the new one. The page only ever reads these
+summaries. They are cached against the manifest's mtime, so a rerun costs
+one stat() call.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+
+from hub import DATA_DIR
+from hub.matching import age_band
+from hub.moderation import HELD, REJECTED
+from hub.places import state_of
+from hub.reports import WELLBEING_SCALES
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET = True
+except ImportError:
+    PARQUET = False
+
+K_ANONYMITY = 5
+BATCH_SIZE = 500
+MONTHS = 24
+ALL = "All"
+UNKNOWN = "Unknown"
+
+TABLES = ("milestone_mix", "engagement", "wellbeing")
+
+CENSUS_REGIONS = {
+    "Northeast": "CT ME MA NH RI VT NJ NY PA",
+    "Midwest": "IL IN MI OH WI IA KS MN MO NE ND SD",
+    "South": "DE DC FL GA MD NC SC VA WV AL KY MS TN AR LA OK TX",
+    "West": "AZ CO ID MT NV NM UT WY AK CA HI OR WA",
+}
+REGION_OF_STATE = {state: region for region, states in CENSUS_REGIONS.items() for state in states.split()}
+
+SCORED = ("stress_level", "mood", "sleep_quality", "support_feeling")
+
+# Written even when a table is empty, so a header-only CSV reads back with its columns
+COLUMNS = {
+    "milestone_mix": ["region", "age_band", "type", "milestones", "families", "share"],
+    "engagement": ["month", "milestones", "celebrations", "families", "celebrations_per_milestone",
+                   "share_celebrated"],
+    "wellbeing": ["month", "checkins", "families", *SCORED],
+}
+
+log = logging.getLogger(__name__)
+
+
+def region_of(profile):
+    return REGION_OF_STATE.get(state_of(profile.get("location")) or "", UNKNOWN)
+
+
+def _ages(text):
+    return [int(a or b) for a, b in re.findall(r"\((\d{1,2})\)|\b(\d{1,2})\s*(?:yo\b|y/o|years?)", text or "")]
+
+
+def child_band(milestone, profile):
+    """Age band of the child a milestone is about, from the milestone or an only child's profile age."""
+    found = re.search(r"\d{1,2}", str(milestone.get("child_age") or ""))
+    if found:
+        return age_band(int(found.group()))
+    ages = _ages((profile.get("children_info") or "").lower())
+    return age_band(ages[0]) if len(ages) == 1 else UNKNOWN
+
+
+def _month(day):
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def _since(today, months=MONTHS):
+    index = today.year * 12 + today.month - 1 - (months - 1)
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _columns(families, archive, since):
+    """Flatten a batch of (user_id, state) into milestone and check-in columns."""
+    milestones = {"family": [], "region": [], "age_band": [], "type": [], "month": [], "celebrations": []}
+    checks = {"family": [], "month": [], **{field: [] for field in SCORED}}
+    for user_id, state in families:
+        profile = state["user_profile"]
+        region = region_of(profile)
+        shares, checkins = state["milestone_shares"], state["mental_health_checks"]
+        if archive is not None:
+            shares = shares + archive.history(user_id, "milestone_shares")
+            checkins = checkins + archive.history(user_id, "mental_health_checks")
+        for milestone in shares:
+            if not milestone.get("public") or milestone.get("moderation") in (HELD, REJECTED):
+                continue
+            milestones["family"].append(user_id)
+            milestones["region"].append(region)
+            milestones["age_band"].append(child_band(milestone, profile))
+            milestones["type"].append(milestone["type"])
+            milestones["month"].append(_month(milestone["date"]))
+            milestones["celebrations"].append(milestone.get("celebrations", 0))
+        for check in checkins:
+            if _month(check["date"]) < since:
+                continue
+            checks["family"].append(user_id)
+            checks["month"].append(_month(check["date"]))
+            for field in SCORED:
+                levels = WELLBEING_SCALES[field][1]
+                checks[field].append(levels.index(check[field]) + 1 if check.get(field) in levels else None)
+    return pd.DataFrame(milestones), pd.DataFrame(checks)
+
+
+def _partials(milestones, checks, since):
+    """Additive partial aggregates for one batch."""
+    mix = pd.concat([milestones, milestones.assign(region=ALL), milestones.assign(age_band=ALL),
+                     milestones.assign(region=ALL, age_band=ALL)])
+    mix = mix.groupby(["region", "age_band", "type"]).agg(
+        milestones=("family", "size"), families=("family", "nunique"))
+
+    # An empty batch has float columns, which can't be compared with a month string
+    recent = milestones[milestones["month"] >= since] if len(milestones) else milestones
+    engagement = recent.assign(celebrated=recent["celebrations"] > 0).groupby("month").agg(
+        milestones=("family", "size"), celebrations=("celebrations", "sum"),
+        celebrated=("celebrated", "sum"), families=("family", "nunique"))
+
+    scores = {f"{field}_sum": (field, "sum") for field in SCORED}
+    scores.update({f"{field}_n": (field, "count") for field in SCORED})
+    wellbeing = checks.groupby("month").agg(checkins=("family", "size"), families=("family", "nunique"), **scores)
+    return mix, engagement, wellbeing
+
+
+def _combine(parts):
+    parts = [part for part in parts if not part.empty]
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat(parts).groupby(level=list(range(parts[0].index.nlevels))).sum()
+
+
+def _suppressed(mix, k):
+    """Rows below k, plus every All row that rolls up a suppressed row."""
+    hidden = mix["families"] < k
+    while True:
+        before = hidden
+        for dimension, other in (("region", "age_band"), ("age_band", "region")):
+            parts = hidden & (mix[dimension] != ALL)
+            covers = parts.groupby([mix[other], mix["type"]]).transform("any")
+            hidden = hidden | ((mix[dimension] == ALL) & covers)
+        if hidden.equals(before):
+            return hidden
+
+
+def summarize(families, archive=None, k=K_ANONYMITY, batch_size=BATCH_SIZE, today=None):
+    """Build the summary tables from an iterable of (user_id, state)."""
+    since = _since(today or date.today())
+    mixes, engagements, wellbeings = [], [], []
+    counted = 0
+    batch = []
+
+    def flush():
+        if batch:
+            for parts, part in zip((mixes, engagements, wellbeings), _partials(*_columns(batch, archive, since), since)):
+                parts.append(part)
+            batch.clear()
+
+    for user_id, state in families:
+        if not state["user_profile"].get("public_milestones", True):
+            continue
+        counted += 1
+        batch.append((user_id, state))
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    mix = _combine(mixes)
+    if not mix.empty:
+        mix = mix.reset_index()
+        mix = mix[~_suppressed(mix, k)]
+        totals = mix.groupby(["region", "age_band"])["milestones"].transform("sum")
+        mix["share"] = (mix["milestones"] / totals).round(3)
+        mix = mix.sort_values(["region", "age_band", "milestones"], ascending=[True, True, False])
+
+    engagement = _combine(engagements)
+    if not engagement.empty:
+        engagement = engagement.reset_index()
+        engagement = engagement[engagement["families"] >= k]
+        engagement["celebrations_per_milestone"] = (engagement["celebrations"] / engagement["milestones"]).round(2)
+        engagement["share_celebrated"] = (engagement["celebrated"] / engagement["milestones"]).round(3)
+
+    wellbeing = _combine(wellbeings)
+    if not wellbeing.empty:
+        wellbeing = wellbeing.reset_index()
+        wellbeing = wellbeing[wellbeing["families"] >= k]
+        for field in SCORED:
+            counts = wellbeing.pop(f"{field}_n")
+            wellbeing[field] = (wellbeing.pop(f"{field}_sum") / counts.where(counts > 0)).round(2)
+
+    tables = {"milestone_mix": mix, "engagement": engagement, "wellbeing": wellbeing}
+    for name, table in tables.items():
+        table = table.drop(columns=["celebrated"], errors="ignore").reset_index(drop=True)
+        tables[name] = pd.DataFrame(columns=COLUMNS[name]) if table.empty else table
+    return tables, counted
+
+
+def _write(table, path):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    if PARQUET:
+        table.to_parquet(tmp, index=False)
+    else:
+        table.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def read_summaries(directory):
+    """The latest rollup as {"tables": {name: DataFrame}, "generated", "families", "k"}, or None."""
+    manifest_path = os.path.join(directory, "manifest.json")
+    try:
+        mtime = os.stat(manifest_path).st_mtime_ns
+    except OSError:
+        return None
+    with _cache_lock:
+        cached = _cache.get(directory)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    tables = {}
+    for name, filename in manifest["tables"].items():
+        path = os.path.join(directory, filename)
+        try:
+            tables[name] = pd.read_parquet(path) if filename.endswith(".parquet") else pd.read_csv(path)
+        except pd.errors.EmptyDataError:
+            # Written by an older rollup without a header
+            tables[name] = pd.DataFrame(columns=COLUMNS[name])
+    summaries = dict(manifest, tables=tables)
+    with _cache_lock:
+        _cache[directory] = (mtime, summaries)
+    return summaries
+
+
+class CommunityRollup:
+    """Scheduled rollup of the event store into anonymized summary tables."""
+
+    def __init__(self, store, archive=None, directory=None, k=K_ANONYMITY, batch_size=BATCH_SIZE):
+        self.store = store
+        self.archive = archive
+        self.directory = directory or os.path.join(DATA_DIR, "rollup")
+        self.k = k
+        self.batch_size = batch_size
+        self._thread = None
+        self._running = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _families(self):
+        for user_id in self.store.users():
+            try:
+                yield user_id, self.store.peek(user_id)
+            except (OSError, ValueError):
+                continue
+
+    def run(self):
+        """Recompute and publish every summary table; returns the number of families counted."""
+        with self._running:
+            started = time.time()
+            tables, counted = summarize(self._families(), self.archive, self.k, self.batch_size)
+            extension = "parquet" if PARQUET else "csv"
+            files = {}
+            for name in TABLES:
+                files[name] = f"{name}.{extension}"
+                _write(tables[name], os.path.join(self.directory, files[name]))
+            manifest = {"generated": time.time(), "seconds": round(time.time() - started, 2),
+                        "families": counted, "k": self.k, "tables": files}
+            tmp = os.path.join(self.directory, f"manifest.json.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(tmp, os.path.join(self.directory, "manifest.json"))
+            return counted
+
+    def summaries(self):
+        return read_summaries(self.directory)
+
+    def start_periodic(self, interval=3600):
+        """Run run() now and then every `interval` seconds on a daemon thread."""
+        if self._thread is None:
+            def loop():
+                while True:
+                    try:
+                        self.run()
+                    except Exception:
+                        # A failed rollup leaves the previous summaries in place
+                        log.exception("community rollup failed")
+                    time.sleep(interval)
+            self._thread = threading.Thread(target=loop, name="community-rollup", daemon=True)
+            self._thread.start()
+        return self
@@ -0,0 +1,232 @@
+"""Safety screening of free text with a compiled multi-pattern matcher.
+
+All curated phrases are compiled once into a single Aho-Corasick automaton,
+so screening a submission is one pass over its text no matter how many
+phrases we watch for. Text and phrases go through the same normalization
+(case, apostrophes, punctuation, leetspeak, repeated letters), which lets
+one phrase also match its common fuzzy spellings. Phrases only match on
+whole-word boundaries.
+
+Phrases are written to be specific: "my son is missing", not "is missing",
+which would also catch a lost tooth. A match shortly after a negation ("he
+did not give up", "she never went missing") is not counted as a flag. It is
+kept in `negated` so the caller can ask a person to look, instead of showing
+crisis resources. Self-harm phrases are never negated: "I don't want to die
+anymore, but..." still gets the lifeline.
+"""
+
+import re
+from collections import deque
+
+SELF_HARM = "self_harm"
+HARM_TO_OTHERS = "harm_to_others"
+ABUSE = "abuse"
+MEDICAL = "medical_emergency"
+MISSING_CHILD = "missing_child"
+DISTRESS = "distress"
+PII = "personal_info"
+
+PHRASES = {
+    SELF_HARM: [
+        "kill myself", "killing myself", "end my life", "end it all", "want to die",
+        "wish i was dead", "wish i were dead", "better off dead", "better off without me",
+        "suicide", "suicidal", "self harm", "selfharm", "hurt myself", "hurting myself",
+        "cut myself", "cutting myself", "no reason to live", "take my own life",
+        "not worth living", "overdose on",
+    ],
+    HARM_TO_OTHERS: [
+        "hurt my child", "hurt my son", "hurt my daughter", "hurt my kid", "hurt the baby",
+        "shake the baby", "shook the baby", "hit my child", "kill him", "kill her",
+        "kill them", "going to snap and hurt", "afraid i will hurt", "afraid i'll hurt",
+    ],
+    ABUSE: [
+        "being abused", "abusing me", "abusing my", "sexually abused", "molested",
+        "hits me", "beats me", "beat my child", "touched inappropriately", "not safe at home",
+    ],
+    MEDICAL: [
+        "not breathing", "stopped breathing", "can't breathe", "turning blue", "unresponsive",
+        "unconscious", "seizure won't stop", "seizure that won't stop", "seizing for",
+        "swallowed pills", "took too many pills", "overdosed", "ate something poisonous",
+    ],
+    MISSING_CHILD: [
+        f"{child} {went}"
+        for child in ("my son", "my daughter", "my child", "my kid", "our son", "our daughter", "our child",
+                      "our kid")
+        for went in ("is missing", "went missing", "has gone missing", "wandered off", "ran away", "has run away",
+                     "eloped")
+    ] + [
+        "can't find my son", "can't find my daughter", "can't find my child", "can't find my kid",
+        "ran away from home", "run away from home", "missing child",
+    ],
+    DISTRESS: [
+        "can't go on", "cannot go on", "can't cope", "cannot cope", "can't do this anymore",
+        "breaking point", "i'm falling apart", "i am falling apart", "everything is falling apart",
+        "i give up", "i'm giving up", "i am giving up", "want to give up", "giving up on everything",
+        "hopeless", "no way out", "completely alone", "nobody cares",
+    ],
+    PII: [
+        "my address is", "we live at", "my phone number is", "my number is", "call me at",
+        "social security number", "ssn", "date of birth", "my email is",
+    ],
+}
+
+# Checked against the raw text, since normalization folds away digits and symbols
+PII_PATTERNS = [
+    re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
+    re.compile(r"(?:\+?1[\s.-]?)?\(?\b\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b"),
+    re.compile(r"\b[\w.+-]+@[\w-]+\.[\w.-]+\b"),
+    re.compile(r"\b\d{1,5}\s+\w+(?:\s+\w+)?\s+(?:st|street|ave|avenue|rd|road|blvd|dr|drive|ln|lane|ct|court)\b",
+               re.IGNORECASE),
+]
+
+# A match within NEGATION_WINDOW words after one of these is negated
+NEGATIONS = {"not", "no", "never", "didnt", "dont", "doesnt", "isnt", "wasnt", "hasnt", "havent", "wont",
+             "cant", "cannot", "nobody"}
+NEGATION_WINDOW = 2
+NEVER_NEGATED = {SELF_HARM}
+
+# Categories that call for crisis resources straight away
+URGENT = {SELF_HARM, HARM_TO_OTHERS, ABUSE, MEDICAL, MISSING_CHILD}
+
+CRISIS_RESOURCES = {
+    SELF_HARM: ["☎️ Call or text **988** - Suicide & Crisis Lifeline (24/7)",
+                "📱 Text **HOME** to **741741** - Crisis Text Line"],
+    HARM_TO_OTHERS: ["🚨 If anyone is in immediate danger, call **911**",
+                     "☎️ Call or text **988** for support right now",
+                     "📞 National Child Abuse Hotline: **1-800-422-4453** (24/7 parent support too)"],
+    ABUSE: ["🚨 If anyone is in immediate danger, call **911**",
+            "📞 National Child Abuse Hotline: **1-800-422-4453**"],
+    MEDICAL: ["🚨 Call **911** now",
+              "☠️ Poison Control: **1-800-222-1222**"],
+    MISSING_CHILD: ["🚨 Call **911** immediately - do not wait to report a missing child",
+                    "📋 Give responders a recent photo and your child's communication needs"],
+    DISTRESS: ["☎️ Call or text **988** - you don't have to be suicidal to reach out",
+               "📞 NAMI Helpline: **1-800-950-6264**"],
+}
+
+_LEET = str.maketrans({"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "@": "a", "$": "s"})
+_APOSTROPHES = re.compile(r"['’`]")
+_NON_WORD = re.compile(r"[^a-z]+")
+_REPEATED = re.compile(r"([a-z])\1+")
+
+
+def normalize(text):
+    """Fold text to lowercase words separated by single spaces, padded."""
+    text = _APOSTROPHES.sub("", text.lower()).translate(_LEET)
+    # Squeeze repeated letters so "diiiie" and "die", "kil" and "kill" agree
+    text = _REPEATED.sub(r"\1", _NON_WORD.sub(" ", text))
+    return f" {' '.join(text.split())} "
+
+
+class AhoCorasick:
+    """Multi-pattern matcher; reports every (start, end, value) occurrence."""
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for pattern, value in patterns:
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pattern), value))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def finditer(self, text):
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, value in out[node]:
+                yield end - length, end, value
+
+
+class ScreeningResult:
+    def __init__(self, matches, negated=()):
+        self.matches = matches
+        self.negated = list(negated)
+        self.categories = {category for category, _ in matches}
+
+    @property
+    def urgent(self):
+        return bool(self.categories & URGENT)
+
+    @property
+    def flagged(self):
+        return bool(self.categories)
+
+    @property
+    def needs_review(self):
+        """Only negated phrases matched: worth a person's look, not a crisis banner."""
+        return bool(self.negated) and not self.flagged
+
+    def resources(self, catalog=CRISIS_RESOURCES):
+        """Crisis resources for the matched categories, most urgent first.
+
+        `catalog` maps categories to resource lines, e.g. a translated copy
+        of CRISIS_RESOURCES.
+        """
+        lines = []
+        for category in (MEDICAL, MISSING_CHILD, HARM_TO_OTHERS, ABUSE, SELF_HARM, DISTRESS):
+            if category in self.categories:
+                lines.extend(line for line in catalog.get(category, CRISIS_RESOURCES[category])
+                             if line not in lines)
+        return lines
+
+
+class Screener:
+    def __init__(self, phrases=PHRASES, pii_patterns=PII_PATTERNS):
+        patterns = {}
+        for category, phrase_list in phrases.items():
+            for phrase in phrase_list:
+                # Word boundaries are the padding spaces normalize() adds
+                patterns.setdefault(normalize(phrase), (category, phrase))
+        self._matcher = AhoCorasick(patterns.items())
+        self._pii_patterns = pii_patterns
+
+    def screen(self, text):
+        if not text:
+            return ScreeningResult([])
+        normalized = normalize(text)
+        matches, negated = [], []
+        for start, _, value in self._matcher.finditer(normalized):
+            if value[0] not in NEVER_NEGATED and NEGATIONS.intersection(
+                    normalized[:start].split()[-NEGATION_WINDOW:]):
+                negated.append(value)
+            else:
+                matches.append(value)
+        for pattern in self._pii_patterns:
+            found = pattern.search(text)
+            if found:
+                matches.append((PII, found.group(0)))
+        return ScreeningResult(matches, negated)
+
+
+_screener = None
+
+
+def screen(text):
+    """Screen `text` with the shared, lazily compiled default screener."""
+    global _screener
+    if _screener is None:
+        _screener = Screener()
+    return _screener.screen(text)
@@ -0,0 +1,181 @@
+"""Prefix suggestions and unified search over the Resources & Forms catalog.
+
+Resource titles, topics, template names and external link names are all
+indexed in one prefix trie. Every word of a label is inserted, so "sens"
+finds "Autism Sensory Strategies" as well as the "Sensory Processing"
+topic. Each trie node keeps its own top-k entries by popularity, worked
+out while the trie is built, so a suggestion lookup is one walk down the
+typed prefix with no ranking at query time.
+
+The page's search box is a text input, which submits on Enter or blur,
+not per keystroke. Suggestions are shown under a submitted query, so a
+partial word like "sens" offers the complete titles it could mean.
+
+The index is immutable. catalog_version() fingerprints the catalog, and
+callers build one index per version and language and reuse it for every
+query and rerun.
+"""
+
+import hashlib
+import json
+import re
+
+RESOURCE = "resource"
+TOPIC = "topic"
+TEMPLATE = "template"
+LINK = "link"
+
+KIND_ICONS = {RESOURCE: "📄", TOPIC: "🏷️", TEMPLATE: "📋", LINK: "🔗"}
+
+# Templates and links carry no ratings, so they rank on a flat baseline
+# below well-rated resources and well-covered topics
+BASE_POPULARITY = {TEMPLATE: 3.0, LINK: 2.5}
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def words(text):
+    return _WORD.findall(text.casefold())
+
+
+def catalog_version(resources, template_categories, external_links):
+    """Short fingerprint that changes whenever any catalog entry changes."""
+    payload = json.dumps([resources, template_categories, external_links], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class _Node:
+    __slots__ = ("children", "top", "ends")
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+        self.ends = []
+
+
+class PrefixTrie:
+    """Character trie whose nodes each keep the top-k entry ids beneath them."""
+
+    def __init__(self, k=10):
+        self.k = k
+        self.root = _Node()
+
+    def insert(self, word, entry_id, popularity):
+        node = self.root
+        for char in word:
+            node = node.children.setdefault(char, _Node())
+            self._offer(node, entry_id, popularity)
+        if entry_id not in node.ends:
+            node.ends.append(entry_id)
+
+    def _offer(self, node, entry_id, popularity):
+        top = node.top
+        if any(existing == entry_id for _, existing in top):
+            return
+        if len(top) == self.k and popularity <= top[-1][0]:
+            return
+        top.append((popularity, entry_id))
+        top.sort(key=lambda item: -item[0])
+        del top[self.k:]
+
+    def find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def top(self, prefix):
+        """Most popular entry ids under a prefix, best first."""
+        node = self.find(prefix)
+        return [entry_id for _, entry_id in node.top] if node else []
+
+    def all_ids(self, prefix):
+        """Every entry id with a word starting with the prefix."""
+        node = self.find(prefix)
+        ids, stack = set(), [node] if node else []
+        while stack:
+            node = stack.pop()
+            if len(node.top) < self.k:
+                # Nothing was ever cut from this node, so it is complete
+                ids.update(entry_id for _, entry_id in node.top)
+            else:
+                ids.update(node.ends)
+                stack.extend(node.children.values())
+        return ids
+
+
+class SearchIndex:
+    """Suggestions and grouped results across resources, topics, templates and links.
+
+    `label(kind, key)` returns the display label in another language and
+    `describe(resource)` a resource's translated description. Both the
+    original and the translated text are indexed, so a search matches either.
+    """
+
+    def __init__(self, resources, template_categories, external_links, label=None, describe=None, k=10):
+        self.entries = []
+        self.trie = PrefixTrie(k)
+        label = label or (lambda kind, key: key)
+        describe = describe or (lambda resource: resource["description"])
+
+        topic_popularity = {}
+        for resource in resources:
+            for topic in resource["topics"]:
+                topic_popularity[topic] = topic_popularity.get(topic, 0.0) + resource["rating"]
+            self._add(RESOURCE, resource["title"], label(RESOURCE, resource["title"]),
+                      resource["rating"], resource,
+                      extra=(resource["description"], describe(resource)))
+        for topic, popularity in topic_popularity.items():
+            self._add(TOPIC, topic, topic, popularity, topic)
+        for category, templates in template_categories.items():
+            for template in templates:
+                self._add(TEMPLATE, template, label(TEMPLATE, template),
+                          BASE_POPULARITY[TEMPLATE], {"name": template, "category": category})
+        for category, links in external_links.items():
+            for link in links:
+                self._add(LINK, link["name"], link["name"], BASE_POPULARITY[LINK],
+                          dict(link, category=category))
+
+    def _add(self, kind, key, label, popularity, item, extra=()):
+        entry_id = len(self.entries)
+        self.entries.append({"kind": kind, "key": key, "label": label,
+                             "popularity": popularity, "item": item})
+        indexed = set(words(key)) | set(words(label))
+        for text in extra:
+            indexed.update(words(text))
+        for word in indexed:
+            self.trie.insert(word, entry_id, popularity)
+
+    def suggest(self, query, limit=8):
+        """Top entries for a partly typed query, most popular first."""
+        terms = words(query)
+        if not terms:
+            return []
+        if len(terms) == 1:
+            return [self.entries[entry_id] for entry_id in self.trie.top(terms[0])[:limit]]
+        return self._ranked(self._matching(terms))[:limit]
+
+    def search(self, query):
+        """Every match for a query, grouped by kind, or None for an empty query."""
+        terms = words(query)
+        if not terms:
+            return None
+        results = {RESOURCE: [], TOPIC: [], TEMPLATE: [], LINK: []}
+        for entry in self._ranked(self._matching(terms)):
+            results[entry["kind"]].append(entry)
+        return results
+
+    def _matching(self, terms):
+        # Each term is a prefix of some word in the label, in any order
+        ids = self.trie.all_ids(terms[0])
+        for term in terms[1:]:
+            if not ids:
+                break
+            ids &= self.trie.all_ids(term)
+        return ids
+
+    def _ranked(self, ids):
+        return sorted((self.entries[entry_id] for entry_id in ids),
+                      key=lambda entry: (-entry["popularity"], entry["label"]))
@@ -0,0 +1,84 @@
+"""Keyed jobs run in a process pool shared by the photo and report builders.
+
+The pool is started on first use with the spawn start method, so workers
+never inherit the Streamlit server's threads or locks. Each job runs under
+a key, e.g. a content hash. A key already queued is not submitted twice,
+and a key whose job raised stays failed until it is submitted again.
+
+Completion callbacks are registered only after the lock is released,
+because a future that is already done runs its callback on the spot.
+
+If a worker dies (killed for memory, a crashing image decoder), the pool
+is broken for every later submit. The broken pool is replaced, and the job
+is retried once on the new one. If that fails too, BrokenProcessPool is
+raised to the caller.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class ProcessJobs:
+    """Keyed jobs in a lazily started spawn process pool.
+
+    `on_done(key)` is called after each job finishes, outside the lock.
+    """
+
+    def __init__(self, workers=1, on_done=None):
+        self.workers = workers
+        self.on_done = on_done
+        self._pool = None
+        self._jobs = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def submit(self, key, fn, *args):
+        """Queue fn(*args) under `key`; False if that key is already queued."""
+        with self._lock:
+            if key in self._jobs:
+                return False
+            self._failed.discard(key)
+            try:
+                future = self._executor().submit(fn, *args)
+            except BrokenProcessPool:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                future = self._executor().submit(fn, *args)
+            self._jobs[key] = future
+
+        def finished(done):
+            with self._lock:
+                if self._jobs.get(key) is done:
+                    del self._jobs[key]
+                if done.cancelled() or done.exception() is not None:
+                    self._failed.add(key)
+            if self.on_done is not None:
+                self.on_done(key)
+        future.add_done_callback(finished)
+        return True
+
+    def fail(self, key):
+        """Mark a key failed without running it, e.g. when the pool is unavailable."""
+        with self._lock:
+            self._failed.add(key)
+
+    def running(self, key):
+        return key in self._jobs
+
+    def failed(self, key):
+        return key in self._failed
+
+    def __len__(self):
+        """Jobs queued or running."""
+        return len(self._jobs)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,41 @@
+import time
+
+from hub.alerts import DELIVERED, OUTBOX, QUEUED, Activation, build_recipients
+
+CONTACTS = [
+    {"name": "Dan", "phone": "555-0100"},
+    {"name": "Mom", "phone": "555-0101", "primary": True},
+    {"name": "Dad", "phone": "555-0102"},
+]
+
+
+def names_and_phones(recipients):
+    return [(recipient["name"], recipient["phone"]) for recipient in recipients]
+
+
+def test_contacts_match_whole_names_and_split_on_commas_and_then():
+    recipients, escalation = build_recipients(
+        {"contacts_to_call": "Dana (therapist) 555-222-3333\nMom, then Dad"}, CONTACTS)
+    assert names_and_phones(recipients) == [("Dana (therapist)", "555-222-3333"), ("Mom", "555-0101"),
+                                            ("Dad", "555-0102")]
+    assert [contact["name"] for contact in escalation] == ["Dan"]
+
+
+def test_written_number_wins_over_saved_contact():
+    recipients, _ = build_recipients({"contacts_to_call": "Mom (work) 555-999-0000"}, CONTACTS)
+    assert names_and_phones(recipients) == [("Mom", "555-999-0000")]
+
+
+def test_name_and_number_split_by_a_comma_stay_one_person():
+    recipients, _ = build_recipients({"contacts_to_call": "- Dr. Lee, pediatrician 555-444-1212"}, [])
+    assert names_and_phones(recipients) == [("Dr. Lee, pediatrician", "555-444-1212")]
+
+
+def test_default_sender_only_queues():
+    recipients, _ = build_recipients({"contacts_to_call": "Mom"}, CONTACTS)
+    activation = Activation("Plan", recipients, [], "help").start()
+    deadline = time.time() + 5
+    while not activation.done and time.time() < deadline:
+        time.sleep(0.01)
+    assert activation.counts()[QUEUED] == 1 and activation.counts()[DELIVERED] == 0
+    assert OUTBOX[-1]["to"] == "555-0101"
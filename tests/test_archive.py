@@ -0,0 +1,44 @@
+from datetime import date, timedelta
+
+from hub.archive import Archive
+from hub.events import MILESTONE_CELEBRATED, MILESTONE_SHARED, EventStore
+from hub.feed import FeedHub
+
+TODAY = date(2025, 6, 1)
+
+
+def share_old_milestones(store, count=25):
+    for i in range(count):
+        store.record("family", MILESTONE_SHARED, {"item": {"id": f"m{i}", "text": f"Milestone {i}",
+                                                           "date": date(2024, 1, 1) + timedelta(days=i),
+                                                           "public": True, "celebrations": 0}})
+
+
+def test_rearchiving_after_a_crash_does_not_double_count(tmp_path):
+    store = EventStore(str(tmp_path / "events"))
+    share_old_milestones(store)
+    archive = Archive(str(tmp_path / "archive"))
+    # What a crash between writing the segment and recording ARCHIVED leaves behind
+    cold = sorted(store.load("family")["milestone_shares"], key=lambda item: item["date"])[:5]
+    assert archive.write("family", "milestone_shares", cold) == 5
+
+    assert archive.compact(store, "family", today=TODAY) == 5
+    assert archive.count("family", "milestone_shares") == 5
+    assert len(archive.segment("family", "milestone_shares", "2024-01")) == 5
+    assert len(store.load("family")["milestone_shares"]) == 20
+
+
+def test_milestones_still_in_the_feed_stay_hot(tmp_path):
+    store = EventStore(str(tmp_path / "events"))
+    share_old_milestones(store)
+    hub = FeedHub()
+    for milestone in store.load("family")["milestone_shares"]:
+        hub.share("community", milestone, owner="family")
+    hub.share("community", {"id": "other", "date": TODAY}, owner="neighbour")
+    assert "other" not in hub.shared_by("community", "family")
+
+    archive = Archive(str(tmp_path / "archive"))
+    assert archive.compact(store, "family", today=TODAY, keep={"m0"}) == 4
+    store.record("family", MILESTONE_CELEBRATED, {"id": "m0"})
+    milestones = {item["id"]: item for item in EventStore(str(tmp_path / "events")).load("family")["milestone_shares"]}
+    assert milestones["m0"]["celebrations"] == 1
@@ -0,0 +1,45 @@
+import pytest
+
+from hub.chat import ChatBroker, ChatView
+
+
+def test_view_pulls_only_new_messages():
+    broker = ChatBroker()
+    view = ChatView(broker, "autism")
+    broker.post("autism", "a", "hello", name="Ana")
+    assert view.sync() == 1
+    assert view.sync() == 0
+    broker.post("autism", "b", "  hi there  ")
+    assert view.sync() == 1
+    assert [message["text"] for message in view.messages] == ["hello", "hi there"]
+
+
+def test_slow_reader_is_told_it_missed_messages():
+    broker = ChatBroker(history=3)
+    view = ChatView(broker, "adhd")
+    broker.post("adhd", "a", "first")
+    view.sync()
+    for i in range(5):
+        broker.post("adhd", "a", f"message {i}")
+    messages, missed = broker.fetch("adhd", view.cursor)
+    assert missed and [message["seq"] for message in messages] == [4, 5, 6]
+    view.sync()
+    assert view.missed
+
+
+def test_newcomer_starts_from_the_tail():
+    broker = ChatBroker()
+    for i in range(10):
+        broker.post("iep", "a", f"message {i}")
+    view = ChatView(broker, "iep", keep=3)
+    view.sync()
+    assert [message["seq"] for message in view.messages] == [8, 9, 10]
+    assert not view.missed
+
+
+def test_rejects_empty_messages_and_unknown_rooms():
+    broker = ChatBroker()
+    with pytest.raises(ValueError):
+        broker.post("autism", "a", "   ")
+    with pytest.raises(ValueError):
+        broker.latest("nowhere")
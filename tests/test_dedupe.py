@@ -0,0 +1,40 @@
+import time
+
+from hub.dedupe import REPOST_WINDOW, NearDuplicateIndex, SubmissionKeys, submission_key
+
+TEXT = "Sam slept through the whole night for the first time since spring!"
+
+
+def test_own_post_blocks_a_repost_only_within_the_window():
+    index = NearDuplicateIndex()
+    index.add("old", TEXT, owner="family", at=time.time() - REPOST_WINDOW - 60)
+    assert index.similar(TEXT)
+    assert not index.reposted(TEXT, "family")
+
+    index.add("new", TEXT + " ", owner="family")
+    assert index.reposted("sam slept through the whole night for the first time since spring", "family")
+    assert not index.reposted(TEXT, "neighbour")
+
+
+def test_unrelated_text_is_not_similar():
+    index = NearDuplicateIndex()
+    index.add("m1", TEXT, owner="family")
+    assert index.similar("Mia said her first full sentence at speech therapy today") == []
+
+
+def test_index_evicts_oldest_past_capacity():
+    index = NearDuplicateIndex(capacity=2)
+    for i, text in enumerate(["first post about trains", "second post about buses", "third post about boats"]):
+        index.add(f"m{i}", text, owner="family")
+    assert len(index) == 2
+    assert index.similar("first post about trains") == []
+
+
+def test_submission_keys_claim_once_until_released():
+    keys = SubmissionKeys()
+    key = submission_key("family", "  Slept through the NIGHT! ")
+    assert key == submission_key("family", "slept through the night")
+    assert keys.claim(key)
+    assert not keys.claim(key)
+    keys.release(key)
+    assert keys.claim(key)
@@ -0,0 +1,43 @@
+from datetime import date
+
+from hub.events import MILESTONE_CELEBRATED, MILESTONE_SHARED, UNDONE, EventStore, describe
+from hub.i18n import get_translator
+from hub.feed import FeedHub
+
+
+def test_celebrations_replay_onto_the_owners_milestone(tmp_path):
+    store = EventStore(str(tmp_path), snapshot_every=2)
+    store.record("owner", MILESTONE_SHARED, {"item": {"id": "m1", "text": "First word", "date": date(2024, 5, 1),
+                                                      "public": True, "celebrations": 0}})
+    for _ in range(3):
+        store.record("owner", MILESTONE_CELEBRATED, {"id": "m1"})
+    assert EventStore(str(tmp_path)).load("owner")["milestone_shares"][0]["celebrations"] == 3
+
+
+def test_feed_keeps_owner_out_of_items():
+    hub = FeedHub()
+    hub.share("community", {"id": "m1", "date": date(2024, 5, 1)}, owner="family")
+    assert hub.owner("community", "m1") == "family"
+    assert "family" not in str(hub.snapshot("community"))
+    hub.retract("community", "m1")
+    assert hub.owner("community", "m1") is None
+
+
+def test_peek_never_truncates_the_log(tmp_path):
+    store = EventStore(str(tmp_path))
+    store.record("family", MILESTONE_CELEBRATED, {"id": "m1"})
+    log = tmp_path / "family.jsonl"
+    # What a concurrent writer's half-finished append looks like
+    with open(log, "ab") as f:
+        f.write(b'{"s":2,')
+    size = log.stat().st_size
+    assert EventStore(str(tmp_path)).peek("family")["seq"] == 1
+    assert log.stat().st_size == size
+
+
+def test_describe_uses_translated_labels():
+    t = get_translator("Spanish")
+    undone = {"k": UNDONE, "d": {"of": MILESTONE_SHARED}}
+    assert describe({"k": MILESTONE_SHARED, "d": {}}, t.section("profile.events")) == "Compartiste un logro"
+    assert describe(undone, t.section("profile.events"), t("profile.undid")) == "Deshecho: Compartiste un logro"
+    assert describe(undone) == "Undid: Shared a milestone"
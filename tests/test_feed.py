@@ -0,0 +1,30 @@
+from datetime import date
+
+from hub.feed import FeedHub, FeedView
+
+
+def milestone(n):
+    return {"id": f"m{n}", "text": f"milestone {n}", "date": date(2024, 5, 1)}
+
+
+def test_window_is_bounded_and_views_follow_it():
+    hub = FeedHub(window=3)
+    view = FeedView(hub, "community")
+    for n in range(5):
+        hub.share("community", milestone(n), owner=f"f{n}")
+    view.sync()
+    assert [item["id"] for item in view.latest()] == ["m4", "m3", "m2"]
+    assert list(view.items) == [item["id"] for item in hub.snapshot("community")[1]]
+    assert hub.owner("community", "m0") is None and hub.owner("community", "m4") == "f4"
+    assert [item["id"] for item in view.latest(limit=2)] == ["m4", "m3"]
+
+
+def test_view_resyncs_from_the_window_after_falling_behind():
+    hub = FeedHub(history=2, window=3)
+    view = FeedView(hub, "community")
+    for n in range(6):
+        hub.share("community", milestone(n))
+    hub.celebrate("community", "m5")
+    view.sync()
+    assert [item["id"] for item in view.latest()] == ["m5", "m4", "m3"]
+    assert view.items["m5"]["celebrations"] == 1
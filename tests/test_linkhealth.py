@@ -0,0 +1,123 @@
+import asyncio
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from hub.linkhealth import (BROKEN, HEALTHY, REDIRECTED, UNCHECKED, UNREACHABLE, ConnectionPool, LinkHealth,
+                            check_url)
+
+
+class Pool:
+    async def request(self, method, url, headers=None):
+        if "bad" in url:
+            raise ValueError("port could not be cast to integer value")
+        return 200, {}
+
+
+def test_unexpected_error_marks_only_that_link_unknown():
+    async def both():
+        pool = Pool()
+        return await asyncio.gather(check_url(pool, "https://bad:x/"), check_url(pool, "https://good.example/"))
+    bad, good = asyncio.run(both())
+    assert bad["health"] == UNCHECKED and "ValueError" in bad["error"]
+    assert good["health"] == HEALTHY
+
+
+def test_periodic_refresh_survives_a_failure(monkeypatch):
+    health = LinkHealth()
+    calls = []
+
+    def refresh(urls):
+        calls.append(urls)
+        raise RuntimeError("event loop trouble")
+    monkeypatch.setattr(health, "refresh", refresh)
+    health.start_periodic(["https://example.org/"], interval=0.01)
+    deadline = time.time() + 5
+    while len(calls) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(calls) >= 2 and health._thread.is_alive()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def reply(self, status, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        if self.path == "/ok":
+            self.reply(200)
+        elif self.path == "/moved":
+            self.reply(301, [("Location", "/ok")])
+        elif self.path == "/loop":
+            self.reply(302, [("Location", "/loop")])
+        elif self.path == "/no-head":
+            self.reply(405)
+        elif self.path == "/slow":
+            time.sleep(1)
+            self.reply(200)
+        else:
+            self.reply(404)
+
+    def do_GET(self):
+        if self.path == "/no-head" and self.headers.get("Range") == "bytes=0-0":
+            self.reply(206)
+        else:
+            self.reply(404)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_statuses_against_a_real_server(server):
+    health = LinkHealth(timeout=0.3)
+    urls = {name: f"{server}/{name}" for name in ("ok", "moved", "missing", "no-head", "loop", "slow")}
+    refused = f"http://127.0.0.1:{closed_port()}/"
+    results = {result["url"]: result for result in health.check([*urls.values(), refused])}
+
+    assert results[urls["ok"]]["health"] == HEALTHY and results[urls["ok"]]["status_code"] == 200
+    assert results[urls["moved"]]["health"] == REDIRECTED
+    assert results[urls["moved"]]["final_url"] == urls["ok"]
+    assert results[urls["missing"]]["health"] == BROKEN and results[urls["missing"]]["status_code"] == 404
+    assert results[urls["no-head"]]["health"] == HEALTHY and results[urls["no-head"]]["status_code"] == 206
+    assert results[urls["loop"]]["health"] == UNREACHABLE and "redirects" in results[urls["loop"]]["error"]
+    assert results[urls["slow"]]["health"] == UNREACHABLE and results[urls["slow"]]["elapsed"] < 1
+    assert results[refused]["health"] == UNREACHABLE and results[refused]["error"]
+    assert health.get(urls["ok"])["health"] == HEALTHY
+
+
+def test_keep_alive_connection_is_reused(server):
+    async def probe():
+        pool = ConnectionPool(per_host=1)
+        try:
+            ok = await check_url(pool, f"{server}/ok")
+            moved = await check_url(pool, f"{server}/moved")
+            return ok, moved, pool.opened
+        finally:
+            pool.close()
+    ok, moved, opened = asyncio.run(probe())
+    assert ok["health"] == HEALTHY and moved["health"] == REDIRECTED
+    assert opened == 1
@@ -0,0 +1,47 @@
+from hub.matching import PeerIndex, _plane, first_name, public_card, public_location
+
+
+def profile(name, location, children, **extra):
+    return {"parent_name": name, "location": location, "children_info": children, **extra}
+
+
+def test_public_card_shows_first_name_and_city_state_only():
+    card = public_card(profile("Maria Lopez Garcia", "12 Elm St, Springfield, IL 62701",
+                               "Sam (7) has autism and ADHD"))
+    assert card == {"name": "Maria", "location": "Springfield, IL", "conditions": ["Autism", "ADHD"]}
+    assert public_card({})["name"] == "" and public_card({})["location"] == ""
+
+
+def test_public_location_keeps_a_bare_city():
+    assert public_location("Springfield") == "Springfield"
+    assert public_location("Austin, TX") == "Austin, TX"
+    assert first_name("  ") == ""
+
+
+def test_similar_families_match_and_private_ones_do_not():
+    index = PeerIndex()
+    index.upsert("near", profile("Ana", "Austin, TX", "Leo (6) is autistic, loves trains"))
+    index.upsert("far", profile("Bo", "Portland, OR", "Mia (16) has epilepsy"))
+    index.upsert("hidden", profile("Cy", "Austin, TX", "Max (6) is autistic, loves trains",
+                                   public_milestones=False))
+    assert len(index) == 2
+
+    matches = index.similar(profile("Me", "Austin, TX", "Ben (5) has autism, loves trains"), exclude="me")
+    assert [user for user, *_ in matches][0] == "near"
+    assert "hidden" not in [user for user, *_ in matches]
+    _, _, shared, _ = matches[0]
+    assert "Autism" in shared and "Austin" in shared
+
+
+def test_removed_family_stops_matching():
+    index = PeerIndex()
+    index.upsert("near", profile("Ana", "Austin, TX", "Leo (6) is autistic"))
+    index.remove("near")
+    assert index.similar(profile("Me", "Austin, TX", "Ben (5) has autism")) == []
+
+
+def test_plane_cache_is_bounded():
+    for i in range(_plane.cache_info().maxsize + 10):
+        _plane(0, f"word:w{i}", 4)
+    assert _plane.cache_info().currsize == _plane.cache_info().maxsize
+    assert _plane(0, "word:w0", 4) == _plane(0, "word:w0", 4)
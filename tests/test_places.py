@@ -0,0 +1,17 @@
+from hub.places import Gazetteer, zip_state
+
+gazetteer = Gazetteer()
+
+
+def test_zip_codes_resolve():
+    assert zip_state("02115") == "ma" and zip_state("97201") == "or"
+    assert gazetteer.resolve("02115")[2] == "Massachusetts"
+    assert gazetteer.resolve("Boston MA 02115")[2] == "Boston, MA"
+    assert gazetteer.resolve("Portland 97201")[2] == "Portland, OR"
+
+
+def test_ambiguous_city_is_not_guessed():
+    assert gazetteer.resolve("Portland") is None
+    assert gazetteer.ambiguous("Portland") == ["Portland, ME", "Portland, OR"]
+    assert gazetteer.resolve("Portland, ME")[2] == "Portland, ME"
+    assert gazetteer.ambiguous("Boston") == []
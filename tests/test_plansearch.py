@@ -0,0 +1,23 @@
+from hub.plansearch import PlanIndex, lines, matching_lines
+
+
+def test_lines_strip_list_markers_only():
+    text = "1. Call 911 if injury\n2) 2 puffs of inhaler\n- Move siblings away\n• Dim lights\n\n-"
+    assert lines(text) == ["Call 911 if injury", "2 puffs of inhaler", "Move siblings away", "Dim lights"]
+
+
+def test_lines_keep_leading_numbers():
+    assert lines("911 if injury\n2 puffs of inhaler") == ["911 if injury", "2 puffs of inhaler"]
+
+
+def test_search_finds_plan_by_warning_sign_stem():
+    index = PlanIndex()
+    index.upsert("family", {"id": "a", "type": "Behavioral", "warning_signs": "- Pacing\n- Hitting siblings",
+                            "immediate_steps": "911 if injury"})
+    index.upsert("family", {"id": "b", "type": "Medical", "warning_signs": "Staring spells",
+                            "immediate_steps": "Time the seizure"})
+    assert [plan_id for plan_id, _, _ in index.search("family", "hits")] == ["a"]
+    assert [plan_id for plan_id, _, _ in index.search("family", "seiz")] == ["b"]
+    assert index.search("other", "hits") == []
+    _, _, matched = index.search("family", "hitting")[0]
+    assert matching_lines("- Pacing\n- Hitting siblings", matched) == ["Hitting siblings"]
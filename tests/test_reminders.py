@@ -0,0 +1,64 @@
+import logging
+import time
+from datetime import date
+
+from hub.reminders import CHECKIN, MEETING, ReminderScheduler, at_local, local_time
+
+
+def test_due_reminders_fire_in_order_and_stay_pending(tmp_path):
+    scheduler = ReminderScheduler(directory=str(tmp_path))
+    scheduler.schedule("late", "family", MEETING, "IEP review", 200.0)
+    scheduler.schedule("early", "family", MEETING, "Doctor", 100.0)
+    assert scheduler.run_due(now=150.0) == 1
+    assert [r["id"] for r in scheduler.pending("family")] == ["early"]
+    assert [r["id"] for r in scheduler.upcoming("family")] == ["late"]
+    scheduler.dismiss("early", forget=True)
+    assert scheduler.get("early") is None
+
+
+def test_weekly_reminder_keeps_local_time_across_dst(tmp_path):
+    scheduler = ReminderScheduler(directory=str(tmp_path))
+    first = at_local(date(2024, 3, 5), "19:00", "Eastern")
+    scheduler.schedule("checkin", "family", CHECKIN, "", first, "Eastern", every_days=7, clock="19:00")
+    scheduler.run_due(now=first)
+    following = local_time(scheduler.get("checkin")["next"], "Eastern")
+    assert following.date() == date(2024, 3, 12) and following.hour == 19
+
+
+def test_log_replays_pending_and_titles(tmp_path):
+    scheduler = ReminderScheduler(directory=str(tmp_path))
+    scheduler.schedule("plan", "family", MEETING, "Old name", 100.0)
+    scheduler.run_due(now=100.0)
+    scheduler.retitle("plan", "New name")
+    restarted = ReminderScheduler(directory=str(tmp_path))
+    assert [(r["id"], r["title"]) for r in restarted.pending("family")] == [("plan", "New name")]
+
+
+def test_failed_delivery_is_logged_and_reminder_kept(tmp_path, caplog):
+    def deliver(reminder):
+        raise RuntimeError("sms gateway down")
+    scheduler = ReminderScheduler(deliver=deliver, directory=str(tmp_path))
+    scheduler.schedule("meeting", "family", MEETING, "IEP review", 100.0)
+    with caplog.at_level(logging.ERROR, logger="hub.reminders"):
+        assert scheduler.run_due(now=100.0) == 1
+    assert "meeting" in caplog.text and "sms gateway down" in caplog.text
+    assert scheduler.pending("family")
+
+
+def test_timer_thread_survives_a_failing_round(tmp_path, monkeypatch):
+    scheduler = ReminderScheduler(directory=str(tmp_path))
+    calls = []
+    real_run_due = scheduler.run_due
+
+    def run_due(now=None):
+        calls.append(now)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        return real_run_due(now)
+    monkeypatch.setattr(scheduler, "run_due", run_due)
+    scheduler.schedule("meeting", "family", MEETING, "IEP review", time.time() - 1)
+    scheduler.start()
+    deadline = time.time() + 5
+    while not scheduler.pending("family") and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(calls) >= 2 and scheduler.pending("family") and scheduler._thread.is_alive()
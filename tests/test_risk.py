@@ -0,0 +1,71 @@
+import time
+from datetime import date
+
+from hub.risk import RiskModel, encode, score_matrix
+
+
+def test_periodic_rebuild_survives_a_failure():
+    calls = []
+
+    class Flaky(RiskModel):
+        def rebuild(self):
+            calls.append(1)
+            if len(calls) == 1:
+                raise ValueError("bad batch")
+
+    model = Flaky().start_periodic(interval=0.01)
+    deadline = time.time() + 5
+    while len(calls) < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(calls) >= 3 and model._thread.is_alive()
+
+
+def check(day, stress="Moderate", mood="Neutral", sleep="Fair", support="Neutral"):
+    return {"date": date(2024, 5, day), "stress_level": stress, "mood": mood, "sleep_quality": sleep,
+            "support_feeling": support}
+
+
+def matrix(checks_by_user, window=8):
+    users, days, codes = [], [], []
+    for user, checks in enumerate(checks_by_user):
+        for entry in checks:
+            day, row = encode(entry)
+            users.append(user)
+            days.append(day)
+            codes.append(row)
+    return score_matrix(users, days, codes, window)
+
+
+def test_score_matrix_signals():
+    calm = [check(day) for day in range(1, 5)]
+    stressed = [check(day, stress="Very High", sleep="Poor") for day in range(1, 5)]
+    sinking = [check(day, mood=mood) for day, mood in enumerate(["Very Good", "Good", "Neutral", "Low"], 1)]
+    distinct, components, scores = matrix([calm, stressed, sinking])
+    assert list(distinct) == [0, 1, 2]
+    assert components["sustained_stress"].tolist() == [0.0, 1.0, 0.0]
+    assert components["poor_sleep"][1] == 1.0 and components["poor_sleep"][0] == 0.0
+    assert components["mood_trend"][2] > 0 and components["mood_trend"][0] == 0
+    assert scores[1] > scores[2] > scores[0]
+
+
+def test_score_matrix_uses_only_the_latest_window():
+    old_stress = [check(day, stress="Very High") for day in range(1, 5)]
+    recent_calm = [check(day) for day in range(10, 14)]
+    # Given out of order: the window is the latest days, not the last rows
+    _, components, _ = matrix([recent_calm + old_stress], window=4)
+    assert components["sustained_stress"][0] == 0.0
+
+
+def test_score_matrix_empty():
+    distinct, _, scores = score_matrix([], [], [])
+    assert len(distinct) == 0 and len(scores) == 0
+
+
+def test_rebuild_scores_families_from_the_source_and_bounds_history():
+    model = RiskModel(window=3, source=lambda: [("quiet", [check(day, stress="Very High") for day in range(1, 9)])])
+    model.rebuild()
+    assert model.score("quiet")["components"]["sustained_stress"] == 1.0
+    assert len(model._history["quiet"]) == 3
+    for day in range(9, 20):
+        model.update("quiet", check(day))
+    assert len(model._history["quiet"]) == 3
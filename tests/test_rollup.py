@@ -0,0 +1,36 @@
+from datetime import date
+
+from hub import rollup
+from hub.events import EventStore
+from hub.rollup import ALL, summarize
+
+TODAY = date(2024, 6, 1)
+
+
+def family(location, public=True):
+    milestone = {"id": "m", "type": "Social", "date": date(2024, 5, 1), "child_age": "6", "public": public}
+    return {"user_profile": {"location": location}, "milestone_shares": [milestone], "mental_health_checks": []}
+
+
+def test_private_milestones_are_left_out():
+    families = [(f"f{n}", family("Boston, MA", public=False)) for n in range(6)]
+    tables, _ = summarize(families, k=5, today=TODAY)
+    assert tables["milestone_mix"].empty
+
+
+def test_totals_are_suppressed_with_a_hidden_region():
+    families = [(f"s{n}", family("Austin, TX")) for n in range(6)]
+    families += [(f"n{n}", family("Boston, MA")) for n in range(2)]
+    mix = summarize(families, k=5, today=TODAY)[0]["milestone_mix"]
+    assert set(mix["region"]) == {"South"}
+    # South minus an All row would otherwise reveal the two Northeast families
+    assert ALL not in set(mix["region"])
+
+
+def test_empty_community_round_trips_through_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(rollup, "PARQUET", False)
+    rollup.CommunityRollup(EventStore(str(tmp_path / "events")), directory=str(tmp_path / "rollup")).run()
+    summaries = rollup.read_summaries(str(tmp_path / "rollup"))
+    assert summaries["families"] == 0
+    assert summaries["tables"]["milestone_mix"].empty
+    assert list(summaries["tables"]["wellbeing"].columns) == rollup.COLUMNS["wellbeing"]
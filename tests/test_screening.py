@@ -0,0 +1,41 @@
+from datetime import date
+
+from hub.events import MILESTONE_MODERATED, MILESTONE_SHARED, EventStore
+from hub.moderation import HELD, RELEASED, ModerationQueue
+from hub.screening import DISTRESS, MISSING_CHILD, SELF_HARM, screen
+
+
+def test_everyday_phrases_are_not_flagged():
+    assert not screen("His front tooth is missing - first lost tooth!").flagged
+    assert not screen("He did not give up on the puzzle").flagged
+    assert not screen("The puzzle piece ran away under the couch").flagged
+
+
+def test_missing_child_phrases_are_child_specific():
+    assert screen("Help, my son is missing from the park").categories == {MISSING_CHILD}
+    assert screen("She ran away from home last night").urgent
+    assert screen("I give up").categories == {DISTRESS}
+
+
+def test_negated_match_needs_review_without_flagging():
+    result = screen("Our daughter didn't run away from home, she was at a friend's")
+    assert not result.flagged and not result.urgent
+    assert result.needs_review
+
+
+def test_self_harm_is_never_negated():
+    assert screen("I don't want to die").categories == {SELF_HARM}
+
+
+def test_held_milestones_survive_restart_and_release(tmp_path):
+    store = EventStore(str(tmp_path))
+    milestone = {"id": "m1", "text": "x", "type": "Social", "date": date(2024, 5, 1), "moderation": HELD}
+    store.record("family", MILESTONE_SHARED, {"item": milestone})
+
+    queue = ModerationQueue().seed(EventStore(str(tmp_path)))
+    assert [owner for owner, _ in queue.pending()] == ["family"]
+    assert queue.resolve("m1")[0] == "family"
+    assert queue.resolve("m1") is None
+
+    store.record("family", MILESTONE_MODERATED, {"id": "m1", "moderation": RELEASED})
+    assert EventStore(str(tmp_path)).load("family")["milestone_shares"][0]["moderation"] == RELEASED
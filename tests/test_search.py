@@ -0,0 +1,64 @@
+from hub.search import LINK, RESOURCE, TEMPLATE, TOPIC, PrefixTrie, SearchIndex, catalog_version
+
+RESOURCES = [
+    {"title": "Autism Sensory Strategies", "description": "Calming routines", "topics": ["Sensory Processing"],
+     "rating": 4.8, "category": "Autism"},
+    {"title": "Understanding IEP vs 504 Plans", "description": "Special education basics",
+     "topics": ["IEP", "Special Education"], "rating": 4.5, "category": "Educational"},
+    {"title": "Sensible Screen Time", "description": "Limits that stick", "topics": ["Behavior"],
+     "rating": 3.9, "category": "Behavioral"},
+]
+TEMPLATES = {"IEP & 504 Planning": ["IEP Meeting Request Letter"]}
+LINKS = {"Government Resources": [{"name": "Sensory Integration Network", "url": "https://example.org/"}]}
+
+
+def test_trie_keeps_top_k_per_prefix():
+    trie = PrefixTrie(k=2)
+    for entry_id, (word, popularity) in enumerate([("sense", 1.0), ("sensory", 3.0), ("send", 2.0)]):
+        trie.insert(word, entry_id, popularity)
+    assert trie.top("sen") == [1, 2]
+    assert trie.top("sens") == [1, 0]
+    assert trie.top("x") == []
+
+
+def test_all_ids_is_complete_below_a_truncated_node():
+    trie = PrefixTrie(k=2)
+    words = ["sea", "seal", "seam", "sear", "seat"]
+    for entry_id, word in enumerate(words):
+        trie.insert(word, entry_id, float(entry_id))
+    assert len(trie.top("se")) == 2
+    assert trie.all_ids("se") == set(range(len(words)))
+    assert trie.all_ids("seal") == {1}
+
+
+def test_suggest_matches_any_word_by_popularity():
+    index = SearchIndex(RESOURCES, TEMPLATES, LINKS)
+    labels = [entry["label"] for entry in index.suggest("sens")]
+    assert labels[0] == "Autism Sensory Strategies"
+    assert {"Sensory Processing", "Sensible Screen Time", "Sensory Integration Network"} <= set(labels)
+    assert index.suggest("   ") == []
+
+
+def test_search_groups_results_and_needs_every_term():
+    index = SearchIndex(RESOURCES, TEMPLATES, LINKS)
+    results = index.search("iep")
+    assert [entry["key"] for entry in results[RESOURCE]] == ["Understanding IEP vs 504 Plans"]
+    assert [entry["key"] for entry in results[TOPIC]] == ["IEP"]
+    assert [entry["key"] for entry in results[TEMPLATE]] == ["IEP Meeting Request Letter"]
+    assert results[LINK] == []
+    assert [entry["key"] for entry in index.search("letter iep")[TEMPLATE]] == ["IEP Meeting Request Letter"]
+    assert not any(index.search("iep sensory").values())
+    assert index.search("") is None
+
+
+def test_translated_labels_are_searchable():
+    index = SearchIndex(RESOURCES, TEMPLATES, LINKS,
+                        label=lambda kind, key: "Estrategias Sensoriales" if key == "Autism Sensory Strategies" else key)
+    assert [entry["label"] for entry in index.search("estrategias")[RESOURCE]] == ["Estrategias Sensoriales"]
+    assert index.search("autism")[RESOURCE][0]["label"] == "Estrategias Sensoriales"
+
+
+def test_catalog_version_follows_content():
+    version = catalog_version(RESOURCES, TEMPLATES, LINKS)
+    assert version == catalog_version(RESOURCES, TEMPLATES, LINKS)
+    assert version != catalog_version(RESOURCES[:2], TEMPLATES, LINKS)
@@ -0,0 +1,41 @@
+import math
+import os
+import time
+
+from hub.workers import ProcessJobs
+
+
+def wait(jobs, key, timeout=30):
+    deadline = time.time() + timeout
+    while jobs.running(key) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not jobs.running(key)
+
+
+def test_failed_job_is_remembered_until_resubmitted():
+    done = []
+    jobs = ProcessJobs(on_done=done.append)
+    try:
+        assert jobs.submit("bad", math.sqrt, -1)
+        wait(jobs, "bad")
+        assert jobs.failed("bad") and done == ["bad"]
+        assert jobs.submit("bad", math.sqrt, 4)
+        assert not jobs.failed("bad")
+        wait(jobs, "bad")
+        assert not jobs.failed("bad")
+    finally:
+        jobs.shutdown()
+
+
+def test_broken_pool_is_replaced():
+    jobs = ProcessJobs()
+    try:
+        # A worker exiting abruptly breaks the pool for every later submit
+        jobs.submit("crash", os._exit, 1)
+        wait(jobs, "crash")
+        assert jobs.failed("crash")
+        assert jobs.submit("next", math.sqrt, 9)
+        wait(jobs, "next")
+        assert not jobs.failed("next")
+    finally:
+        jobs.shutdown()